@@ -130,6 +130,137 @@ var getAllSubjects = onRequest({
     }
 });
 
+var getSubjectChanges = onRequest({ 
+    region: "europe-west1",
+    maxInstances: 10,
+    timeoutSeconds: 30,
+    memory: '256MiB',
+    cors: true 
+}, async (request, response) => {
+    // Only allow GET requests
+    if (request.method !== 'GET') {
+        response.status(405).send({
+            error: 'Method not allowed',
+            message: 'Only GET requests are allowed'
+        });
+        return;
+    }
+
+    try {
+        // API Key validation
+        const apiKey = request.headers['x-api-key'];
+        if (!apiKey) {
+            response.status(401).send({
+                error: 'Unauthorized',
+                message: 'Missing API key'
+            });
+            return;
+        }
+
+        // Validate API key against allowed keys in Firestore
+        const apiKeyDoc = await admin.firestore()
+            .collection('api_keys')
+            .doc(apiKey)
+            .get();
+
+        if (!apiKeyDoc.exists || !apiKeyDoc.data().active) {
+            response.status(401).send({
+                error: 'Unauthorized',
+                message: 'Invalid or inactive API key'
+            });
+            return;
+        }
+
+        // Rate limiting check
+        const clientIP = request.ip;
+        const rateLimit = await checkRateLimit(clientIP, apiKey);
+        if (!rateLimit.allowed) {
+            response.status(429).send({
+                error: 'Too Many Requests',
+                message: 'Rate limit exceeded',
+                retryAfter: rateLimit.retryAfter
+            });
+            return;
+        }
+
+        // Watermark in milliseconden, alles wat op of na dit moment is gewijzigd of verwijderd wordt teruggegeven
+        const since = parseInt(request.query.since);
+        if (isNaN(since)) {
+            response.status(400).send({
+                error: 'Bad Request',
+                message: 'since (milliseconds) is required'
+            });
+            return;
+        }
+        const sinceTimestamp = admin.firestore.Timestamp.fromMillis(since);
+        let cursor = since;
+
+        // Vragen hebben niet altijd een parent veld (oude vragen), dus we zoeken de titels van de onderwerpen op via questionIds
+        // Een vraag kan in meerdere onderwerpen staan
+        const subjectsSnapshot = await admin.firestore().collection('subjects').get();
+        const subjectTitles = {};
+        subjectsSnapshot.forEach(doc => {
+            for (const questionId of (doc.data().questionIds || [])) {
+                (subjectTitles[questionId] = subjectTitles[questionId] || []).push(doc.data().title);
+            }
+        });
+
+        const changedSnapshot = await admin.firestore()
+            .collection('questions')
+            .where('updatedAt', '>=', sinceTimestamp)
+            .orderBy('updatedAt')
+            .get();
+
+        // parents zijn alle onderwerpen waar de vraag nu in staat, de client haalt hem uit de andere onderwerpen
+        // Een gewijzigde vraag die in geen enkel onderwerp meer staat (bijv. verplaatst naar een examen) is voor de onderwerpen verwijderd,
+        // examens worden nog volledig opgehaald
+        const changes = [];
+        const unlisted = [];
+        changedSnapshot.forEach(doc => {
+            const data = doc.data();
+            cursor = Math.max(cursor, data.updatedAt.toMillis());
+            const titles = subjectTitles[doc.id];
+            if (titles) {
+                changes.push({
+                    id: doc.id,
+                    ...data,
+                    parent: titles[0],
+                    parents: titles
+                });
+            } else {
+                unlisted.push(doc.id);
+            }
+        });
+
+        const deletedSnapshot = await admin.firestore()
+            .collection('deleted_questions')
+            .where('deletedAt', '>=', sinceTimestamp)
+            .get();
+
+        const deleted = unlisted;
+        deletedSnapshot.forEach(doc => {
+            cursor = Math.max(cursor, doc.data().deletedAt.toMillis());
+            deleted.push(doc.id);
+        });
+
+        // Log the access
+        await logAPIAccess(apiKey, clientIP, 'getSubjectChanges');
+
+        response.status(200).send({
+            changes,
+            deleted,
+            cursor
+        });
+
+    } catch (error) {
+        console.error('Error in getSubjectChanges:', error);
+        response.status(500).send({
+            error: 'Internal Server Error',
+            message: 'Een fout is opgetreden bij het ophalen van de wijzigingen, probeer het later opnieuw.'
+        });
+    }
+});
+
 var getAllExams = onRequest({ 
     region: "europe-west1",
     maxInstances: 10,
@@ -261,6 +392,37 @@ var getAllExams = onRequest({
     }
 });
 
+const EXAM_TYPES = ['gevaarherkenning', 'inzicht', 'kennis'];
+
+// Zoek het document en het veld met de questionIds van een parent, een onderwerp titel of een examen onderdeel ('Examen 1 - Inzicht')
+// Geeft { ref, field } terug, of { status, error, message } als de parent niet bestaat
+async function findParent(parent) {
+    if (parent.includes('Examen')) {
+        const examNumber = (parent.match(/\d+/) || [])[0];
+        const field = EXAM_TYPES.find(examType => parent.toLowerCase().includes(examType));
+        if (!examNumber || !field) {
+            return { status: 400, error: 'Bad Request', message: "Invalid exam type. Must include 'Gevaarherkenning', 'Inzicht', or 'Kennis'" };
+        }
+        return { ref: admin.firestore().collection('exams').doc(examNumber), field: field };
+    }
+
+    const subjectQuery = await admin.firestore()
+        .collection('subjects')
+        .where('title', '==', parent)
+        .get();
+    if (subjectQuery.empty) {
+        return { status: 404, error: 'Not Found', message: `Subject with title '${parent}' not found` };
+    }
+    return { ref: subjectQuery.docs[0].ref, field: 'questionIds' };
+}
+
+// Verplaats een vraag (in de batch): haal de id uit de questionIds van source en voeg hem toe aan target
+// Bij welk onderwerp of examen een vraag hoort staat alleen in die arrays, een vraag kan in meerdere staan en blijft in de andere staan
+function moveQuestion(batch, questionId, source, target) {
+    batch.update(source.ref, { [source.field]: admin.firestore.FieldValue.arrayRemove(questionId) });
+    batch.update(target.ref, { [target.field]: admin.firestore.FieldValue.arrayUnion(questionId) });
+}
+
 var updateQuestion = onRequest({ 
     region: "europe-west1",
     maxInstances: 10,
@@ -324,14 +486,29 @@ var updateQuestion = onRequest({
             return;
         }
 
-        // Update the question document
-        await admin.firestore()
-            .collection('questions')
-            .doc(question_data.id)
-            .update({
-                ...question_data,
-                updatedAt: admin.firestore.FieldValue.serverTimestamp()
-            });
+        // Alleen met moveFrom (het onderwerp of examen onderdeel waar de vraag uit gaat) wordt de vraag verplaatst naar parent,
+        // gewoon opslaan stuurt ook parent mee maar verandert niet waar de vraag in staat. Alles in één batch
+        const { moveFrom, ...fields } = question_data;
+        const batch = admin.firestore().batch();
+        if (moveFrom) {
+            const places = [await findParent(moveFrom), await findParent(fields.parent || '')];
+            const missing = places.find(place => !place.ref);
+            if (missing) {
+                response.status(missing.status).send({
+                    error: missing.error,
+                    message: missing.message
+                });
+                return;
+            }
+            moveQuestion(batch, fields.id, ...places);
+        }
+
+        // Update the question document, updatedAt zorgt dat getSubjectChanges de wijziging (en verplaatsing) ook doorgeeft
+        batch.update(admin.firestore().collection('questions').doc(fields.id), {
+            ...fields,
+            updatedAt: admin.firestore.FieldValue.serverTimestamp()
+        });
+        await batch.commit();
 
         // Log the access
         await logAPIAccess(apiKey, clientIP, 'updateQuestion');
@@ -346,7 +523,7 @@ var updateQuestion = onRequest({
         console.error('Error in updateQuestion:', error);
         
         // Handle specific Firestore errors
-        if (error.code === 'not-found') {
+        if (error.code === 'not-found' || error.code === 5) { // 5 = NOT_FOUND van een batch commit
             response.status(404).send({
                 error: 'Not Found',
                 message: 'Question not found'
@@ -439,6 +616,14 @@ var deleteQuestion = onRequest({
         // Delete the question document
         await questionRef.delete();
 
+        // Tombstone, zodat getSubjectChanges clients kan vertellen dat deze vraag weg is
+        await admin.firestore()
+            .collection('deleted_questions')
+            .doc(questionId)
+            .set({
+                deletedAt: admin.firestore.FieldValue.serverTimestamp()
+            });
+
         // Log the access
         await logAPIAccess(apiKey, clientIP, 'deleteQuestion');
 
@@ -532,6 +717,16 @@ var createQuestion = onRequest({
             return;
         }
 
+        // Zoek eerst de parent op, zodat er geen vraag wordt aangemaakt die nergens bij hoort
+        const parent = await findParent(questionData.parent);
+        if (!parent.ref) {
+            response.status(parent.status).send({ 
+                error: parent.error,
+                message: parent.message 
+            });
+            return;
+        }
+
         // Create new question document
         const newQuestionRef = admin.firestore().collection('questions').doc();
         const questionId = newQuestionRef.id;
@@ -544,56 +739,11 @@ var createQuestion = onRequest({
             updatedAt: admin.firestore.FieldValue.serverTimestamp()
         };
 
-        // Create the question document
-        await newQuestionRef.set(finalQuestionData);
-
-        // Handle parent relationship
-        if (questionData.parent.includes('Examen')) {
-            // Extract exam number from parent string
-            const examNumber = questionData.parent.match(/\d+/)[0];
-            const examRef = admin.firestore().collection('exams').doc(examNumber);
-
-            // Determine the correct array to update based on the exam type
-            let arrayField;
-            if (questionData.parent.includes('Gevaarherkenning')) {
-                arrayField = 'gevaarherkenning';
-            } else if (questionData.parent.includes('Inzicht')) {
-                arrayField = 'inzicht';
-            } else if (questionData.parent.includes('Kennis')) {
-                arrayField = 'kennis';
-            } else {
-                response.status(400).send({ 
-                    error: 'Bad Request',
-                    message: "Invalid exam type. Must include 'Gevaarherkenning', 'Inzicht', or 'Kennis'" 
-                });
-                return;
-            }
-
-            // Update the exam document with the new question ID
-            const updateData = {};
-            updateData[arrayField] = admin.firestore.FieldValue.arrayUnion(questionId);
-            await examRef.update(updateData);
-        } else {
-            // Handle subject relationship
-            const subjectQuery = await admin.firestore()
-                .collection('subjects')
-                .where('title', '==', questionData.parent)
-                .get();
-            
-            if (subjectQuery.empty) {
-                response.status(404).send({ 
-                    error: 'Not Found',
-                    message: `Subject with title '${questionData.parent}' not found` 
-                });
-                return;
-            }
-
-            // Update the subject document with the new question ID
-            const subjectDoc = subjectQuery.docs[0];
-            await subjectDoc.ref.update({
-                questionIds: admin.firestore.FieldValue.arrayUnion(questionId)
-            });
-        }
+        // Create the question document and add it to the subject or exam
+        const batch = admin.firestore().batch();
+        batch.set(newQuestionRef, finalQuestionData);
+        batch.update(parent.ref, { [parent.field]: admin.firestore.FieldValue.arrayUnion(questionId) });
+        await batch.commit();
 
         // Log the access
         await logAPIAccess(apiKey, clientIP, 'createQuestion');
@@ -826,6 +976,7 @@ var updateFeedbackStatus = onRequest({
 
 exports.http = {
     "getAllSubjects": getAllSubjects,
+    "getSubjectChanges": getSubjectChanges,
     "getAllExams": getAllExams,
     "updateQuestion": updateQuestion,
     "deleteQuestion": deleteQuestion,
@@ -0,0 +1,198 @@
+"""
+Lokale stand-in voor de cloud functies, zodat de app (en delta sync) getest kan worden zonder Firestore.
+
+Bootst getAllSubjects, getSubjectChanges, createQuestion, updateQuestion en deleteQuestion na met een in-memory
+vragenbank. Timestamps hebben dezelfde vorm als Firestore ze teruggeeft ({'_seconds': ..., '_nanoseconds': ...}).
+
+Gebruik:
+- python backend/stand_in.py [--port 8080] [--data vragen.json] [--no-delta]
+- zet daarna in de .env file API_URL=http://localhost:8080 en API_KEY=stand-in
+"""
+
+import argparse
+import json
+import time
+import uuid
+
+from aiohttp import web
+
+API_KEY = 'stand-in'
+
+SAMPLE_SUBJECTS = [
+    {'id': 'verkeersborden', 'title': 'Verkeersborden', 'questions': [
+        {'id': 'q1', 'question': 'Wat betekent een rood rond bord met een witte balk?', 'type': 'multiple_choice',
+         'answers': ['Inrijverbod', 'Parkeerverbod', 'Stopverbod'], 'correctAnswer': 'Inrijverbod'},
+        {'id': 'q2', 'question': 'Wat moet je doen bij een stopbord?', 'type': 'open', 'correctAnswer': 'Volledig stoppen'}
+    ]},
+    {'id': 'voorrang', 'title': 'Voorrang', 'questions': [
+        {'id': 'q3', 'question': 'Wie heeft voorrang op een gelijkwaardig kruispunt?', 'type': 'open',
+         'correctAnswer': 'Verkeer van rechts'}
+    ]}
+]
+
+
+class StandInBackend:
+    """In-memory vragenbank met dezelfde responses als de cloud functies"""
+
+    def __init__(self, subjects=None, delta=True):
+        self.delta = delta # Zet op False om een server zonder getSubjectChanges na te bootsen
+        self.subjects = [] # Volgorde en titels van de onderwerpen, met de ids van de vragen
+        self.questions = {} # id -> vraag
+        self.deleted = {} # id -> verwijderd op (ms), de tombstones voor getSubjectChanges
+        self._last_ms = 0
+        for subject in json.loads(json.dumps(subjects if subjects is not None else SAMPLE_SUBJECTS)):
+            self.subjects.append({'id': subject['id'], 'title': subject['title'], 'questionIds': []})
+            for question in subject.get('questions', []):
+                self._store(subject['title'], question)
+
+    def now_ms(self):
+        """Server tijd in milliseconden, altijd oplopend zodat wijzigingen nooit dezelfde timestamp krijgen"""
+        self._last_ms = max(self._last_ms + 1, int(time.time() * 1000))
+        return self._last_ms
+
+    @staticmethod
+    def timestamp(ms):
+        """Firestore timestamp zoals de cloud functies hem teruggeven"""
+        return {'_seconds': ms // 1000, '_nanoseconds': (ms % 1000) * 1_000_000}
+
+    def _subject(self, title):
+        return next((subject for subject in self.subjects if subject['title'] == title), None)
+
+    def _store(self, parent, question):
+        question = {**question, 'updatedAt': self.timestamp(self.now_ms())}
+        self.questions[question['id']] = question
+        self.deleted.pop(question['id'], None)
+        subject = self._subject(parent)
+        if subject is not None and question['id'] not in subject['questionIds']:
+            subject['questionIds'].append(question['id'])
+        return question
+
+    def _parents_of(self, question_id):
+        return [subject['title'] for subject in self.subjects if question_id in subject['questionIds']]
+
+    def all_subjects(self):
+        return {'subjects': [
+            {**subject, 'questions': [self.questions[qid] for qid in subject['questionIds'] if qid in self.questions]}
+            for subject in self.subjects
+        ]}
+
+    def changes_since(self, since):
+        cursor = since
+        changes = []
+        deleted = [] # Ook gewijzigde vragen die in geen enkel onderwerp meer staan
+        for question in self.questions.values():
+            ms = question['updatedAt']['_seconds'] * 1000 + question['updatedAt']['_nanoseconds'] // 1_000_000
+            if ms >= since:
+                cursor = max(cursor, ms)
+                parents = self._parents_of(question['id'])
+                if parents:
+                    changes.append({**question, 'parent': parents[0], 'parents': parents})
+                else:
+                    deleted.append(question['id'])
+        for question_id, ms in self.deleted.items():
+            if ms >= since:
+                cursor = max(cursor, ms)
+                deleted.append(question_id)
+        return {'changes': changes, 'deleted': deleted, 'cursor': cursor}
+
+    def create(self, data):
+        subject = self._subject(data.get('parent', ''))
+        if subject is None:
+            return None
+        return self._store(subject['title'], {**data, 'id': uuid.uuid4().hex[:20]})
+
+    def update(self, data):
+        data = dict(data)
+        move_from = data.pop('moveFrom', None)
+        if data.get('id') not in self.questions:
+            return None
+        if move_from: # Alleen met moveFrom verplaatst, andere onderwerpen waar de vraag in staat houden hem
+            source, target = self._subject(move_from), self._subject(data.get('parent', ''))
+            if source is None or target is None:
+                return None
+            if data['id'] in source['questionIds']:
+                source['questionIds'].remove(data['id'])
+        return self._store(data.get('parent') if move_from else None, {**self.questions[data['id']], **data})
+
+    def delete(self, question_id):
+        if self.questions.pop(question_id, None) is None:
+            return False
+        for subject in self.subjects:
+            if question_id in subject['questionIds']:
+                subject['questionIds'].remove(question_id)
+        self.deleted[question_id] = self.now_ms()
+        return True
+
+
+def create_stand_in_app(backend=None):
+    """Maak de aiohttp app met dezelfde routes als de cloud functies"""
+    backend = backend or StandInBackend()
+    app = web.Application()
+
+    @web.middleware
+    async def check_api_key(request, handler):
+        if request.headers.get('x-api-key') != API_KEY:
+            return web.json_response({'error': 'Unauthorized', 'message': 'Invalid or inactive API key'}, status=401)
+        return await handler(request)
+    app.middlewares.append(check_api_key)
+
+    async def get_all_subjects(request):
+        return web.json_response(backend.all_subjects())
+
+    async def get_subject_changes(request):
+        if not backend.delta:
+            return web.json_response({'error': 'Not Found'}, status=404)
+        try:
+            since = int(request.query['since'])
+        except (KeyError, ValueError):
+            return web.json_response({'error': 'Bad Request', 'message': 'since (milliseconds) is required'}, status=400)
+        return web.json_response(backend.changes_since(since))
+
+    async def create_question(request):
+        question = backend.create(await request.json())
+        if question is None:
+            return web.json_response({'error': 'Not Found', 'message': 'Subject not found'}, status=404)
+        return web.json_response({'status': 'success', 'questionId': question['id'], 'question': question}, status=201)
+
+    async def update_question(request):
+        question = backend.update(await request.json())
+        if question is None:
+            return web.json_response({'error': 'Not Found', 'message': 'Question not found'}, status=404)
+        return web.json_response({'status': 'success', 'questionId': question['id']})
+
+    async def delete_question(request):
+        question_id = request.query.get('id')
+        if not question_id and request.can_read_body:
+            question_id = (await request.json()).get('id')
+        if not backend.delete(question_id):
+            return web.json_response({'error': 'Not Found', 'message': 'Question not found'}, status=404)
+        return web.json_response({'status': 'success', 'questionId': question_id})
+
+    async def get_all_exams(request):
+        return web.json_response({'exams': []})
+
+    async def get_all_feedback(request):
+        return web.json_response({'feedback': []})
+
+    app.router.add_get('/http-getAllSubjects', get_all_subjects)
+    app.router.add_get('/http-getSubjectChanges', get_subject_changes)
+    app.router.add_post('/http-createQuestion', create_question)
+    app.router.add_put('/http-updateQuestion', update_question)
+    app.router.add_delete('/http-deleteQuestion', delete_question)
+    app.router.add_get('/http-getAllExams', get_all_exams)
+    app.router.add_get('/http-getAllFeedback', get_all_feedback)
+    return app
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Lokale stand-in voor de Theorio cloud functies')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--data', help='JSON bestand met een lijst onderwerpen (zelfde vorm als getAllSubjects)')
+    parser.add_argument('--no-delta', action='store_true', help='Zonder getSubjectChanges, om de fallback te testen')
+    args = parser.parse_args()
+
+    subjects = None
+    if args.data:
+        with open(args.data, encoding='utf-8') as file:
+            subjects = json.load(file)
+    web.run_app(create_stand_in_app(StandInBackend(subjects, delta=not args.no_delta)), port=args.port)
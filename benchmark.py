@@ -0,0 +1,185 @@
+"""
+Micro-benchmarks voor de performance van de app.
+
+Bevat benchmarks voor:
+- JSON codecs (json, orjson, msgspec), alleen decoderen en decoderen + formatteren voor de lijst, met de oude dict per vraag en met de Question struct
+- Geheugen van de vragen in de lijst: de oude dict per vraag tegenover de Question struct
+- Wisselen van vraag in het details frame: het formulier elke keer opnieuw opbouwen tegenover hergebruiken (heeft een display nodig)
+
+Gebruik:
+- Run met: python benchmark.py
+"""
+
+import json
+import statistics
+import time
+import tkinter as tk
+import tracemalloc
+
+from main import App, DetailsFrame, ImageLoader, JSONCodec, DETAILS_CONFIG
+
+
+def synthetic_subjects(question_count=50_000, subject_count=50):
+    """Maak een getAllSubjects response met question_count vragen, verdeeld over subject_count onderwerpen"""
+    types = ['multiple_choice', 'open', 'image_selection', 'drag_and_drop']
+    subjects = []
+    per_subject = question_count // subject_count
+    for s in range(subject_count):
+        questions = []
+        for q in range(per_subject):
+            question_type = types[q % len(types)]
+            question = {
+                'id': f'q{s}-{q}',
+                'question': f'Wat moet je doen bij situatie {q} in onderwerp {s}? Let op de borden en markeringen.',
+                'type': question_type,
+                'explanation': 'Je moet altijd voorrang geven aan verkeer van rechts, tenzij anders aangegeven.',
+                'parent': f'Onderwerp {s}',
+                'updatedAt': {'_seconds': 1700000000 + q, '_nanoseconds': 0}
+            }
+            if question_type == 'multiple_choice':
+                question.update({'answers': ['Stoppen', 'Doorrijden', 'Voorrang geven'], 'correctAnswer': 'Voorrang geven',
+                                 'terms': {'voorrang': 'Het recht om als eerste te gaan'}})
+            elif question_type == 'image_selection':
+                question.update({'imageOptions': [f'https://example.com/{q}-{i}.png' for i in range(4)], 'correctAnswer': 2})
+            elif question_type == 'drag_and_drop':
+                question.update({'image': f'https://example.com/{q}.png', 'correctPositions': [{'positionX': 0.5, 'positionY': 0.25}]})
+            else:
+                question['correctAnswer'] = 'Rustig afremmen'
+            questions.append(question)
+        subjects.append({'id': f's{s}', 'title': f'Onderwerp {s}', 'questionIds': [q['id'] for q in questions], 'questions': questions})
+    return {'subjects': subjects}
+
+
+def best_of(function, repeat=5):
+    """Snelste tijd (seconden) van een aantal runs"""
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def legacy_question_dict(index, question):
+    """De dict die format_question_data per vraag maakte voor de Question struct er was"""
+    return {
+        'titel': f'Vraag {index+1}',
+        'vraag_tekst': question['question'],
+        'type': question['type'],
+        'opties': question.get('answers', []) if question.get('type') == 'multiple_choice' else [],
+        'antwoord': question.get('correctAnswer', ''),
+        'uitleg': question.get('explanation', ''),
+        'afbeelding': question.get('image', ''),
+        'context': question.get('context', ''),
+        'imageOptions': question.get('imageOptions', []),
+        'terms': question.get('terms', {}),
+        'correctPositions': question.get('correctPositions', []),
+        'correctAnswer': question.get('correctAnswer', 0),
+        'id': question['id']
+    }
+
+
+def legacy_format_subjects(data):
+    """De format van getAllSubjects voor de lijst zoals die was voor de Question struct: een dict per vraag"""
+    return [{'titel': subject['title'], 'vragen': [legacy_question_dict(i, question) for i, question in enumerate(subject.get('questions', []))]}
+            for subject in data['subjects']]
+
+
+def benchmark_json_codecs(question_count=50_000):
+    """Vergelijk decoderen en decoderen + formatteren voor de lijst, voor elke geïnstalleerde codec.
+    De json rij met de oude format (dict per vraag) is de route van voor de verwisselbare codecs"""
+    body = json.dumps(synthetic_subjects(question_count)).encode('utf-8')
+    app = App.__new__(App) # Alleen de format functies zijn nodig, zonder venster en API configuratie
+    print(f"JSON codecs, {question_count} vragen, {len(body) / 1_000_000:.1f} MB")
+    print(f"{'codec':<10}{'decode':>12}{'+oude format':>16}{'+format':>12}")
+    for name in JSONCodec.PREFERENCE:
+        try:
+            codec = JSONCodec(name)
+        except ImportError:
+            print(f"{name:<10}{'niet geïnstalleerd':>40}")
+            continue
+        decode = best_of(lambda: codec.loads(body))
+        decode_legacy = best_of(lambda: legacy_format_subjects(codec.loads(body)))
+        decode_format = best_of(lambda: app.format_subjects(codec.loads(body)))
+        print(f"{name:<10}{decode * 1000:>10.1f}ms{decode_legacy * 1000:>14.1f}ms{decode_format * 1000:>10.1f}ms")
+
+
+def allocated_bytes(build):
+    """Hoeveel geheugen (bytes) er na build() nog in gebruik is"""
+    tracemalloc.start()
+    result = build()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del result
+    return size
+
+
+def benchmark_question_memory(question_count=10_000):
+    """Vergelijk het geheugen van de lijst data (vraag_data) met dicts en met Question structs, per question_count vragen.
+    De responses worden per run opnieuw geparsed, zodat alleen de strings die de app zelf maakt of deelt meetellen"""
+    body = json.dumps(synthetic_subjects(question_count, subject_count=10))
+    app = App.__new__(App)
+
+    def as_dicts():
+        data = json.loads(body)
+        return data, [legacy_question_dict(i, question) for subject in data['subjects'] for i, question in enumerate(subject['questions'])]
+
+    def as_structs():
+        data = json.loads(body)
+        return data, [question for subject in data['subjects'] for question in app.format_subject_data(subject)['vragen']]
+
+    response = allocated_bytes(lambda: json.loads(body))
+    dicts = allocated_bytes(as_dicts) - response
+    structs = allocated_bytes(as_structs) - response
+    print(f"Vragen in de lijst, per {question_count} vragen (bovenop de geparsede response van {response / 1_000_000:.1f} MB)")
+    print(f"{'dict per vraag':<20}{dicts / 1_000_000:>10.2f} MB")
+    print(f"{'Question struct':<20}{structs / 1_000_000:>10.2f} MB")
+    print(f"{'besparing':<20}{(dicts - structs) / 1_000_000:>10.2f} MB ({(1 - structs / dicts) * 100:.0f}%)")
+
+
+class OfflineApp:
+    """Genoeg van App voor het details frame, zonder API en event loop: afbeeldingen worden niet geladen"""
+
+    def __init__(self):
+        self.image_loader = ImageLoader(None)
+
+    def handle_async_button(self, coro, slot=None):
+        coro.close()
+
+
+def benchmark_question_switch(switches=400):
+    """Vergelijk de tijd van het wisselen van vraag (show_vraag_ui tot en met de layout), met en zonder hergebruik van de formulieren.
+    De vragen wisselen steeds van type, het zwaarste geval voor het hergebruik"""
+    try:
+        root = tk.Tk()
+    except tk.TclError:
+        print("Wisselen van vraag: geen display beschikbaar, overgeslagen")
+        return
+    app = App.__new__(App)
+    vragen = [(subject['title'], vraag) for subject in synthetic_subjects(switches, subject_count=4)['subjects'] for vraag in app.format_subject_data(subject)['vragen']]
+    details = DetailsFrame(root, OfflineApp())
+    reuse = DETAILS_CONFIG['reuse_forms']
+    print(f"Wisselen van vraag, {switches} keer")
+    print(f"{'formulier':<20}{'mediaan':>12}{'p95':>12}")
+    try:
+        for label, reuse_forms in [('opnieuw opbouwen', False), ('hergebruiken', True)]:
+            DETAILS_CONFIG['reuse_forms'] = reuse_forms
+            timings = []
+            for hoofdstuk, vraag in vragen:
+                started = time.perf_counter()
+                details.show_vraag_ui(hoofdstuk, vraag)
+                root.update_idletasks()
+                timings.append(time.perf_counter() - started)
+            p95 = statistics.quantiles(timings, n=20)[-1]
+            print(f"{label:<20}{statistics.median(timings) * 1000:>10.2f}ms{p95 * 1000:>10.2f}ms")
+    finally:
+        DETAILS_CONFIG['reuse_forms'] = reuse
+        root.destroy()
+
+
+if __name__ == '__main__':
+    benchmark_json_codecs()
+    print()
+    benchmark_question_memory()
+    print()
+    benchmark_question_switch()
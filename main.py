@@ -10,11 +10,28 @@ import io
 from tkinter import messagebox
 import json
 from datetime import datetime
+import random
+import time
+import sqlite3
+import zlib
+import re
+import codecs
+import sys
+import contextvars
+from collections import deque, OrderedDict
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
+from PIL.PngImagePlugin import PngInfo
+import itertools
+import bisect
+import unicodedata
+from urllib.parse import urlsplit
 
 # Configuratie voor de API
 API_CONFIG = {
     'ENDPOINTS': {
         'subjects': '/http-getAllSubjects',
+        'subject_changes': '/http-getSubjectChanges',
         'exams': '/http-getAllExams',
         'feedback': '/http-getAllFeedback',
         'update_feedback': '/http-updateFeedbackStatus',
@@ -22,9 +39,144 @@ API_CONFIG = {
         'update_question': '/http-updateQuestion',
         'delete_question': '/http-deleteQuestion',
         'helloWorld': '/helloWorld'
+    },
+    # Connection pool voor de gedeelde aiohttp sessie, zodat niet elke request een nieuwe TCP+TLS handshake doet
+    'POOL': {
+        'limit': 30, # Maximaal aantal open connecties in totaal
+        'limit_per_host': 8, # Maximaal aantal open connecties per host (cloud functies en afbeeldingen)
+        'keepalive_timeout': 60, # Hoe lang een idle connectie open blijft (seconden)
+        'ttl_dns_cache': 300, # Hoe lang DNS resultaten worden bewaard (seconden)
+        'timeout': 30 # Totale timeout per request (seconden)
+    },
+    # Retry beleid, de cloud functies hebben vaak een cold start en geven dan een timeout of 5xx
+    'RETRY': {
+        'max_attempts': 4, # Maximaal aantal pogingen per aanroep (inclusief de eerste)
+        'base_delay': 0.5, # Start wachttijd voor de exponentiële backoff (seconden)
+        'max_delay': 5.0, # Maximale wachttijd tussen twee pogingen (seconden)
+        'deadline': 30.0, # Totale tijd die een aanroep mag duren, inclusief alle retries (seconden)
+        'idempotent_methods': ['get', 'put', 'delete'] # POST (create_question) wordt nooit opnieuw verstuurd, anders krijg je dubbele vragen
+    },
+    # Hedged GETs, als de eerste request langzamer is dan het percentiel van eerdere requests, starten we een tweede
+    'HEDGE': {
+        'enabled': False,
+        'percentile': 95, # Na hoeveel tijd (percentiel van de gemeten latency) de tweede request start
+        'min_samples': 20, # Minimaal aantal metingen voordat we gaan hedgen
+        'window': 100 # Aantal laatste metingen per endpoint dat we bewaren
+    },
+    # Bulk acties op meerdere geselecteerde vragen of feedback items (zie APIClient.bulk)
+    'BULK': {
+        'concurrency': 4 # Maximaal aantal requests tegelijk, de rest wacht
     }
 }
 
+# Hoe lang (seconden) een gecachte GET response als vers geldt, daarna tonen we hem nog wel maar halen we op de achtergrond nieuwe data op
+CACHE_TTL = {
+    'subjects': 300,
+    'exams': 300,
+    'feedback': 60
+}
+
+# Welke gecachte GETs ongeldig worden na een wijziging via put/post/delete
+CACHE_INVALIDATES = {
+    'create_question': ['subjects', 'exams'],
+    'update_question': ['subjects', 'exams'],
+    'delete_question': ['subjects', 'exams'],
+    'update_feedback': ['feedback']
+}
+
+# JSON instellingen, codec None = de snelste die geïnstalleerd is (orjson, msgspec, anders de standaard json module)
+JSON_CONFIG = {
+    'codec': None
+}
+
+# Endpoints die incrementeel gesynchroniseerd kunnen worden, met het endpoint dat alleen de wijzigingen teruggeeft
+DELTA_ENDPOINTS = {
+    'subjects': 'subject_changes'
+}
+
+# Endpoints die bij een lege cache gestreamd worden, met de array in de response die element voor element wordt geparsed
+STREAM_ARRAYS = {
+    'subjects': 'subjects',
+    'exams': 'exams',
+    'feedback': 'feedback'
+}
+
+# Lokale opslag van de laatste succesvolle responses, zodat de app direct data heeft bij het opstarten en offline werkt
+SNAPSHOT_CONFIG = {
+    'path': os.path.join(os.path.expanduser('~'), '.theorio', 'snapshots.db'), # Kan worden overschreven met THEORIO_SNAPSHOT_PATH in de .env file
+    'endpoints': ['subjects', 'exams', 'feedback'], # Welke GET responses we bewaren
+    'compression_level': 6 # zlib niveau, JSON van de vragenbank comprimeert erg goed
+}
+
+# Begin van de tijdelijke id van een nieuwe vraag die al in de lijst staat maar nog wordt aangemaakt (zie DetailsFrame.create_question)
+LOCAL_ID_PREFIX = 'lokaal-'
+
+# Opslaan van bestaande vragen op de achtergrond (zie SaveQueue)
+SAVE_QUEUE_CONFIG = {
+    'path': os.path.join(os.path.expanduser('~'), '.theorio', 'journal.jsonl'), # Kan worden overschreven met THEORIO_JOURNAL_PATH in de .env file
+    'concurrency': 2, # Maximaal aantal vragen dat tegelijk wordt verstuurd
+    'delay': 0.5, # Seconden wachten voor het versturen, snel achter elkaar opslaan wordt zo één PUT
+    'retry_delay': 2, # Seconden voor de eerste nieuwe poging als de server niet bereikbaar is, verdubbelt per mislukte poging
+    'max_retry_delay': 60
+}
+
+# Instellingen voor de lijst (Treeview) in LijstFrame
+LIJST_CONFIG = {
+    'lazy': True, # Alleen de hoofdstukken invoegen, de vragen pas als een hoofdstuk wordt opengeklapt
+    'evict_after': 120, # Na hoeveel seconden dichtgeklapt de vragen van een hoofdstuk weer uit de Treeview gaan (None = nooit)
+    'frame_budget_ms': 8 # Hoeveel tijd het bijwerken van de Treeview per frame mag kosten, daarna krijgt Tk weer de tijd om te tekenen en input te verwerken
+}
+
+# Instellingen voor het details frame
+DETAILS_CONFIG = {
+    'reuse_forms': True # Eén vraag formulier per type dat bij het wisselen van vraag opnieuw wordt ingevuld, False bouwt het elke keer opnieuw op
+}
+
+# Zoeken in de vragen, met het zoekveld boven de lijst (zie SearchIndex)
+SEARCH_CONFIG = {
+    'debounce_ms': 150 # Zoeken start pas als er zo lang niet is getypt
+}
+
+# Detectie van (bijna) dubbele vragen, voor het rapport "Dubbele vragen" (zie DuplicateIndex)
+DUPLICATES_CONFIG = {
+    'shingle_size': 5, # Lengte (karakters) van de stukjes tekst die worden vergeleken
+    'num_perm': 64, # Lengte van de MinHash signature, een macht van 2
+    'bands': 16, # LSH banden (num_perm / bands waarden per band), meer banden vindt ook paren die minder op elkaar lijken
+    'min_threshold': 0.5, # Laagste drempel die het rapport kan tonen
+    'threshold': 0.8 # Drempel waarmee het rapport opent
+}
+
+# De navigatie (slot, generatie) waar de huidige coroutine bij hoort, zie App.handle_async_button en App.post_nav
+CURRENT_NAV = contextvars.ContextVar('current_nav', default=None)
+
+# Cache voor de afbeeldingen van vragen en opties, per url en formaat (zie ImageCache)
+IMAGE_CACHE_CONFIG = {
+    'memory_bytes': 64 * 1024 * 1024, # Budget voor de verkleinde afbeeldingen in het geheugen, de minst recent gebruikte gaan eruit
+    'path': os.path.join(os.path.expanduser('~'), '.theorio', 'images'), # Kan worden overschreven met THEORIO_IMAGE_CACHE_PATH in de .env file
+    'disk_bytes': 256 * 1024 * 1024, # Budget voor de verkleinde afbeeldingen op schijf, de oudste gaan eruit
+    'revalidate_after': 24 * 3600, # Na hoeveel seconden een afbeelding op schijf opnieuw wordt gecontroleerd (conditional GET met ETag/Last-Modified)
+    'question_size': (200, 200), # Formaat van de vraag afbeelding in het details frame
+    'option_size': (100, 100), # Formaat van de afbeeldingen bij image selection vragen
+    'max_live_images': 32, # Maximaal aantal afbeeldingen (PhotoImages) dat het details frame tegelijk vasthoudt, de oudste worden losgelaten
+    'decode_workers': 2 # Worker threads voor decoderen, verkleinen en de schijf, zodat een grote foto de event loop (en de API calls) niet ophoudt
+}
+
+# Vooruit laden van de afbeeldingen van de vragen rond de geselecteerde vraag (zie ImagePrefetcher)
+PREFETCH_CONFIG = {
+    'neighbours': 3, # Aantal vragen voor en na de geselecteerde vraag
+    'concurrency': 2 # Maximaal aantal afbeeldingen dat tegelijk vooruit wordt geladen
+}
+
+# Laden van de afbeeldingen van een view, zoals de 2x2 grid bij image selection vragen (zie ImageLoader)
+IMAGE_LOADER_CONFIG = {
+    'workers': 4, # Maximaal aantal afbeeldingen dat tegelijk wordt geladen
+    'per_host': 2, # Maximaal aantal tegelijk van dezelfde server
+    'view_timeout': 15 # Seconden, daarna geeft een view het op en toont de overgebleven tegels als niet geladen
+}
+
+# Status codes waarbij het zin heeft om het opnieuw te proberen
+RETRYABLE_STATUS = (408, 429, 500, 502, 503, 504)
+
 # Vraag types voor de popup menu
 QUESTION_TYPES = [
     {
@@ -53,6 +205,13 @@ QUESTION_TYPES = [
     }
 ]
 
+# De onderdelen van een examen, zoals ze in de API staan, met de naam die we in de lijst tonen
+EXAM_CATEGORIES = {
+    'gevaarherkenning': 'Gevaarherkenning',
+    'inzicht': 'Inzicht',
+    'kennis': 'Kennis'
+}
+
 def format_date(timestamp):
     """Maak een leesbare datum van een timestamp"""
     if isinstance(timestamp, dict) and '_seconds' in timestamp:
@@ -72,10 +231,11 @@ class NavigatieBalk(tk.Frame):
         """Maak de knoppen voor de navigatie"""
         buttons = [
             # Sommige knoppen hebben een lambda functie om de async functie aan te roepen, deze zijn async omdat ze data ophalen van de API en dan pas de UI updaten
-            ("📘 Onderdelen", lambda: app.handle_async_button(app.show_onderdelen())),
-            ("📝 Examens", lambda: app.handle_async_button(app.show_exams())),
+            # Alle navigatie gaat via het slot 'nav', dus een nieuwe klik cancelt het ophalen van de vorige lijst
+            ("📘 Onderdelen", lambda: app.handle_async_button(app.show_onderdelen(), slot='nav')),
+            ("📝 Examens", lambda: app.handle_async_button(app.show_exams(), slot='nav')),
             ("📊 Rapporten", app.show_rapporten),
-            ("💬 Feedback", lambda: app.handle_async_button(app.show_feedback()))
+            ("💬 Feedback", lambda: app.handle_async_button(app.show_feedback(), slot='nav'))
         ]
         
         for text, command in buttons:
@@ -94,6 +254,235 @@ class NavigatieBalk(tk.Frame):
         except Exception as e:
             print("Error bij het laden van het logo: ", e)
 
+class QuestionIndex:
+    """Basis voor de indexen over de vragen (SearchIndex, DuplicateIndex). De keys zijn (hoofdstuk titel, vraag id), zodat onderdelen en examens
+    naast elkaar in de index staan. Subklassen hebben documents (key -> (vraag, tekst, ...)), add(key, vraag) en remove(key)"""
+
+    def __len__(self):
+        return len(self.documents)
+
+    def remove_question(self, question_id):
+        """Verwijder een vraag uit alle hoofdstukken waar hij in staat"""
+        for key in [key for key in list(self.documents) if key[1] == question_id]:
+            self.remove(key)
+
+    def sync(self, items):
+        """Breng de index in lijn met de hoofdstukken in items (bijv. na een refresh of delta sync).
+        Ongewijzigde vragen kosten alleen een vergelijking, vragen die uit deze hoofdstukken zijn verdwenen gaan uit de index"""
+        chapters = set()
+        seen = set()
+        for item in items:
+            if isinstance(item, dict) and 'vragen' in item:
+                chapters.add(item['titel'])
+                for vraag in item['vragen']:
+                    key = (item['titel'], vraag.id)
+                    seen.add(key)
+                    document = self.documents.get(key)
+                    if document is None or document[0] is not vraag:
+                        self.add(key, vraag)
+        for key in [key for key in list(self.documents) if key[0] in chapters and key not in seen]:
+            self.remove(key)
+
+class SearchIndex(QuestionIndex):
+    """In-memory inverted index over de vragen (vraag, context, uitleg, antwoorden en begrippen), voor het zoekveld boven de lijst.
+    Zoeken is op prefix en ongevoelig voor hoofdletters en accenten ('een' vindt 'één'). De index wordt per vraag bijgewerkt, nooit opnieuw opgebouwd"""
+
+    def __init__(self):
+        self.postings = {} # token -> set van keys
+        self.tokens = [] # Alle tokens gesorteerd, zodat een prefix met bisect te vinden is
+        self.documents = {} # key -> (vraag, tekst, tokens)
+        self.stats = {'indexed': 0, 'unchanged': 0, 'removed': 0}
+
+    @staticmethod
+    def normalize(text):
+        """Kleine letters en zonder accenten"""
+        return ''.join(char for char in unicodedata.normalize('NFKD', text) if not unicodedata.combining(char)).casefold()
+
+    @classmethod
+    def tokenize(cls, text):
+        return re.findall(r'\w+', cls.normalize(text))
+
+    @staticmethod
+    def document_text(vraag):
+        """De doorzoekbare tekst van een vraag"""
+        parts = [vraag.vraag_tekst, vraag.context, vraag.uitleg, vraag.antwoord, *vraag.opties]
+        for term, definition in (vraag.terms or {}).items():
+            parts += [term, definition]
+        return '\n'.join(part for part in parts if isinstance(part, str) and part)
+
+    def add(self, key, vraag):
+        """Voeg een vraag toe of werk hem bij, alleen de tokens die erbij komen of weggaan worden aangepast"""
+        text = self.document_text(vraag)
+        old = self.documents.get(key)
+        if old is not None and old[1] == text:
+            self.documents[key] = (vraag, text, old[2])
+            self.stats['unchanged'] += 1
+            return
+        tokens = set(self.tokenize(text))
+        old_tokens = old[2] if old is not None else set()
+        for token in old_tokens - tokens:
+            self._unpost(token, key)
+        for token in tokens - old_tokens:
+            self._post(token, key)
+        self.documents[key] = (vraag, text, tokens)
+        self.stats['indexed'] += 1
+
+    def remove(self, key):
+        old = self.documents.pop(key, None)
+        if old is not None:
+            for token in old[2]:
+                self._unpost(token, key)
+            self.stats['removed'] += 1
+
+    def _post(self, token, key):
+        keys = self.postings.get(token)
+        if keys is None:
+            keys = self.postings[token] = set()
+            bisect.insort(self.tokens, token)
+        keys.add(key)
+
+    def _unpost(self, token, key):
+        keys = self.postings[token]
+        keys.discard(key)
+        if not keys:
+            del self.postings[token]
+            del self.tokens[bisect.bisect_left(self.tokens, token)]
+
+    def search(self, query):
+        """De keys van de vragen waar elk woord van de zoekopdracht (als prefix) in voorkomt"""
+        result = None
+        for word in self.tokenize(query):
+            matches = set()
+            index = bisect.bisect_left(self.tokens, word)
+            while index < len(self.tokens) and self.tokens[index].startswith(word):
+                matches |= self.postings[self.tokens[index]]
+                index += 1
+            result = matches if result is None else result & matches
+            if not result:
+                return set()
+        return result or set()
+
+class DuplicateIndex(QuestionIndex):
+    """Vindt (bijna) dubbele vragen met MinHash en locality-sensitive hashing, zonder elke vraag met elke andere te vergelijken.
+    Elke vraag is een set shingles (stukjes van shingle_size karakters) met een MinHash signature. Vragen met een gelijke band in hun
+    signature komen in dezelfde bucket, alleen die kandidaat paren worden echt vergeleken. Thread safe, zodat opbouwen buiten de event loop kan"""
+
+    MIX = 0x9E3779B1 # Verspreidt de crc32 van een shingle over de bins
+    OFFSET = 1 << 32 # Groter dan elke waarde in een bin, zie signature
+
+    def __init__(self, shingle_size=None, num_perm=None, bands=None):
+        self.shingle_size = shingle_size or DUPLICATES_CONFIG['shingle_size']
+        self.num_perm = num_perm or DUPLICATES_CONFIG['num_perm']
+        self.bands = bands or DUPLICATES_CONFIG['bands']
+        self.rows = self.num_perm // self.bands
+        self.documents = {} # key -> (vraag, tekst, signature)
+        self.buckets = {} # hash van (band, waarden) -> keys
+        self._lock = threading.RLock()
+        self.stats = {'indexed': 0, 'unchanged': 0, 'removed': 0, 'candidates': 0}
+
+    @staticmethod
+    def document_text(vraag):
+        """De tekst die bij een kopie hetzelfde is: de vraag en de antwoorden, zonder hoofdletters, accenten en leestekens"""
+        parts = [vraag.vraag_tekst, vraag.antwoord, *vraag.opties]
+        return ' '.join(SearchIndex.tokenize(' '.join(part for part in parts if isinstance(part, str))))
+
+    def shingles(self, text):
+        if len(text) <= self.shingle_size:
+            return {text} if text else set()
+        return {text[i:i + self.shingle_size] for i in range(len(text) - self.shingle_size + 1)}
+
+    def signature(self, text):
+        """MinHash signature met één hash per shingle (one permutation hashing): de hoogste bits kiezen de bin, de rest is de waarde.
+        Lege bins krijgen de waarde van de eerstvolgende gevulde bin plus een offset (densification), zodat ook korte vragen vergelijkbaar zijn"""
+        shingles = self.shingles(text)
+        if not shingles:
+            return None
+        shift = 32 - (self.num_perm.bit_length() - 1)
+        mask = (1 << shift) - 1
+        bins = [None] * self.num_perm
+        for shingle in shingles:
+            value = (zlib.crc32(shingle.encode('utf-8')) * self.MIX) & 0xFFFFFFFF
+            index = value >> shift
+            if bins[index] is None or value & mask < bins[index]:
+                bins[index] = value & mask
+        signature = list(bins)
+        for index, value in enumerate(bins):
+            distance = 0
+            while value is None:
+                distance += 1
+                value = bins[(index + distance) % self.num_perm]
+            signature[index] = value + distance * self.OFFSET
+        return signature
+
+    def band_keys(self, signature):
+        return [hash((band, *signature[band * self.rows:(band + 1) * self.rows])) for band in range(self.bands)]
+
+    def add(self, key, vraag):
+        """Voeg een vraag toe of werk hem bij, alleen een veranderde tekst krijgt een nieuwe signature"""
+        text = self.document_text(vraag)
+        with self._lock:
+            old = self.documents.get(key)
+            if old is not None and old[1] == text:
+                self.documents[key] = (vraag, text, old[2])
+                self.stats['unchanged'] += 1
+                return
+            if old is not None:
+                self._unbucket(key, old[2])
+            signature = self.signature(text)
+            self.documents[key] = (vraag, text, signature)
+            if signature is not None:
+                for bucket in self.band_keys(signature):
+                    self.buckets.setdefault(bucket, []).append(key)
+            self.stats['indexed'] += 1
+
+    def remove(self, key):
+        with self._lock:
+            old = self.documents.pop(key, None)
+            if old is not None:
+                self._unbucket(key, old[2])
+                self.stats['removed'] += 1
+
+    def _unbucket(self, key, signature):
+        if signature is None:
+            return
+        for bucket in self.band_keys(signature):
+            keys = self.buckets[bucket]
+            keys.remove(key)
+            if not keys:
+                del self.buckets[bucket]
+
+    def remove_question(self, question_id):
+        with self._lock:
+            super().remove_question(question_id)
+
+    def sync(self, items):
+        with self._lock:
+            super().sync(items)
+
+    def pairs(self, threshold):
+        """Alle paren met een Jaccard gelijkenis van minstens threshold, als [(gelijkenis, vraag, key, vraag, key)] met de meest gelijke eerst.
+        Dezelfde vraag (id) in twee hoofdstukken, en vragen met dezelfde tekst maar andere afbeeldingen tellen niet als dubbel"""
+        with self._lock:
+            candidates = set()
+            for keys in self.buckets.values():
+                if len(keys) > 1:
+                    candidates.update(itertools.combinations(sorted(keys), 2))
+            self.stats['candidates'] = len(candidates)
+            shingles = {}
+            result = []
+            for a, b in candidates:
+                first, second = self.documents[a][0], self.documents[b][0]
+                if a[1] == b[1] or first.afbeelding != second.afbeelding or first.imageOptions != second.imageOptions:
+                    continue
+                for key in (a, b):
+                    if key not in shingles:
+                        shingles[key] = self.shingles(self.documents[key][1])
+                similarity = len(shingles[a] & shingles[b]) / len(shingles[a] | shingles[b])
+                if similarity >= threshold:
+                    result.append((similarity, first, a, second, b))
+        result.sort(key=lambda pair: (-pair[0], pair[2], pair[4]))
+        return result
+
 class LijstFrame(tk.Frame):
     """De lijstframe is de linker frame die de lijst met onderdelen, examens en feedback toont"""
     #! Setup
@@ -105,17 +494,33 @@ class LijstFrame(tk.Frame):
         self.app = app
         self.vraag_data = {} #Dit is een dictionary die de data van de vragen opslaat zodat deze gemakkelijk kunnen worden opgehaald in de on_select functie
         self.feedback_data = {} #Zelfde als hierboven, maar voor de feedback data
+        self.chapters = {} #Hoofdstuk iid -> onderdeel/examen item, zodat de vragen pas bij het openklappen worden ingevoegd (LIJST_CONFIG['lazy'])
+        self.filled_chapters = set() #Hoofdstukken waarvan de vragen in de Treeview staan
+        self.evict_jobs = {} #Hoofdstuk iid -> after() id van de geplande eviction na het dichtklappen
+        self.items = [] #De items die nu in de lijst staan
+        self.row_text = {} #iid -> tekst van elke rij in de treeview, zodat reconcile zonder Tk aanroep kan zien of een tekst is veranderd
+        self.render_job = None #De stappen van de lopende (in delen uitgevoerde) update van de treeview, zie run_render
+        self.render_after = None #after() id van het volgende deel
+        self.search_index = SearchIndex() #Zoekindex over de vragen van de onderdelen en examens
+        self.search_after = None #after() id van de uitgestelde zoekopdracht
 
         self.container = tk.Frame(self)
         self.container.pack(fill='both', expand=True)
 
-        # Loading label
-        self.loading_label = tk.Label(
-            self.container,
-            text="🔄 Ophalen van data...",
-            font=('Arial', 12),
-            pady=20
-        )
+        # Zoekveld, filtert de lijst tijdens het typen
+        search_frame = tk.Frame(self.container)
+        search_frame.pack(fill='x', pady=(0, 5))
+        tk.Label(search_frame, text="🔍", font=('Arial', 12)).pack(side='left', padx=(0, 5))
+        self.search_var = tk.StringVar()
+        ttk.Entry(search_frame, textvariable=self.search_var).pack(side='left', fill='x', expand=True)
+        self.search_var.trace_add('write', lambda *args: self.schedule_search())
+
+        # Voortgang, tijdens het ophalen (heen en weer bewegend) en tijdens het vullen van de treeview (hoeveel rijen er al staan)
+        self.progress_frame = tk.Frame(self.container)
+        self.progress_label = tk.Label(self.progress_frame, text="🔄 Ophalen van data...", font=('Arial', 12), pady=10)
+        self.progress_label.pack(fill='x')
+        self.progress_bar = ttk.Progressbar(self.progress_frame, mode='indeterminate')
+        self.progress_bar.pack(fill='x', padx=10, pady=(0, 10))
 
         # Style voor de Treeview
         style = ttk.Style()
@@ -123,7 +528,7 @@ class LijstFrame(tk.Frame):
         style.configure("Custom.Treeview.Item", padding=5)
 
         # Treeview
-        self.tree = ttk.Treeview(self.container, style="Custom.Treeview")
+        self.tree = ttk.Treeview(self.container, style="Custom.Treeview", selectmode='extended') #Meerdere rijen selecteren met ctrl/shift, voor de bulk acties
         self.tree.pack(fill='both', expand=True)
         
         # Popup menu, voor het maken van nieuwe vragen
@@ -132,68 +537,280 @@ class LijstFrame(tk.Frame):
         
         # Wanneer er op een item in de treeview wordt geklikt, roepen we de on_select functie aan
         self.tree.bind('<<TreeviewSelect>>', self.on_select)
+        # Open- en dichtklappen van hoofdstukken, voor het lazy vullen en weer leegmaken van de vragen
+        self.tree.bind('<<TreeviewOpen>>', self.on_open)
+        self.tree.bind('<<TreeviewClose>>', self.on_close)
 
     #! Update functies
     def update_lijst(self, items, loading=True):
-        """Update de lijst met items, en toon de loading label als loading=True, check ook wat voor soort items er zijn"""
+        """Update de lijst met items, en toon de loading label als loading=True, check ook wat voor soort items er zijn.
+        De treeview wordt niet leeggemaakt maar bijgewerkt (zie reconcile), zodat opengeklapte hoofdstukken, selectie en scroll positie blijven staan"""
+        self.cancel_render() #Een nieuwere update gaat altijd voor
         if loading:
             self.tree.pack_forget() #Verberg de treeview
-            self.loading_label.pack(fill='both', expand=True)
-            self.update()
+            self.show_progress("🔄 Ophalen van data...") #Wordt getekend zodra de Tk thread weer vrij is, update() is niet nodig
             return
 
-        self.loading_label.pack_forget() #Verberg de loading label
+        self.hide_progress()
         self.tree.pack(fill='both', expand=True) #Toon de treeview
-        
-        #Verwijder alle items uit de vraag_data dictionary
-        self.vraag_data.clear()
-        self.feedback_data.clear()
-        for item in self.tree.get_children(): #Verwijder alle items uit de treeview
-            self.tree.delete(item)
-            
-        # Voeg de nieuwe items toe aan de treeview
-        for item in items:
-            #de meest omslachtige check, maar het werkt en had echt geen tijd meer om er een betere te maken
-            if isinstance(item, list) and all(isinstance(x, dict) and 'feedback' in x for x in item): #Feedback lijst
-                # This is the feedback list
-                for feedback in item:
-                    unique_id = f"feedback-{feedback['id']}" #Maak een unieke id voor de feedback, anders vind de treeview deze niet leuk, ook kunnen wea dan kijken bij on_select of het feedback is
-                    self.feedback_data[unique_id] = feedback #sla de feedback op in de feedback_data dictionary
-                    
-                    # Leuke emoji's voor de status
-                    status_emoji = {
-                        'in_progress': '🔄',
-                        'completed': '✅',
-                        'pending': '⏳'
-                    }.get(feedback.get('status', 'new'), '🆕')
-                    
-                    # Format de datum
-                    date_str = format_date(feedback.get('date', {}))
-                    
-                    # Maak de display text
-                    display_text = f"{status_emoji} {date_str} - {feedback.get('subject', 'Geen onderwerp')}"
-                    
-                    self.tree.insert("", "end", iid=unique_id, text=display_text)
-            
-            # Onderdelen en examens zijn dictionaries met een titel en een lijst van vragen
-            elif isinstance(item, dict): 
-                parent = self.tree.insert("", "end", text=item['titel'])
+        self.items = list(items)
+        self.search_index.sync(self.items) #Alleen nieuwe, gewijzigde en verwijderde vragen kosten werk
+        self.render_items()
+
+    def render_items(self):
+        """Breng de treeview in lijn met self.items (gefilterd op de zoekopdracht), in delen via run_render zodat het venster niet vastloopt bij grote lijsten"""
+        self.searching = bool(self.search_var.get().strip())
+        self.shown_items = self.visible_items()
+        total = 0 #Aantal rijen, voor de voortgang
+        for item in self.shown_items:
+            if isinstance(item, dict):
+                filled = f"chapter-{item['titel']}" in self.filled_chapters or not LIJST_CONFIG['lazy'] or self.searching
+                total += 1 + (len(item['vragen']) + 1 if filled else 1)
+            else:
+                total += len(item) if isinstance(item, list) else 1
+        self.run_render(self.render_steps(), total)
+
+    def visible_items(self):
+        """De items van de lijst, met een zoekopdracht alleen de hoofdstukken met vragen die matchen (en alleen die vragen)"""
+        if not self.searching:
+            return self.items
+        matches = self.search_index.search(self.search_var.get())
+        visible = []
+        for item in self.items:
+            if isinstance(item, dict):
+                vragen = [vraag for vraag in item['vragen'] if (item['titel'], vraag.id) in matches]
+                if vragen:
+                    visible.append({**item, 'vragen': vragen})
+            else: #Feedback en rapporten worden niet doorzocht
+                visible.append(item)
+        return visible
+
+    def schedule_search(self):
+        """Het zoekveld is veranderd, filter de lijst als er even niet is getypt (SEARCH_CONFIG['debounce_ms'])"""
+        if self.search_after:
+            self.after_cancel(self.search_after)
+        self.search_after = self.after(SEARCH_CONFIG['debounce_ms'], self.apply_search)
+
+    def apply_search(self):
+        self.search_after = None
+        if self.tree.winfo_manager(): #Niet tijdens het ophalen, update_lijst filtert straks zelf
+            self.render_items()
+
+    def render_steps(self):
+        """De stappen van render_items: eerst de hoofdstukken, daarna de vragen van de gevulde hoofdstukken.
+        Tijdens het zoeken worden de hoofdstukken met resultaten meteen gevuld en opengeklapt"""
+        yield from self.reconcile_steps("", [row for item in self.shown_items for row in self.item_rows(item)])
+        for chapter, item in list(self.chapters.items()):
+            if chapter not in self.chapters: #Tussendoor verwijderd
+                continue
+            if self.searching:
+                self.tree.item(chapter, open=True)
+                yield from self.fill_chapter_steps(chapter)
+            elif chapter in self.filled_chapters or not (LIJST_CONFIG['lazy'] and item['vragen']):
+                yield from self.fill_chapter_steps(chapter)
+            else:
+                yield from self.reconcile_steps(chapter, [self.placeholder_row(chapter)]) #Vragen pas bij het openklappen invoegen, zie on_open
+
+    #! Time-sliced renderen
+    def run_render(self, steps, total):
+        """Voer de stappen (één per rij) uit in delen van maximaal LIJST_CONFIG['frame_budget_ms'], met after() ertussen zodat Tk kan tekenen"""
+        self.cancel_render()
+        self.render_job = steps
+        self.render_done = 0
+        self.render_total = max(total, 1)
+        self.render_slice()
+
+    def render_slice(self):
+        """Eén deel van de lopende render, plant zichzelf opnieuw in als het budget op is"""
+        self.render_after = None
+        deadline = time.perf_counter() + LIJST_CONFIG['frame_budget_ms'] / 1000
+        try:
+            for _ in self.render_job:
+                self.render_done += 1
+                if time.perf_counter() >= deadline:
+                    self.show_progress(f"Lijst vullen... {self.render_done}/{self.render_total}", min(self.render_done / self.render_total, 1))
+                    self.render_after = self.after(1, self.render_slice)
+                    return
+        except tk.TclError as e:
+            print(f"Fout bij het bijwerken van de lijst: {e}")
+        self.render_job = None
+        self.hide_progress()
+
+    def cancel_render(self):
+        """Stop een lopende render, de treeview blijft in een geldige (maar nog niet complete) staat"""
+        if self.render_after:
+            self.after_cancel(self.render_after)
+            self.render_after = None
+        if self.render_job is not None:
+            self.render_job.close()
+            self.render_job = None
+
+    def show_progress(self, text, fraction=None):
+        """Toon de voortgang, zonder fractie heen en weer bewegend (tijdens het ophalen), anders hoeveel er al klaar is"""
+        self.progress_label.config(text=text)
+        if fraction is None:
+            self.progress_bar.config(mode='indeterminate')
+            self.progress_bar.start(15)
+        else:
+            self.progress_bar.stop()
+            self.progress_bar.config(mode='determinate', value=fraction * 100)
+        if not self.progress_frame.winfo_manager():
+            if self.tree.winfo_manager():
+                self.progress_frame.pack(fill='x', before=self.tree) #Boven de lijst, die al gevuld wordt
+            else:
+                self.progress_frame.pack(fill='both', expand=True)
+
+    def hide_progress(self):
+        """Verberg de voortgang"""
+        self.progress_bar.stop()
+        self.progress_frame.pack_forget()
+
+    def item_rows(self, item):
+        """De rijen [(iid, tekst, opties, data)] van één item (feedback lijst, onderdeel/examen of rapport) op het hoogste niveau van de treeview.
+        De iids zijn stabiel (gebaseerd op id of titel), zodat reconcile kan zien wat er hetzelfde is gebleven.
+        data is (dictionary, waarde) of None, reconcile zet de waarde pas in de dictionary als de rij in de treeview staat"""
+        #de meest omslachtige check, maar het werkt en had echt geen tijd meer om er een betere te maken
+        if isinstance(item, list) and all(isinstance(x, dict) and 'feedback' in x for x in item): #Feedback lijst
+            # This is the feedback list
+            rows = []
+            for feedback in item:
+                unique_id = f"feedback-{feedback['id']}" #Maak een unieke id voor de feedback, anders vind de treeview deze niet leuk, ook kunnen wea dan kijken bij on_select of het feedback is
                 
-                # Voeg de knop "[+ Nieuwe vraag toevoegen]" toe aan het hoofdstuk
-                self.tree.insert(parent, "end", 
-                               text="+ Nieuwe vraag toevoegen", 
-                               tags=('add_button',), #Hierdoor kunnen wij in on_select vinden wat er is geklikt
-                               values=(parent,)) #Values zijn voor extra informatie, zodat we later de parent kunnen vinden
+                # Leuke emoji's voor de status
+                status_emoji = {
+                    'in_progress': '🔄',
+                    'completed': '✅',
+                    'pending': '⏳'
+                }.get(feedback.get('status', 'new'), '🆕')
                 
-                # Voeg de vragen toe aan het hoofdstuk
-                for vraag in item['vragen']:
-                    unique_id = item['titel']+'-'+vraag['id']+'-'+vraag['titel'] #Maak een unieke id voor de vraag, anders vind de treeview deze niet leuk
-                    self.vraag_data[unique_id] = vraag #Sla de vraag op in de vraag_data dictionary
-                    self.tree.insert(parent, "end", iid=unique_id, text=vraag['vraag_tekst'])
-            else: #Rapporten zijn strings (maar dit is ook niet future proof, want ik wil het later meer rapporten toevoegen)
-                self.tree.insert("", "end", text=str(item))
-            
-            #In de toekomst zou ik deze functie willen herschrijven zodat het meer flexibel is, met eventueel een extra parameter voor het type item (onderdeel, examen, feedback, rapport) 🤷‍♂️
+                # Format de datum
+                date_str = format_date(feedback.get('date', {}))
+                
+                # Maak de display text
+                display_text = f"{status_emoji} {date_str} - {feedback.get('subject', 'Geen onderwerp')}"
+                
+                rows.append((unique_id, display_text, {}, (self.feedback_data, feedback))) #sla de feedback op in de feedback_data dictionary
+            return rows
+        
+        # Onderdelen en examens zijn dictionaries met een titel en een lijst van vragen
+        elif isinstance(item, dict): 
+            return [(f"chapter-{item['titel']}", item['titel'], {}, (self.chapters, item))]
+        else: #Rapporten zijn strings (maar dit is ook niet future proof, want ik wil het later meer rapporten toevoegen)
+            return [(f"rapport-{item}", str(item), {}, None)]
+        
+        #In de toekomst zou ik deze functie willen herschrijven zodat het meer flexibel is, met eventueel een extra parameter voor het type item (onderdeel, examen, feedback, rapport) 🤷‍♂️
+
+    def reconcile(self, parent, rows):
+        """Breng de kinderen van parent in de treeview naar rows in één keer, voor kleine updates (openklappen, eviction)"""
+        for _ in self.reconcile_steps(parent, rows):
+            pass
+
+    def reconcile_steps(self, parent, rows):
+        """Breng de kinderen van parent in de treeview naar rows [(iid, tekst, opties, data)], op basis van de stabiele iids.
+        Alleen wat nieuw, verplaatst, veranderd of weg is kost een Tk aanroep, in plaats van alles verwijderen en opnieuw invoegen.
+        Yield na elke rij, zodat run_render kan pauzeren"""
+        wanted = {row[0] for row in rows}
+        children = []
+        stale = []
+        for child in self.tree.get_children(parent):
+            (children if child in wanted else stale).append(child)
+        for child in stale:
+            self.forget(child)
+        if stale:
+            self.tree.delete(*stale)
+
+        existing = set(children)
+        for index, (iid, text, options, data) in enumerate(rows):
+            if iid not in existing:
+                self.tree.insert(parent, index, iid=iid, text=text, **options)
+                children.insert(index, iid)
+                self.row_text[iid] = text
+            else:
+                if index >= len(children) or children[index] != iid: #Staat op een andere plek
+                    self.tree.move(iid, parent, index)
+                    children.remove(iid)
+                    children.insert(index, iid)
+                if self.row_text.get(iid) != text:
+                    self.tree.item(iid, text=text)
+                    self.row_text[iid] = text
+            if data:
+                data[0][iid] = data[1] #Nieuwe of bijgewerkte data, bestaande entries worden overschreven in plaats van alles te legen
+            yield
+
+    def forget(self, iid):
+        """Verwijder de data van een rij (en de rijen eronder) die uit de treeview gaat"""
+        for child in self.tree.get_children(iid):
+            self.forget(child)
+        self.row_text.pop(iid, None)
+        self.vraag_data.pop(iid, None)
+        self.feedback_data.pop(iid, None)
+        if self.chapters.pop(iid, None) is not None:
+            self.filled_chapters.discard(iid)
+            job = self.evict_jobs.pop(iid, None)
+            if job:
+                self.after_cancel(job)
+
+    def placeholder_row(self, chapter):
+        """Placeholder in een hoofdstuk, zodat de Treeview er een openklap pijltje bij zet zonder dat de vragen er al in staan"""
+        return (f"{chapter}-placeholder", "Laden...", {'tags': ('placeholder',)}, None)
+
+    def fill_chapter(self, chapter):
+        """Zet de knop "[+ Nieuwe vraag toevoegen]" en de vragen van een hoofdstuk in één keer in de treeview (bij openklappen)"""
+        for _ in self.fill_chapter_steps(chapter):
+            pass
+
+    def fill_chapter_steps(self, chapter):
+        """Stappen van fill_chapter, voor run_render"""
+        item = self.chapters[chapter]
+        self.filled_chapters.add(chapter)
+
+        # De knop "[+ Nieuwe vraag toevoegen]" bovenaan het hoofdstuk
+        rows = [(f"{chapter}-add", "+ Nieuwe vraag toevoegen", {
+            'tags': ('add_button',), #Hierdoor kunnen wij in on_select vinden wat er is geklikt
+            'values': (chapter,) #Values zijn voor extra informatie, zodat we later de parent kunnen vinden
+        }, None)]
+        
+        # De vragen van het hoofdstuk
+        seen = set()
+        for vraag in item['vragen']:
+            unique_id = item['titel']+'-'+vraag.id #Stabiele id voor de vraag, dus niet op basis van de positie (vraag.titel)
+            while unique_id in seen: #Dezelfde vraag twee keer in een hoofdstuk
+                unique_id += '+'
+            seen.add(unique_id)
+            rows.append((unique_id, vraag.vraag_tekst, {}, (self.vraag_data, vraag))) #Sla de vraag (Question struct) op in de vraag_data dictionary
+        yield from self.reconcile_steps(chapter, rows)
+
+    def on_open(self, event):
+        """Een hoofdstuk wordt opengeklapt, vul de vragen als die er nog niet in staan"""
+        chapter = self.tree.focus()
+        job = self.evict_jobs.pop(chapter, None)
+        if job:
+            self.after_cancel(job) #Weer open, dus niet meer leegmaken
+        if chapter in self.chapters and chapter not in self.filled_chapters:
+            if self.render_job is not None: #De lopende render opnieuw starten, die vult het hoofdstuk nu ook (en slaat ongewijzigde rijen snel over)
+                self.filled_chapters.add(chapter)
+                self.render_items()
+            else:
+                self.fill_chapter(chapter)
+
+    def on_close(self, event):
+        """Een hoofdstuk wordt dichtgeklapt, plan het leegmaken in (LIJST_CONFIG['evict_after'])"""
+        chapter = self.tree.focus()
+        if LIJST_CONFIG['lazy'] and LIJST_CONFIG['evict_after'] is not None and chapter in self.filled_chapters:
+            if chapter in self.evict_jobs:
+                self.after_cancel(self.evict_jobs[chapter])
+            self.evict_jobs[chapter] = self.after(int(LIJST_CONFIG['evict_after'] * 1000), lambda: self.evict_chapter(chapter))
+
+    def evict_chapter(self, chapter):
+        """Haal de vragen van een dichtgeklapt hoofdstuk weer uit de Treeview, zodat een lange sessie niet alle vragen blijft vasthouden"""
+        self.evict_jobs.pop(chapter, None)
+        if chapter not in self.filled_chapters or self.tree.item(chapter, 'open') or self.render_job is not None:
+            return
+        children = self.tree.get_children(chapter)
+        if any(child in self.tree.selection() for child in children): #De geselecteerde vraag niet weghalen
+            return
+        self.filled_chapters.discard(chapter)
+        self.reconcile(chapter, [self.placeholder_row(chapter)]) #Haalt de vragen en hun vraag_data weg
 
     def create_new_question(self):
         """Maak een nieuwe vraag aan"""
@@ -207,21 +824,7 @@ class LijstFrame(tk.Frame):
             # Als er een type is gekozen
             if dialog.result:
                 # Maak een lege vraag template
-                empty_question = {
-                    'id': 'new',
-                    'titel': 'Nieuwe vraag',
-                    'vraag_tekst': '',
-                    'type': dialog.result,
-                    'opties': [],
-                    'antwoord': '',
-                    'uitleg': '',
-                    'afbeelding': '',
-                    'context': '',
-                    'terms': {},
-                    'imageOptions': [],
-                    'correctPositions': [],
-                    'parent': parent_text
-                }
+                empty_question = Question(id='new', titel='Nieuwe vraag', type=dialog.result, parent=parent_text) # De rest zijn de defaults
                 
                 # Toon de vraag details met de lege template
                 self.app.show_vraag_details(parent_text, empty_question)
@@ -231,17 +834,30 @@ class LijstFrame(tk.Frame):
         1. Er is op de knop "[+ Nieuwe vraag toevoegen]" geklikt, dan maken we een nieuwe vraag aan
         2. Er is op een vraag geklikt, dan tonen we de vraag details
         3. Er is op een feedback item geklikt, dan tonen we de feedback details
-        4. Er is op een rapport geklikt, dan tonen we de rapport details (Voor nu altijd de feedback rapporten)"""
+        4. Er is op een rapport geklikt, dan tonen we de rapport details (Voor nu altijd de feedback rapporten)
+        Met ctrl/shift kunnen meerdere vragen of feedback items worden geselecteerd, dan tonen we de bulk acties"""
         selection = self.tree.selection()
         if not selection: #Als er niks is geselecteerd, stop
             return
+        if len(selection) > 1:
+            vragen, feedback = self.selected_rows(selection)
+            if vragen or feedback:
+                self.app.show_bulk_details(vragen, feedback)
+            return
         
-        selected_item = selection[0] #Pak het eerste item, want we doen niet aan meerdere selectie
+        selected_item = selection[0]
         selected_text = self.tree.item(selected_item)['text']
+        if 'placeholder' in self.tree.item(selected_item)['tags']: #Hoofdstuk wordt nog gevuld
+            return
         
         # Er is op de knop "Export feedback" geklikt, dan tonen we de feedback rapport details
         if selected_text == "Export feedback":
-            self.app.handle_async_button(self.app.show_rapport_feedback_details())
+            self.app.handle_async_button(self.app.show_rapport_feedback_details(), slot='nav')
+            return
+
+        # Er is op het rapport "Dubbele vragen" geklikt
+        if selected_text == "Dubbele vragen" and selected_item.startswith('rapport-'):
+            self.app.handle_async_button(self.app.show_duplicates_report(), slot='nav')
             return
 
         print(f"Selected item: {selected_item}")
@@ -273,6 +889,536 @@ class LijstFrame(tk.Frame):
                     hoofdstuk=parent_text,
                     vraag_data=vraag_data
                 )
+                self.prefetch_neighbours(parent_id, vraag_data)
+
+    def selected_rows(self, selection):
+        """De geselecteerde vragen [(hoofdstuk, vraag)] en feedback items, voor de bulk acties.
+        Hoofdstukken, knoppen, rapporten en vragen die nog worden aangemaakt (tijdelijke id) tellen niet mee"""
+        vragen = []
+        feedback = []
+        for iid in selection:
+            if iid in self.vraag_data and self.tree.parent(iid) in self.chapters and not str(self.vraag_data[iid].id).startswith(LOCAL_ID_PREFIX):
+                vragen.append((self.chapters[self.tree.parent(iid)]['titel'], self.vraag_data[iid]))
+            elif iid in self.feedback_data:
+                feedback.append(self.feedback_data[iid])
+        return vragen, feedback
+
+    def prefetch_neighbours(self, chapter, vraag):
+        """Laad op de achtergrond de afbeeldingen van de vragen voor en na de geselecteerde vraag, dichtstbijzijnde eerst"""
+        vragen = self.chapters[chapter]['vragen'] if chapter in self.chapters else []
+        if vraag not in vragen:
+            return
+        index = vragen.index(vraag)
+        neighbours = []
+        for distance in range(1, PREFETCH_CONFIG['neighbours'] + 1):
+            neighbours += [vragen[i] for i in (index + distance, index - distance) if 0 <= i < len(vragen)]
+        self.app.handle_async_button(self.app.prefetcher.prefetch(chapter, neighbours))
+
+class LiveImages:
+    """De PhotoImages die het details frame nu toont. Tkinter toont een afbeelding alleen zolang er een Python referentie naar is,
+    dus elke afbeelding hoort bij de widget die hem toont en wordt losgelaten zodra die widget verdwijnt (of als er meer dan cap zijn)"""
+
+    def __init__(self, cap):
+        self.cap = cap
+        self._images = OrderedDict() # widget naam -> (widget, PhotoImage, bytes), oudste eerst
+        self._watched = set() # Widgets met een <Destroy> binding, een hergebruikte widget (zie QuestionForm) krijgt hem maar één keer
+        self.total_bytes = 0 # Geheugen van de afbeeldingen die nu vastgehouden worden
+
+    def __len__(self):
+        return len(self._images)
+
+    def add(self, widget, photo):
+        """Houd photo vast zolang widget bestaat"""
+        key = str(widget)
+        self.release(key)
+        size = photo.width() * photo.height() * 4 # Tk bewaart een foto met 4 bytes per pixel
+        self._images[key] = (widget, photo, size)
+        self.total_bytes += size
+        if key not in self._watched:
+            self._watched.add(key)
+            widget.bind('<Destroy>', lambda event: (self.release(key), self._watched.discard(key)), add='+')
+        while len(self._images) > self.cap:
+            oldest_widget = next(iter(self._images.values()))[0]
+            self.release(str(oldest_widget))
+            if oldest_widget.winfo_exists():
+                oldest_widget.configure(image='') #Leeg tonen in plaats van naar een verwijderde afbeelding te wijzen
+
+    def release(self, key):
+        """Laat de afbeelding van een widget los"""
+        entry = self._images.pop(key, None)
+        if entry:
+            self.total_bytes -= entry[2]
+
+    def clear(self):
+        """Laat alle afbeeldingen los, bij het leegmaken van het details frame"""
+        self._images.clear()
+        self.total_bytes = 0
+
+class FormRow:
+    """Een rij in het vraag formulier (begrip, optie, positie of afbeelding tegel), met de widgets als attributen"""
+
+    def __init__(self, frame, **widgets):
+        self.frame = frame
+        self.__dict__.update(widgets)
+
+class RowPool:
+    """De rijen van een lijst in het vraag formulier (begrippen, opties, posities).
+    Een verwijderde rij wordt verborgen en bij een volgende vraag hergebruikt in plaats van opnieuw gebouwd"""
+
+    def __init__(self, container, build):
+        self.container = container
+        self.build = build # build(pool) -> FormRow, in pool.container
+        self.rows = [] # De zichtbare rijen, op volgorde
+        self.free = [] # Verborgen rijen die hergebruikt kunnen worden
+        self.stats = {'built': 0, 'reused': 0}
+
+    def __len__(self):
+        return len(self.rows)
+
+    def __iter__(self):
+        return iter(self.rows)
+
+    def acquire(self):
+        """Een rij onderaan de lijst, uit de pool als dat kan"""
+        if self.free:
+            row = self.free.pop()
+            self.stats['reused'] += 1
+        else:
+            row = self.build(self)
+            self.stats['built'] += 1
+        row.frame.pack(fill='x', pady=2)
+        self.rows.append(row)
+        return row
+
+    def release(self, row):
+        """Verberg een rij en bewaar hem voor hergebruik (de × knop)"""
+        row.frame.pack_forget()
+        self.rows.remove(row)
+        self.free.append(row)
+
+    def resize(self, count):
+        """Zorg dat er precies count rijen zichtbaar zijn, en geef ze terug"""
+        while len(self.rows) > count:
+            self.release(self.rows[-1])
+        while len(self.rows) < count:
+            self.acquire()
+        return self.rows
+
+class QuestionForm(tk.Frame):
+    """Het vraag formulier in het details frame, voor één vraag type. Het wordt één keer gebouwd en bij elke vraag van dat type
+    opnieuw ingevuld (fill_question), de rijen voor begrippen, opties en posities komen uit een RowPool"""
+
+    def __init__(self, parent, details, question_type):
+        super().__init__(parent)
+        self.details = details
+        self.question_type = question_type
+        self.vraag_data = None
+        self.generation = 0 # Telt per ingevulde vraag, afbeeldingen die nog voor een vorige vraag binnenkomen worden genegeerd
+
+        # Widgets die niet bij elk vraag type horen blijven None (of leeg)
+        self.context_text = None
+        self.terms = None
+        self.answer_entry = None
+        self.options = None
+        self.antwoord_text = None
+        self.positions = None
+        self.image_entry = None # Afbeelding URL, alleen bij nieuwe multiple choice en drag and drop vragen
+        self.image_entries = [] # Afbeelding URLS van de opties, alleen bij nieuwe image selection vragen
+        self.new_only = None # Frame met de velden die alleen bij een nieuwe vraag worden getoond
+        self.new_only_pack = {'side': 'left'} # Waar new_only wordt ingepakt
+        self.tiles = [] # Tegels van de image selection grid
+
+        main_container = details.create_scrollable_frame(self)
+        self.canvas = main_container.master
+        self.create_header(main_container)
+
+        content_container = tk.Frame(main_container, padx=20)
+        content_container.pack(fill='both', expand=True)
+        left_column = tk.Frame(content_container)
+        left_column.pack(side='left', fill='both', expand=True, padx=(0, 10))
+        right_column = tk.Frame(content_container) # De afbeelding van de vraag
+        right_column.pack(side='right', fill='both', padx=(10, 0))
+        self.image_frame = tk.Frame(right_column, relief='solid') # Alleen getoond als de vraag een afbeelding heeft
+        self.image_label = tk.Label(self.image_frame)
+        self.image_label.pack(padx=10, pady=10)
+
+        if question_type in ['open', 'multiple_choice']:
+            self.create_context(left_column)
+        self.create_question(left_column)
+        if question_type in ['open', 'multiple_choice']:
+            self.create_terms(left_column)
+        self.create_answer(left_column)
+        self.create_explanation(main_container)
+        if question_type == 'drag_and_drop':
+            self.create_positions(main_container)
+
+    @staticmethod
+    def set_text(widget, value):
+        """Vervang de inhoud van een Text widget"""
+        widget.delete('1.0', 'end')
+        widget.insert('1.0', value)
+
+    @staticmethod
+    def set_entry(widget, value):
+        """Vervang de inhoud van een Entry widget"""
+        widget.delete(0, 'end')
+        widget.insert(0, value)
+
+    def create_header(self, parent):
+        """Maak de header van de vraag, hier staat de titel en de knoppen voor verwijderen en opslaan"""
+        header_frame = tk.Frame(parent, padx=20, pady=10)
+        header_frame.pack(fill='x')
+
+        header_left = tk.Frame(header_frame)
+        header_left.pack(side='left')
+
+        header_right = tk.Frame(header_frame)
+        header_right.pack(side='right')
+
+        # De titel, wordt per vraag ingevuld
+        self.title_label = tk.Label(header_left, font=('Arial', 16, 'bold'),)
+        self.title_label.pack(anchor='w')
+        self.status_label = tk.Label(header_left, font=('Arial', 10), fg='#666666') # Voortgang van het opslaan (zie DetailsFrame.show_save_status)
+        self.status_label.pack(anchor='w')
+
+        # De knoppen werken op de vraag die nu is ingevuld
+        ttk.Button(header_right, text="Verwijderen", style='Accent.TButton', width=20, command=lambda: self.details.delete_question(self.vraag_data.id)).pack(side='right', padx=(5, 0), pady=5)
+
+        ttk.Button(header_right, text="Opslaan", style='Accent.TButton', width=20, command=lambda: self.details.save_question(self.vraag_data.id)).pack(side='right', pady=5)
+
+    def create_context(self, parent):
+        """Maak de context sectie (open vraag, multiple choice)"""
+        context_frame = tk.Frame(parent)
+        context_frame.pack(fill='x', pady=10)
+
+        tk.Label(context_frame, text="Context ({} voor termen en [] voor italic):", font=('Arial', 12, 'bold'),).pack(anchor='w')
+
+        self.context_text = tk.Text(context_frame,height=5,font=('Arial', 11),width=30,wrap='word',)
+        self.context_text.pack(fill='x', pady=5)
+
+    def create_question(self, parent):
+        """Maak de vraag sectie (de daadwerkelijke vraag tekst)"""
+        question_frame = tk.Frame(parent)
+        question_frame.pack(fill='x', pady=10)
+
+        tk.Label(question_frame,text="Vraag:",font=('Arial', 12, 'bold'),).pack(anchor='w')
+
+        self.question_text = tk.Text(question_frame,height=4,font=('Arial', 11),wrap='word',)
+        self.question_text.pack(fill='x', pady=5)
+
+    def create_terms(self, parent):
+        """Maak de begrippen sectie (begrippen, en + knop om nieuwe begrippen toe te voegen)"""
+        terms_frame = tk.Frame(parent)
+        terms_frame.pack(fill='x', pady=(20, 10))
+
+        header_frame = tk.Frame(terms_frame)
+        header_frame.pack(fill='x', pady=(0, 5))
+
+        tk.Label(header_frame,text="Begrippen:",font=('Arial', 12, 'bold'),).pack(side='left')
+
+        ttk.Button(header_frame,text="+ Nieuw begrip",style='Accent.TButton',width=15,command=self.add_term).pack(side='right')
+
+        terms_container = tk.Frame(terms_frame)
+        terms_container.pack(fill='x')
+        self.terms = RowPool(terms_container, self.build_term_row)
+
+    def build_term_row(self, pool):
+        """Bouw een begrip rij, met een term en definitie en een knop om hem te verwijderen"""
+        term_frame = tk.Frame(pool.container)
+
+        # Maak de linker kolom voor de term
+        term_left = tk.Frame(term_frame)
+        term_left.pack(side='left', fill='x', expand=True, padx=(0, 5))
+
+        tk.Label(term_left,text="Term:",font=('Arial', 10, 'bold')).pack(side='left', padx=(0, 5))
+
+        term_entry = ttk.Entry(term_left, width=20)
+        term_entry.pack(side='left', fill='x', expand=True)
+
+        # Maak de rechter kolom voor de definitie
+        def_right = tk.Frame(term_frame)
+        def_right.pack(side='left', fill='x', expand=True, padx=(5, 0))
+
+        tk.Label(def_right,text="Definitie:",font=('Arial', 10, 'bold')).pack(side='left', padx=(0, 5))
+
+        def_entry = ttk.Entry(def_right)
+        def_entry.pack(side='left', fill='x', expand=True)
+
+        row = FormRow(term_frame, term_entry=term_entry, def_entry=def_entry)
+        # Delete knop die de rij terug in de pool zet
+        ttk.Button(term_frame,text="×",width=3,style='Accent.TButton',command=lambda: pool.release(row)).pack(side='right', padx=(5, 0))
+        return row
+
+    def add_term(self):
+        """Voeg een lege begrip rij toe, de + knop"""
+        row = self.terms.acquire()
+        self.set_entry(row.term_entry, '')
+        self.set_entry(row.def_entry, '')
+
+    def create_answer(self, parent):
+        """Maak de antwoord sectie, afhankelijk van het vraag type"""
+        answer_frame = tk.Frame(parent)
+        answer_frame.pack(fill='x', pady=10)
+
+        if self.question_type == 'drag_and_drop':
+            #Drag and drop heeft geen antwoord, alleen een afbeelding url bij een nieuwe vraag
+            self.new_only = tk.Frame(answer_frame)
+            tk.Label(self.new_only,text="Afbeelding URL:",font=('Arial', 10)).pack(side='left', padx=(0, 5))
+            self.image_entry = ttk.Entry(self.new_only, width=20)
+            self.image_entry.pack(side='left', padx=(0, 5))
+            return
+
+        tk.Label(answer_frame, text="Antwoord:", font=('Arial', 12, 'bold'),).pack(anchor='w')
+
+        if self.question_type == 'multiple_choice':
+            self.create_multiple_choice(answer_frame)
+        elif self.question_type == 'image_selection':
+            self.create_image_selection(answer_frame)
+        elif self.question_type == 'open':
+            self.antwoord_text = tk.Text(answer_frame,height=4,font=('Arial', 11),wrap='word',width=30)
+            self.antwoord_text.pack(fill='x', pady=5)
+
+    def create_multiple_choice(self, parent):
+        """Maak de multiple choice sectie (correct antwoord en opties)"""
+        # Maak het frame voor het correcte antwoord
+        correct_answer_frame = tk.Frame(parent)
+        correct_answer_frame.pack(fill='x', pady=5)
+
+        tk.Label(correct_answer_frame, text="Correct antwoord:", font=('Arial', 10)).pack(side='left', padx=(0, 5))
+
+        self.answer_entry = ttk.Entry(correct_answer_frame)  # Opslag voor het correcte antwoord
+        self.answer_entry.pack(side='left', fill='x', expand=True)
+
+        #Alleen bij het maken van nieuwe vragen, geef de url van de afbeelding op
+        self.new_only = tk.Frame(correct_answer_frame)
+        tk.Label(self.new_only,text="Afbeelding URL:",font=('Arial', 10)).pack(side='left', padx=(0, 5))
+        self.image_entry = ttk.Entry(self.new_only, width=20)
+        self.image_entry.pack(side='left', padx=(0, 5))
+
+        # Knop om nieuwe opties toe te voegen
+        add_option_frame = tk.Frame(parent)
+        add_option_frame.pack(fill='x', pady=5)
+
+        ttk.Button(add_option_frame,text="+ Nieuwe optie",style='Accent.TButton',command=self.add_option).pack(side='right')
+
+        # Container voor de opties
+        options_container = tk.Frame(parent)
+        options_container.pack(fill='x')
+        self.options = RowPool(options_container, self.build_option_row)
+
+    def build_option_row(self, pool):
+        """Bouw een multiple choice optie rij, met een knop om hem te verwijderen"""
+        option_frame = tk.Frame(pool.container)
+
+        option_var = tk.StringVar() #StringVar reageert op veranderingen en moet dus voor de entry staan
+        ttk.Entry(option_frame,textvariable=option_var).pack(side='left', fill='x', expand=True, padx=(0, 5))
+
+        row = FormRow(option_frame, var=option_var)
+        # Knop om de optie te verwijderen
+        ttk.Button(option_frame,text="×",width=3,style='Accent.TButton',command=lambda: pool.release(row)).pack(side='left', padx=(5, 0))
+        return row
+
+    def add_option(self):
+        """Voeg een lege optie toe, de + knop"""
+        self.options.acquire().var.set('')
+
+    def create_image_selection(self, parent):
+        """Maak de image selection sectie (2x2 grid met de afbeeldingen en het antwoord)"""
+        self.images_frame = tk.Frame(parent) # De tegels worden bij de eerste vraag met zoveel opties gemaakt, zie show_tiles
+        self.images_frame.pack(fill='x', pady=5)
+
+        #Alleen bij het maken van nieuwe vragen, geef de urls op van de imageOptions
+        self.new_only = tk.Frame(parent)
+        self.new_only_pack = {'fill': 'x', 'pady': 5, 'after': self.images_frame}
+        tk.Label(self.new_only,text="Afbeeldingen URLS:",font=('Arial', 10, 'bold')).pack(side='left', padx=(0, 5))
+        for i in range(4):
+            entry = ttk.Entry(self.new_only, width=20)
+            entry.pack(side='left', padx=(0, 5))
+            self.image_entries.append(entry)
+
+        answer_container = tk.Frame(parent)
+        answer_container.pack(fill='x', pady=5)
+
+        tk.Label(answer_container,text="Antwoord (0-3):",font=('Arial', 10)).pack(side='left', padx=(0, 5)) #de user moet het antwoord invullen (mogelij moet er input validatie komen)
+
+        self.answer_entry = ttk.Entry(answer_container, width=5)  # Opslag voor het correcte antwoord
+        self.answer_entry.pack(side='left')
+
+    def create_option_tile(self, option_num):
+        """Maak een tegel in de 2x2 grid, met een vaste grootte zodat de grid niet verspringt als de afbeelding binnenkomt"""
+        option_frame = tk.Frame(self.images_frame)
+        option_frame.grid(row=(option_num-1) // 2, column=(option_num-1) % 2, padx=5, pady=5)
+
+        width, height = IMAGE_CACHE_CONFIG['option_size']
+        tile = tk.Frame(option_frame, width=width + 10, height=height + 10, relief='solid', borderwidth=1)
+        tile.pack_propagate(False) #Vaste grootte, ook voordat de afbeelding er is
+        tile.pack(padx=5, pady=5)
+        label = tk.Label(tile, font=('Arial', 9))
+        label.pack(expand=True)
+
+        # Label met optie nummer
+        tk.Label(option_frame,text=f"Optie {option_num-1}",font=('Arial', 10)).pack()
+        return FormRow(option_frame, label=label)
+
+    def create_explanation(self, parent):
+        """Maak de feedback sectie (uitleg)"""
+        uitleg_frame = tk.Frame(parent, padx=20)
+        uitleg_frame.pack(fill='x', pady=10)
+
+        tk.Label(uitleg_frame,text="Uitleg:",font=('Arial', 12, 'bold'),).pack(anchor='w')
+
+        self.explanation_text = tk.Text(uitleg_frame,height=3,font=('Arial', 11),wrap='word',width=30)
+        self.explanation_text.pack(fill='x', pady=5)
+
+    def create_positions(self, parent):
+        """Maak de positie sectie bij drag and drop vragen"""
+        positions_frame = tk.Frame(parent, padx=20)
+        positions_frame.pack(fill='x', pady=10)
+
+        positions_header = tk.Frame(positions_frame)
+        positions_header.pack(fill='x', pady=(0, 5))
+
+        tk.Label(positions_header,text="Posities:",font=('Arial', 12, 'bold'),).pack(side='left')
+
+        ttk.Button(positions_header,text="+ Nieuwe positie",style='Accent.TButton',width=15,command=self.add_position).pack(side='right')
+
+        positions_container = tk.Frame(positions_frame)
+        positions_container.pack(fill='x')
+        self.positions = RowPool(positions_container, self.build_position_row)
+
+    def build_position_row(self, pool):
+        """Bouw een positie rij (x en y), met een knop om hem te verwijderen"""
+        position_frame = tk.Frame(pool.container)
+        line = tk.Frame(position_frame)
+        line.pack(fill='x')
+
+        label = tk.Label(line,font=('Arial', 10, 'bold')) # Positie n, wordt per vraag ingevuld
+        label.pack(side='left', padx=(0, 10))
+
+        tk.Label(line,text="X:",font=('Arial', 10)).pack(side='left', padx=(0, 5))
+
+        x_entry = ttk.Entry(line, width=8)
+        x_entry.pack(side='left', padx=(0, 10))
+
+        tk.Label(line,text="Y:",font=('Arial', 10)).pack(side='left', padx=(0, 5))
+
+        y_entry = ttk.Entry(line, width=8)
+        y_entry.pack(side='left')
+
+        row = FormRow(position_frame, label=label, x_entry=x_entry, y_entry=y_entry)
+        ttk.Button(line,text="×",width=3,style='Accent.TButton',command=lambda: pool.release(row)).pack(side='right', padx=(10, 0))
+
+        ttk.Separator(position_frame).pack(fill='x', pady=5)
+        return row
+
+    def set_position(self, row, number, x=0, y=0):
+        row.label.configure(text=f"Positie {number}:")
+        self.set_entry(row.x_entry, str(x))
+        self.set_entry(row.y_entry, str(y))
+
+    def add_position(self):
+        """Voeg een positie toe, de + knop"""
+        self.set_position(self.positions.acquire(), len(self.positions))
+
+    def fill_question(self, hoofdstuk, vraag_data):
+        """Vul het formulier met een vraag van dit type, de widgets blijven staan en alleen de waarden en het aantal rijen veranderen"""
+        self.vraag_data = vraag_data
+        self.generation += 1
+        self.canvas.yview_moveto(0) #Begin bovenaan, ook als de vorige vraag naar beneden was gescrold
+
+        self.title_label.configure(text=f"📘 {hoofdstuk} - {vraag_data.id}")
+        self.status_label.configure(text='')
+        self.show_question_image(vraag_data.afbeelding)
+
+        if self.context_text is not None:
+            self.set_text(self.context_text, vraag_data.context)
+        self.set_text(self.question_text, vraag_data.vraag_tekst)
+        if self.terms is not None:
+            for row, (term, definition) in zip(self.terms.resize(len(vraag_data.terms)), vraag_data.terms.items()):
+                self.set_entry(row.term_entry, term)
+                self.set_entry(row.def_entry, definition)
+
+        if self.question_type == 'multiple_choice':
+            self.set_entry(self.answer_entry, vraag_data.antwoord)
+            for row, optie in zip(self.options.resize(len(vraag_data.opties)), vraag_data.opties):
+                row.var.set(optie)
+        elif self.question_type == 'image_selection':
+            self.set_entry(self.answer_entry, str(vraag_data.correctAnswer) if 'correctAnswer' in vraag_data else '')
+            self.show_tiles(vraag_data.imageOptions)
+        elif self.question_type == 'open':
+            self.set_text(self.antwoord_text, vraag_data.antwoord)
+        elif self.question_type == 'drag_and_drop':
+            positions = vraag_data.correctPositions
+            for i, (row, pos) in enumerate(zip(self.positions.resize(len(positions)), positions)):
+                self.set_position(row, i + 1, pos.get('positionX', 0), pos.get('positionY', 0))
+
+        # De velden voor een nieuwe vraag, leeg en alleen zichtbaar bij 'new'
+        for entry in self.image_entries + ([self.image_entry] if self.image_entry is not None else []):
+            entry.delete(0, 'end')
+        if self.new_only is not None:
+            if vraag_data.id == 'new':
+                self.new_only.pack(**self.new_only_pack)
+            else:
+                self.new_only.pack_forget()
+
+        self.set_text(self.explanation_text, vraag_data.uitleg)
+
+    def show_question_image(self, url):
+        """Verberg de afbeelding van de vorige vraag en laad die van deze vraag (rechter kolom)"""
+        self.image_label.configure(image='')
+        self.details.loaded_images.release(str(self.image_label))
+        self.image_frame.pack_forget()
+        if url:
+            self.details.app.handle_async_button(self.load_question_image(url, self.generation))
+
+    async def load_question_image(self, url, generation):
+        """Laad de vraag afbeelding, in de event loop"""
+        image = await self.details.load_image_from_url(url, size=IMAGE_CACHE_CONFIG['question_size'])
+        if image is not None:
+            self.details.app.ui.post(self.display_question_image, image, generation)
+
+    def display_question_image(self, image, generation):
+        """Toon de vraag afbeelding, op de Tk thread via de UI wachtrij"""
+        if generation != self.generation or not self.winfo_exists(): #De gebruiker kan al een andere vraag hebben geopend
+            return
+        photo = ImageTk.PhotoImage(image)
+        self.image_label.configure(image=photo)
+        self.image_frame.pack(pady=10)
+        self.details.loaded_images.add(self.image_label, photo) #Losgelaten als de label verdwijnt of een andere vraag wordt ingevuld
+
+    def show_tiles(self, urls):
+        """Toon een tegel per afbeelding optie en laad de afbeeldingen tegelijk via de ImageLoader, de grid is de view"""
+        while len(self.tiles) < len(urls):
+            self.tiles.append(self.create_option_tile(len(self.tiles) + 1))
+        jobs = []
+        for i, tile in enumerate(self.tiles):
+            if i >= len(urls):
+                tile.frame.grid_remove() #Onthoudt zijn plek in de grid voor een volgende vraag
+                continue
+            tile.frame.grid()
+            self.details.loaded_images.release(str(tile.label))
+            if urls[i]:
+                tile.label.configure(image='', text="Laden...", fg='gray')
+                jobs.append((urls[i], IMAGE_CACHE_CONFIG['option_size'],
+                             lambda image, tile=tile, generation=self.generation: self.option_image_loaded(tile, generation, image)))
+            else:
+                tile.label.configure(image='', text="Geen afbeelding", fg='gray')
+        self.details.app.handle_async_button(self.details.app.image_loader.load_view(f"{self}-{self.generation}", jobs))
+
+    def option_image_loaded(self, tile, generation, image):
+        """Callback van de ImageLoader (in de event loop), toon de afbeelding via de UI wachtrij"""
+        self.details.app.ui.post(self.display_option_image, tile, generation, image)
+
+    def display_option_image(self, tile, generation, image):
+        """Toon een afbeelding optie in zijn tegel, op de Tk thread via de UI wachtrij"""
+        if generation != self.generation or not tile.label.winfo_exists(): #De tegel toont al een andere vraag
+            return
+        if image is None: #Niet te laden of de view duurde te lang
+            tile.label.configure(image='', text="Niet geladen", fg='red')
+            return
+        photo = ImageTk.PhotoImage(image)
+        tile.label.configure(image=photo, text='')
+        self.details.loaded_images.add(tile.label, photo)
 
 class DetailsFrame(tk.Frame):
     """De details frame is de rechter frame die de details van een vraag, feedback of rapport toont; De belangrijkste functies zijn show_vraag_ui, show_feedback_ui en show_rapport_feedback_ui, als het rest zijn onderdelen hiervan"""
@@ -286,59 +1432,40 @@ class DetailsFrame(tk.Frame):
         self.content_frame.pack(fill='both', expand=True)
 
         # Bewaar de geladen afbeeldingen om garbage collection te voorkomen
-        self.loaded_images = []
+        self.loaded_images = LiveImages(IMAGE_CACHE_CONFIG['max_live_images']) # len() en total_bytes geven het aantal en geheugen van de afbeeldingen die nu leven
+
+        self.local_ids = itertools.count(1) # Voor de tijdelijke ids van vragen die nog worden aangemaakt
+        self.forms = {} # type -> QuestionForm, hergebruikt bij het wisselen van vraag (zie DETAILS_CONFIG)
+        self.form = None # Het formulier dat nu wordt getoond
 
     # laad url images met TKinter
     async def load_image_from_url(self, url, size=(100, 100)):
-        """Laad een afbeelding van een URL"""
+        """Laad een afbeelding van een URL, als verkleinde PIL image. De PhotoImage wordt pas op de Tk thread gemaakt (zie display_question_image)"""
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url) as response:
-                    if response.status == 200:
-                        # Read image data
-                        image_data = await response.read()
-                        # Convert to PIL Image
-                        image = Image.open(io.BytesIO(image_data))
-                        # Resize image
-                        image = image.resize(size, Image.Resampling.LANCZOS)
-                        # Convert to PhotoImage
-                        photo = ImageTk.PhotoImage(image)
-                        return photo
+            # Via de image cache, een vraag die al eens is geopend heeft geen download of decode meer nodig
+            return await self.app.image_cache.get(url, size)
         except Exception as e:
             print(f"Fout bij het laden van de afbeelding {url}: {e}")
             return None
 
     def show_vraag_ui(self, hoofdstuk, vraag_data):
-        """Dit is de UI die wordt getoond wanneer er op een vraag wordt geklikt, het past zicht aan op basis van het type vraag"""
-        # Initialize all possible storage variables
-        self.terms_entries = [] #Opslag voor de begrippen (terms)
-        self.position_frames = [] #Opslag voor de positie frames (drag and drop)
-        self.option_entries = []  # Opslag voor de antwoord opties (multiple choice)
-        self.selected_option = None  # Opslag voor de geselecteerde optie (multiple choice), default is None want er is nog geen optie geselecteerd
-        self.image_urls = [] #Opslag voor de afbeeldingen (image selection)
-        self.current_type = vraag_data['type'] #Opslag voor het type vraag
-        self.image_url = vraag_data.get('image', '') #Opslag voor de afbeelding (image selection)
+        """Dit is de UI die wordt getoond wanneer er op een vraag wordt geklikt. Per type vraag is er één formulier (QuestionForm),
+        dat bij de volgende vraag van hetzelfde type opnieuw wordt ingevuld in plaats van opnieuw opgebouwd"""
+        self.current_type = vraag_data.type #Opslag voor het type vraag
+        self.image_url = vraag_data.image #Opslag voor de afbeelding
         self.parent = hoofdstuk  # Opslag voor de parent/hoofdstuk
 
-        # Maak de UI leeg
+        # Maak de UI leeg, de formulieren worden alleen verborgen
         self.clear_content()
-        
-        # Maak de hoofd container
-        main_container = self.create_scrollable_frame(self.content_frame)
-        self.create_header(main_container, hoofdstuk, vraag_data)
-        content_container = self.create_content_container(main_container)
 
-        # Maak de linker en rechter kolom   
-        left_column = self.create_left_column(content_container)
-        self.create_right_column(content_container, vraag_data)
-        
-        # Maak de context, vraag, begrippen, antwoord en feedback secties
-        self.create_question_context(left_column, vraag_data)
-        self.create_question_frame(left_column, vraag_data)
-        self.create_terms_frame(left_column, vraag_data)
-        self.create_answer_and_options_frame(left_column, vraag_data)
-        self.create_feedback_section(main_container, vraag_data)
-        self.create_positions_section(main_container, vraag_data)
+        form = self.forms.get(vraag_data.type)
+        if form is None:
+            form = QuestionForm(self.content_frame, self, vraag_data.type)
+            if DETAILS_CONFIG['reuse_forms']:
+                self.forms[vraag_data.type] = form
+        form.fill_question(hoofdstuk, vraag_data)
+        form.pack(fill='both', expand=True)
+        self.form = form
 
     def create_scrollable_frame(self, parent):
         """Maak een scrollbare container, voor show_vraag_ui"""
@@ -358,31 +1485,12 @@ class DetailsFrame(tk.Frame):
         scrollable_frame.bind('<Configure>', configure_scroll_region)
         return scrollable_frame
 
-    def create_header(self, parent, hoofdstuk, vraag_data):
-        """Maak de header van de vraag, hier staat de titel en de knoppen voor verwijderen en opslaan, voor show_vraag_ui"""
-        header_frame = tk.Frame(parent, padx=20, pady=10)
-        header_frame.pack(fill='x')
-
-        header_left = tk.Frame(header_frame)
-        header_left.pack(side='left')
-
-        header_right = tk.Frame(header_frame)
-        header_right.pack(side='right')
-
-        # Voeg de titel toe
-        tk.Label(header_left, text=f"📘 {hoofdstuk} - {vraag_data['id']}", font=('Arial', 16, 'bold'),).pack(anchor='w')
-
-        # Voeg de knop "Verwijderen" toe
-        ttk.Button(header_right, text="Verwijderen", style='Accent.TButton', width=20, command=lambda: self.delete_question(vraag_data['id'])).pack(side='right', padx=(5, 0), pady=5)
-
-        ttk.Button(header_right, text="Opslaan", style='Accent.TButton', width=20, command=lambda: self.save_question(vraag_data['id'])).pack(side='right', pady=5)
-
     def save_question(self, question_id):
         """Deze functie slaat de vraag op in de API, zowel voor nieuwe als voor bestaande vragen, gebruikt in show_vraag_ui"""
-        question_data = {
-            'type': self.current_type,
-            'parent': self.parent  # Use the stored parent value
-        }
+        if self.is_being_created(question_id):
+            return
+        question_data = Question(type=self.current_type, parent=self.parent)  # Use the stored parent value
+        form = self.form # Het formulier met de ingevulde vraag
 
         # Haal de tekst uit de tekst widgets veilig op
         def safe_get_text(widget):
@@ -395,8 +1503,8 @@ class DetailsFrame(tk.Frame):
 
         # Voeg de basis vraag data toe, die alle vraag types gemeen hebben
         try:
-            question_data['question'] = safe_get_text(self.question_text)
-            question_data['explanation'] = safe_get_text(self.explanation_text)
+            question_data.question = safe_get_text(form.question_text)
+            question_data.explanation = safe_get_text(form.explanation_text)
         except Exception as e:
             print(f"Error getting basic question data: {e}")
             messagebox.showerror("Error", "Failed to save question text or explanation")
@@ -406,42 +1514,33 @@ class DetailsFrame(tk.Frame):
         try:
             if self.current_type == 'multiple_choice':
                 answers = []
-                for opt in getattr(self, 'option_entries', []):
+                for row in form.options:
                     try:
-                        answers.append(opt.get())
+                        answers.append(row.var.get())
                     except tk.TclError:
                         continue
                 
-                question_data.update({
-                    'answers': answers,
-                    'correctAnswer': self.answer_entry.get() if hasattr(self, 'answer_entry') else ''
-                })
+                question_data.answers = answers
+                question_data.correctAnswer = form.answer_entry.get()
 
             elif self.current_type == 'image_selection':
-                if hasattr(self, 'image_entries'):  # Nieuwe vragen hebben image_entries
-                    print("self.image_entries", self.image_entries)
-                    image_urls = [entry.get() for entry in self.image_entries]
-                    question_data.update({
-                        'imageOptions': image_urls,
-                        'correctAnswer': int(self.answer_entry.get()) if hasattr(self, 'answer_entry') else 0
-                    })
+                if question_id == 'new':  # Nieuwe vragen geven de urls op in image_entries
+                    question_data.imageOptions = [entry.get() for entry in form.image_entries]
                 else:
-                    question_data.update({
-                        'imageOptions': getattr(self, 'image_urls', []),
-                    'correctAnswer': int(self.answer_entry.get()) if hasattr(self, 'answer_entry') else 0
-                })
+                    question_data.imageOptions = form.vraag_data.imageOptions
+                question_data.correctAnswer = int(form.answer_entry.get())
 
             elif self.current_type == 'drag_and_drop':
                 positions = []
-                for pos_frame in getattr(self, 'position_frames', []):
+                for row in form.positions:
                     try:
                         positions.append({
-                            'positionX': float(pos_frame.x_entry.get()),
-                            'positionY': float(pos_frame.y_entry.get())
+                            'positionX': float(row.x_entry.get()),
+                            'positionY': float(row.y_entry.get())
                         })
                     except (ValueError, tk.TclError):
                         continue
-                question_data['correctPositions'] = positions
+                question_data.correctPositions = positions
 
         except Exception as e:
             print(f"Fout bij het ophalen van de type-specifieke data: {e}")
@@ -451,28 +1550,28 @@ class DetailsFrame(tk.Frame):
         # Voeg de optionele velden toe
         try:
             # Check of er een context is
-            if hasattr(self, 'context_text'):
-                context = safe_get_text(self.context_text)
+            if form.context_text is not None:
+                context = safe_get_text(form.context_text)
                 if context:
-                    question_data['context'] = context
+                    question_data.context = context
 
             # Check of er begrippen zijn
-            if hasattr(self, 'terms_entries'):
+            if form.terms is not None:
                 terms = {}
-                for term_frame in self.terms_entries:
+                for row in form.terms:
                     try:
-                        term = term_frame.term_entry.get()
-                        definition = term_frame.def_entry.get()
+                        term = row.term_entry.get()
+                        definition = row.def_entry.get()
                         if term and definition:
                             terms[term] = definition
                     except tk.TclError:
                         continue #TIJDELIJK! doorgaan bij fout
                 if terms:
-                    question_data['terms'] = terms
+                    question_data.terms = terms
 
             # Check of er een afbeelding is
             if hasattr(self, 'image_url') and self.image_url: 
-                question_data['image'] = self.image_url
+                question_data.image = self.image_url
 
         except Exception as e:
             print(f"Fout bij het ophalen van de optionele velden: {e}")
@@ -481,386 +1580,40 @@ class DetailsFrame(tk.Frame):
 
         # Kies of er een vraag wordt aangemaakt of geüpdate, op basis van de question_id
         if question_id == 'new': #Nieuwe vraag hebben altijd een id van 'new', vanwege de template
+            if form.image_entry is not None and form.image_entry.get():
+                question_data.image = form.image_entry.get() #Hier uitlezen, create_question draait op de loop thread en mag Tk niet aanraken
             self.app.handle_async_button(self.create_question(question_data))
         else:
-            question_data['id'] = question_id
+            question_data.id = question_id
             self.app.handle_async_button(self.update_question(question_data))
 
     async def update_question(self, question_data):
-        """Deze functie update een bestaande vraag in de API, triggerd wanneer je op de knop 'Opslaan' drukt in show_vraag_ui"""
+        """Deze functie update een bestaande vraag in de API, triggerd wanneer je op de knop 'Opslaan' drukt in show_vraag_ui.
+        De vraag gaat via de save queue, de voortgang verschijnt in de header van het formulier (show_save_status)"""
         print("Updating question:", question_data)
+        handle = self.app.apply_question_changes(question_data.parent, changes=[question_data]) #Lijst direct bijwerken, zie App.on_save_status
+        if handle is not None:
+            self.app.optimistic.setdefault(question_data.id, handle) #Bij een rollback terug naar voor de eerste wijziging die nog niet is opgeslagen
+        await self.app.save_queue.enqueue(question_data.id, question_data)
+
+    def show_save_status(self, question_id, status, detail=None):
+        """Toon de voortgang van het opslaan bij de vraag, als die nog open staat. Alleen een geweigerde wijziging krijgt een popup"""
+        if status == 'failed':
+            messagebox.showerror("Error", f"Error updating question: {str(detail)}")
+        if self.form is None or self.form.vraag_data is None or self.form.vraag_data.id != question_id:
+            return
+        text = {
+            'queued': "💾 Wordt opgeslagen...",
+            'saving': "💾 Opslaan...",
+            'saved': f"✅ Opgeslagen om {datetime.now().strftime('%H:%M:%S')}",
+            'retry': "⚠️ Geen verbinding, wordt later opgeslagen",
+            'failed': "❌ Niet opgeslagen"
+        }[status]
         try:
-            await self.app.api_client.put('update_question', question_data)
-            messagebox.showinfo("Success", "Vraag opgeslagen in de database!")
-        except Exception as e:
-            messagebox.showerror("Error", f"Error updating question: {str(e)}")
-
-    def create_content_container(self, parent):
-        """Maak de content container, hier wordt de hoofd container voor de vraag details, voor show_vraag_ui"""
-        content_container = tk.Frame(parent, padx=20)
-        content_container.pack(fill='both', expand=True)
-        return content_container
-
-    def create_left_column(self, parent):
-        """Maak de linker kolom, voor show_vraag_ui"""
-        left_column = tk.Frame(parent)
-        left_column.pack(side='left', fill='both', expand=True, padx=(0, 10))
-        return left_column
-
-    def create_right_column(self, parent, vraag_data):
-        """Maak de rechter kolom (eigenlijk de afbeelding), voor show_vraag_ui"""
-        right_column = tk.Frame(parent)
-        right_column.pack(side='right', fill='both', padx=(10, 0))
-        if vraag_data.get('afbeelding'):
-            self.app.handle_async_button(self.load_and_display_question_image(
-                right_column, 
-                vraag_data['afbeelding']
-            ))
-        return right_column
-
-    def create_question_context(self, parent, vraag_data):
-        """Maak de context sectie, voor show_vraag_ui"""
-        if vraag_data['type'] in ['open', 'multiple_choice']:
-            try:
-                context_frame = tk.Frame(parent)
-                context_frame.pack(fill='x', pady=10)
-                
-                tk.Label(context_frame, text="Context ({} voor termen en [] voor italic):", font=('Arial', 12, 'bold'),).pack(anchor='w')
-                
-                self.context_text = tk.Text(context_frame,height=5,font=('Arial', 11),width=30,wrap='word',)
-                self.context_text.pack(fill='x', pady=5)
-                
-                if 'context' in vraag_data:
-                    self.context_text.insert('1.0', vraag_data['context'])
-            except Exception as e:
-                print(f"Error creating context: {e}")
-                self.context_text = None
+            self.form.status_label.configure(text=text)
+        except tk.TclError:
+            pass # Formulier is net opgeruimd
 
-    def create_question_frame(self, parent, vraag_data):
-        """Maak de vraag sectie (de daadwerkelijke vraag tekst), voor show_vraag_ui"""
-        question_frame = tk.Frame(parent)
-        question_frame.pack(fill='x', pady=10)
-        
-        tk.Label(question_frame,text="Vraag:",font=('Arial', 12, 'bold'),).pack(anchor='w')
-        
-        self.question_text = tk.Text(question_frame,height=4,font=('Arial', 11),wrap='word',)
-        self.question_text.pack(fill='x', pady=5)
-        self.question_text.insert('1.0', vraag_data['vraag_tekst'])
-
-    def create_terms_frame(self, parent, vraag_data):
-        """Maak de begrippen sectie (begrippen, en + knop om nieuwe begrippen toe te voegen), voor show_vraag_ui"""
-        if vraag_data['type'] in ['open', 'multiple_choice']:
-            terms_frame = tk.Frame(parent)
-            terms_frame.pack(fill='x', pady=(20, 10))
-            
-            header_frame = tk.Frame(terms_frame)
-            header_frame.pack(fill='x', pady=(0, 5))
-            
-            tk.Label(header_frame,text="Begrippen:",font=('Arial', 12, 'bold'),).pack(side='left')
-            
-            ttk.Button(header_frame,text="+ Nieuw begrip",style='Accent.TButton',width=15,command=lambda: self.create_term_entry(terms_container)).pack(side='right')
-            
-            terms_container = tk.Frame(terms_frame)
-            terms_container.pack(fill='x')
-            
-            self.terms_entries = [] #Empty list om de begrippen op te slaan
-            for term, definition in vraag_data.get('terms', {}).items():
-                self.create_term_entry(terms_container, term, definition)
-
-    def create_term_entry(self, parent, term='', definition=''):
-        """Maak een begrip entry, met een term en definitie en een knop om het te verwijderen, voor show_vraag_ui"""
-        class TermFrame:  # Helper class om de entry references op te slaan
-            def __init__(self, term_entry, def_entry, frame,):
-                self.term_entry = term_entry
-                self.def_entry = def_entry
-                self.frame = frame
-
-        term_frame = tk.Frame(parent)
-        term_frame.pack(fill='x', pady=2)
-        
-        # Maak de linker kolom voor de term
-        term_left = tk.Frame(term_frame)
-        term_left.pack(side='left', fill='x', expand=True, padx=(0, 5))
-        
-        tk.Label(term_left,text="Term:",font=('Arial', 10, 'bold')).pack(side='left', padx=(0, 5))
-        
-        term_entry = ttk.Entry(term_left, width=20)
-        term_entry.pack(side='left', fill='x', expand=True)
-        term_entry.insert(0, term)
-        
-        # Maak de rechter kolom voor de definitie
-        def_right = tk.Frame(term_frame)
-        def_right.pack(side='left', fill='x', expand=True, padx=(5, 0))
-        
-        tk.Label(def_right,text="Definitie:",font=('Arial', 10, 'bold')).pack(side='left', padx=(0, 5))
-        
-        def_entry = ttk.Entry(def_right)
-        def_entry.pack(side='left', fill='x', expand=True)
-        def_entry.insert(0, definition)
-        
-        # Delete knop die de hele entry verwijderd
-        ttk.Button(term_frame,text="×",width=3,style='Accent.TButton',
-            command=lambda: (
-                term_frame.destroy(),
-                self.terms_entries.remove(term_obj)
-            )
-        ).pack(side='right', padx=(5, 0))
-        
-        term_obj = TermFrame(term_entry, def_entry, term_frame)
-        self.terms_entries.append(term_obj) #Voeg de term toe aan de lijst
-
-    def create_answer_and_options_frame(self, parent, vraag_data):
-        """Maak de antwoord sectie (antwoord), voor show_vraag_ui"""
-        if vraag_data['type'] != 'drag_and_drop': #Drag and drop heeft geen antwoord
-            answer_frame = tk.Frame(parent)
-            answer_frame.pack(fill='x', pady=10)
-            
-            tk.Label(answer_frame, text="Antwoord:", font=('Arial', 12, 'bold'),).pack(anchor='w')
-            
-            if vraag_data['type'] == 'multiple_choice':
-                self.create_multiple_choice_ui(answer_frame, vraag_data)
-            elif vraag_data['type'] == 'image_selection':
-                self.create_image_selection_ui(answer_frame, vraag_data)
-            elif vraag_data['type'] == 'open':
-                self.create_open_question_ui(answer_frame, vraag_data)
-        else:
-            #bij drag and drop vraag, geen antwoord maar kan hier wel gebruik maken om ff bij nieuwe vraag een image url te maken
-            if vraag_data['id'] == 'new':
-                tk.Label(answer_frame,text="Afbeelding URL:",font=('Arial', 10)).pack(side='left', padx=(0, 5))
-                self.image_entry = ttk.Entry(answer_frame, width=20, name=f'new_image_option')
-                self.image_entry.pack(side='left', padx=(0, 5))
-
-    def create_multiple_choice_ui(self, parent, vraag_data):
-        """Maak de multiple choice sectie (opties), voor show_vraag_ui"""
-        self.option_entries = []  # Lege lijst om de opties op te slaan
-        
-        # Maak het frame voor het correcte antwoord
-        correct_answer_frame = tk.Frame(parent)
-        correct_answer_frame.pack(fill='x', pady=5)
-        
-        tk.Label(correct_answer_frame, text="Correct antwoord:", font=('Arial', 10)).pack(side='left', padx=(0, 5))
-        
-        self.answer_entry = ttk.Entry(correct_answer_frame)  # Opslag voor het correcte antwoord
-        self.answer_entry.pack(side='left', fill='x', expand=True)
-        if 'antwoord' in vraag_data:
-            self.answer_entry.insert(0, vraag_data['antwoord'])
-        
-        # Knop om nieuwe opties toe te voegen
-        add_option_frame = tk.Frame(parent)
-        add_option_frame.pack(fill='x', pady=5)
-        
-        ttk.Button(
-            add_option_frame,
-            text="+ Nieuwe optie",
-            style='Accent.TButton',
-            command=lambda: self.add_multiple_choice_option()
-        ).pack(side='right')
-
-        # Container voor de opties
-        self.options_container = tk.Frame(parent)
-        self.options_container.pack(fill='x')
-
-        # Voeg de bestaande opties toe
-        for optie in vraag_data.get('opties', []):
-            self.add_multiple_choice_option(optie)
-
-        #Alleen bij het maken van nieuwe vragen, geef de urls op van de imageOptions
-        if vraag_data['id'] == 'new':
-            print("Nieuwe vraag, maak image entry")
-            tk.Label(correct_answer_frame,text="Afbeelding URL:",font=('Arial', 10)).pack(side='left', padx=(0, 5))
-            self.image_entry = ttk.Entry(correct_answer_frame, width=20, name=f'new_image_option')
-            self.image_entry.pack(side='left', padx=(0, 5))
-
-    def add_multiple_choice_option(self, value=''):
-        """Voeg een optie toe aan de multiple choice sectie, voor create_multiple_choice_ui"""
-        option_frame = tk.Frame(self.options_container)
-        option_frame.pack(fill='x', pady=2)
-    
-        option_var = tk.StringVar(value=value) #StringVar reageert op veranderingen en moet dus voor de entry staan
-        self.option_entries.append(option_var)
-        
-        # Create the option entry
-        entry = ttk.Entry(
-            option_frame,
-            textvariable=option_var,
-        )
-        entry.pack(side='left', fill='x', expand=True, padx=(0, 5))
-        
-        # Knop om de optie te verwijderen
-        ttk.Button(option_frame,text="×",width=3,style='Accent.TButton',
-            command=lambda: (
-                option_frame.destroy(),
-                self.option_entries.remove(option_var)
-            )
-        ).pack(side='left', padx=(5, 0))
-
-
-    def create_image_selection_ui(self, parent, vraag_data):
-        """Maak de image selection sectie (opties), voor show_vraag_ui"""
-        images_frame = tk.Frame(parent)
-        images_frame.pack(fill='x', pady=5)
-        
-        answer_container = tk.Frame(parent)
-        answer_container.pack(fill='x', pady=5)
-        
-        tk.Label(answer_container,text="Antwoord (0-3):",font=('Arial', 10)).pack(side='left', padx=(0, 5)) #de user moet het antwoord invullen (mogelij moet er input validatie komen)
-        
-        self.answer_entry = ttk.Entry(answer_container, width=5)  # Opslag voor het correcte antwoord
-        self.answer_entry.pack(side='left')
-        if 'correctAnswer' in vraag_data:
-            self.answer_entry.insert(0, str(vraag_data['correctAnswer']))
-        
-        self.image_urls = vraag_data['imageOptions']  # Opslag voor de afbeeldingen
-        
-        # Maak de afbeeldingen in een grid van 2x2
-        for i, image_url in enumerate(self.image_urls, 1):
-            row = (i-1) // 2
-            col = (i-1) % 2
-            option_frame = tk.Frame(images_frame)
-            option_frame.grid(row=row, column=col, padx=5, pady=5)
-            #Laad de afbeeldingen asynchroon, zodat deze niet in de weg staan bij het maken van de grid
-            self.app.handle_async_button(self.load_and_display_option_image(option_frame, image_url, i))
-
-        #Alleen bij het maken van nieuwe vragen, geef de urls op van de imageOptions
-        if vraag_data['id'] == 'new':
-            print("Nieuwe vraag, maak image entries")
-            tk.Label(images_frame,text="Afbeeldingen URLS:",font=('Arial', 10, 'bold')).pack(side='left', padx=(0, 5))
-            self.image_entries = []
-            for i in range(4):
-                entry = ttk.Entry(images_frame, width=20, name=f'new_image_option_{i}')
-                entry.pack(side='left', padx=(0, 5))
-                self.image_entries.append(entry)
-
-
-    def create_open_question_ui(self, parent, vraag_data):
-        """Maak de open vraag antwoord sectie, voor show_vraag_ui"""
-        antwoord_text = tk.Text(
-            parent,
-            height=4,
-            font=('Arial', 11),
-            wrap='word',
-            width=30
-        )
-        antwoord_text.pack(fill='x', pady=5)
-        if 'antwoord' in vraag_data:
-            antwoord_text.insert('1.0', vraag_data['antwoord'])
-
-    def create_feedback_section(self, parent, vraag_data):
-        """Maak de feedback sectie (uitleg), voor show_vraag_ui"""
-        uitleg_frame = tk.Frame(parent, padx=20)
-        uitleg_frame.pack(fill='x', pady=10)
-        
-        tk.Label(
-            uitleg_frame,
-            text="Uitleg:",
-            font=('Arial', 12, 'bold'),
-        ).pack(anchor='w')
-        
-        self.explanation_text = tk.Text(uitleg_frame,height=3,font=('Arial', 11),wrap='word',width=30)
-        self.explanation_text.pack(fill='x', pady=5)
-        if 'uitleg' in vraag_data:
-            self.explanation_text.insert('1.0', vraag_data['uitleg'])
-
-    def create_positions_section(self, parent, vraag_data):
-        """Maak de positie sectie bij drag and drop vragen, voor show_vraag_ui"""
-        if vraag_data['type'] == 'drag_and_drop':
-            positions_frame = tk.Frame(parent, padx=20)
-            positions_frame.pack(fill='x', pady=10)
-            
-            positions_header = tk.Frame(positions_frame)
-            positions_header.pack(fill='x', pady=(0, 5))
-            
-            tk.Label(positions_header,text="Posities:",font=('Arial', 12, 'bold'),).pack(side='left')
-            
-            positions_container = tk.Frame(positions_frame)
-            positions_container.pack(fill='x')
-            
-            self.position_frames = []  # Lege lijst om de positie frames op te slaan
-            
-            ttk.Button(positions_header,text="+ Nieuwe positie",style='Accent.TButton',width=15,
-                command=lambda: self.add_position_entry(positions_container)
-            ).pack(side='right')
-            
-            for i, pos in enumerate(vraag_data.get('correctPositions', [])):
-                self.add_position_entry(
-                    positions_container,
-                    index=i,
-                    x=pos.get('positionX', 0),
-                    y=pos.get('positionY', 0)
-                )
-
-    def add_position_entry(self, container, index=None, x=0, y=0):
-        """Voeg een positie toe aan de drag and drop sectie, voor create_positions_section (eigenlijk zelfde als create_term_entry)"""
-        class PositionFrame:  # Helper class to store entry references
-            def __init__(self, x_entry, y_entry):
-                self.x_entry = x_entry
-                self.y_entry = y_entry
-
-        position_frame = tk.Frame(container)
-        position_frame.pack(fill='x', pady=2)
-        
-        tk.Label(
-            position_frame,
-            text=f"Positie {index + 1 if index is not None else len(self.position_frames) + 1}:", 
-            # Bij bestaande posities: gebruikt index + 1
-            # Bij nieuwe positie: gebruikt len(self.position_frames) + 1 omdat index None is
-            font=('Arial', 10, 'bold')
-        ).pack(side='left', padx=(0, 10))
-        
-        tk.Label(position_frame,text="X:",font=('Arial', 10)).pack(side='left', padx=(0, 5))
-        
-        x_entry = ttk.Entry(position_frame, width=8)
-        x_entry.pack(side='left', padx=(0, 10))
-        x_entry.insert(0, str(x))
-        
-        tk.Label(position_frame,text="Y:",font=('Arial', 10)).pack(side='left', padx=(0, 5))
-        
-        y_entry = ttk.Entry(position_frame, width=8)
-        y_entry.pack(side='left')
-        y_entry.insert(0, str(y))
-        
-        pos_obj = PositionFrame(x_entry, y_entry)
-        self.position_frames.append(pos_obj)
-        
-        ttk.Button(position_frame,text="×",width=3,style='Accent.TButton',
-        command=lambda: (
-                position_frame.destroy(),
-                self.position_frames.remove(pos_obj)
-            )
-        ).pack(side='right', padx=(10, 0))
-        
-        ttk.Separator(container).pack(fill='x', pady=5)
-
-    async def load_and_display_question_image(self, container, image_url):
-        """Laad en display de vraag afbeelding, voor de rechter kolom bij show_vraag_ui (open vraag, multiple choice)"""
-        photo = await self.load_image_from_url(image_url, size=(200, 200))
-        if photo:
-            self.loaded_images.append(photo)
-            img_frame = tk.Frame(container, relief='solid')
-            img_frame.pack(pady=10)
-            
-            img_label = tk.Label(img_frame, image=photo)
-            img_label.pack(padx=10, pady=10)
-
-    async def load_and_display_option_image(self, container, image_url, option_num):
-        """Laad en display de afbeelding bij image selection vragen, voor create_image_selection_ui"""
-        photo = await self.load_image_from_url(image_url, size=(100, 100))
-        if photo:
-            self.loaded_images.append(photo)
-            
-            # Label met afbeelding
-            img_label = tk.Label(
-                container,
-                image=photo
-            )
-            img_label.pack(padx=5, pady=5)
-            
-            # Label met optie nummer
-            tk.Label(
-                container,
-                text=f"Optie {option_num-1}",
-                font=('Arial', 10)
-            ).pack()
 
     def show_feedback_ui(self, feedback_data):
         """Maak de feedback view, voor show_feedback"""
@@ -934,24 +1687,48 @@ class DetailsFrame(tk.Frame):
         feedback_text.config(state='disabled')
 
     def clear_content(self):
-        """Verwijder alle widgets in content_frame"""
+        """Verberg de vraag formulieren en verwijder alle andere widgets in content_frame, en laat de afbeeldingen die ze toonden los"""
+        pooled = set(self.forms.values())
         for widget in self.content_frame.winfo_children():
-            widget.destroy()
+            if widget in pooled:
+                widget.pack_forget()
+            else:
+                widget.destroy()
+        self.form = None
+        self.loaded_images.clear()
 
     def delete_question(self, question_id):
         """Verwijder een vraag voor perongeluke verwideren voorkomen, voor show_onderdelen_ui"""
+        if self.is_being_created(question_id):
+            return
         if messagebox.askyesno("Bevestiging", "Weet je zeker dat je deze vraag wilt verwijderen?"):
-            self.app.handle_async_button(self.delete_question_request(question_id))
+            self.show_message("🗑️ Vraag verwijderd")
+            self.app.handle_async_button(self.delete_question_request(question_id, self.parent))
 
-    async def delete_question_request(self, question_id):
-        """Verwijder een vraag, voor delete_question"""
+    async def delete_question_request(self, question_id, parent):
+        """Verwijder een vraag, voor delete_question. De vraag verdwijnt direct uit de lijst en komt terug als het verwijderen mislukt"""
+        handle = self.app.apply_question_changes(parent, deleted=[question_id])
         try:
-            await self.app.api_client.delete('delete_question', {'id': question_id})
-            messagebox.showinfo("Success", "Vraag succesvol verwijderd!")
-            # Refresh de lijst
-            await self.app.show_onderdelen()
+            try:
+                await self.app.api_client.delete('delete_question', {'id': question_id}, optimistic=handle is not None)
+            except APIError as e:
+                # De vraag stond in de lijst, dus een 404 na een retry betekent dat een eerdere poging hem al heeft verwijderd
+                # maar het antwoord niet aankwam (bijv. timeout)
+                if e.status != 404 or e.attempts < 2:
+                    raise
+            self.app.duplicates.remove_question(question_id)
+            if handle is None: #Lijst stond niet in de cache, de DELETE heeft hem ongeldig gemaakt
+                await self.app.refresh_lijst(self.app.question_endpoint(parent))
         except Exception as e:
-            messagebox.showerror("Error", f"Fout bij verwijderen van vraag: {str(e)}")
+            await self.app.rollback_question_changes(handle)
+            self.app.ui.post(messagebox.showerror, "Error", f"Fout bij verwijderen van vraag: {str(e)}\nDe vraag staat weer in de lijst.")
+
+    def is_being_created(self, question_id):
+        """Check of een vraag nog wordt aangemaakt (tijdelijke id, zie create_question), die kan nog niet worden opgeslagen of verwijderd"""
+        if str(question_id).startswith(LOCAL_ID_PREFIX):
+            messagebox.showinfo("Even geduld", "Deze vraag wordt nog aangemaakt, probeer het zo opnieuw.")
+            return True
+        return False
 
     async def create_question(self, question_data):
         """Maak een vraag, wanneer iemand op opslaat drukt en de id is 'new' (dus niet bestaat in de database)"""
@@ -960,77 +1737,84 @@ class DetailsFrame(tk.Frame):
         missing_fields = [field for field in required_fields if not question_data.get(field)]
         
         if missing_fields:
-            messagebox.showerror("Error", f"Vul de volgende velden in: {', '.join(missing_fields)}")
+            self.app.ui.post(messagebox.showerror, "Error", f"Vul de volgende velden in: {', '.join(missing_fields)}")
             return False
 
         # Helaas moeten we hier weer terug de data formatteren naar de verwachtingen van de cloud functie/firestore database
         # Ook hoeven we niet alle question_data velden mee te geven uit de lege template die we krijgen van de cloud functie
         # Dit kan denk ik efficiënter, maar het werkt nu wel
         formatted_data = {
-            'question': question_data['question'],
-            'type': question_data['type'],
+            'question': question_data.question,
+            'type': question_data.type,
         }
 
-        if question_data['type'] == 'multiple_choice':
-            if not question_data.get('answers') or len(question_data['answers']) < 2:
-                messagebox.showerror("Error", "Multiple choice questions need at least 2 answers")
+        if question_data.type == 'multiple_choice':
+            if not question_data.answers or len(question_data.answers) < 2:
+                self.app.ui.post(messagebox.showerror, "Error", "Multiple choice questions need at least 2 answers")
                 return False
             formatted_data.update({
-                'answers': question_data['answers'],
-                'correctAnswer': question_data['correctAnswer'],
-                'image': self.image_entry.get() if hasattr(self, 'image_entry') else ''
+                'answers': question_data.answers,
+                'correctAnswer': question_data.correctAnswer,
+                'image': question_data.image #Bij nieuwe vragen uit de image_entry, zie save_question
             })
         
-        elif question_data['type'] == 'image_selection':
-            if not question_data.get('imageOptions') or len(question_data['imageOptions']) < 2:
-                messagebox.showerror("Error", "Minimum 2 afbeeldingen nodig")
+        elif question_data.type == 'image_selection':
+            if not question_data.imageOptions or len(question_data.imageOptions) < 2:
+                self.app.ui.post(messagebox.showerror, "Error", "Minimum 2 afbeeldingen nodig")
                 return False
             formatted_data.update({
-                'imageOptions': question_data['imageOptions'],
-                'correctAnswer': str(question_data['correctAnswer'])
+                'imageOptions': question_data.imageOptions,
+                'correctAnswer': str(question_data.correctAnswer)
             })
 
-        elif question_data['type'] == 'drag_and_drop':
-            if not question_data.get('correctPositions'):
-                messagebox.showerror("Error", "Minimum 1 positie nodig")
+        elif question_data.type == 'drag_and_drop':
+            if not question_data.correctPositions:
+                self.app.ui.post(messagebox.showerror, "Error", "Minimum 1 positie nodig")
                 return False
             formatted_data.update({
-                    'correctPositions': question_data['correctPositions'],
-                    'image': self.image_entry.get() if hasattr(self, 'image_entry') else ''
+                    'correctPositions': question_data.correctPositions,
+                    'image': question_data.image #Bij nieuwe vragen uit de image_entry, zie save_question
                 })
         
-        elif question_data['type'] == 'open':
-            formatted_data['correctAnswer'] = question_data['correctAnswer']
+        elif question_data.type == 'open':
+            formatted_data['correctAnswer'] = question_data.correctAnswer
 
         # Optionele velden
-        if question_data.get('explanation'):
-            formatted_data['explanation'] = question_data['explanation']
-        if question_data.get('context'):
-            formatted_data['context'] = question_data['context']
-        if question_data.get('terms'):
-            formatted_data['terms'] = question_data['terms']
-        if question_data.get('image'):
-            formatted_data['image'] = question_data['image']
+        if question_data.explanation:
+            formatted_data['explanation'] = question_data.explanation
+        if question_data.context:
+            formatted_data['context'] = question_data.context
+        if question_data.terms:
+            formatted_data['terms'] = question_data.terms
+        if question_data.image:
+            formatted_data['image'] = question_data.image
 
         # Voeg de parent informatie toe
-        formatted_data['parent'] = question_data.get('parent', '')
+        formatted_data['parent'] = question_data.parent
+
+        # De vraag staat direct in de lijst met een tijdelijke id, die wordt vervangen door de id van de server
+        local_id = f"{LOCAL_ID_PREFIX}{next(self.local_ids)}"
+        handle = self.app.apply_question_changes(question_data.parent, changes=[Question(**formatted_data, id=local_id)])
 
         #Update de vraag in de database
         try:
-            response_data = await self.app.api_client.post('create_question', formatted_data)
-            messagebox.showinfo("Success", "Vraag succesvol aangemaakt!")
-            
-            # Refresh de lijst
-            if 'Examen' in formatted_data['parent']: #Elk examen begint met 'Examen'
-                await self.app.show_examens()
-            else:
-                await self.app.show_onderdelen()
-            return True
-
+            response_data = await self.app.api_client.post('create_question', formatted_data, optimistic=handle is not None)
         except Exception as e:
-            messagebox.showerror("Error", f"Fout bij aanmaken van vraag: {str(e)}")
+            await self.app.rollback_question_changes(handle)
+            self.app.ui.post(messagebox.showerror, "Error", f"Fout bij aanmaken van vraag: {str(e)}")
             return False
 
+        if isinstance(response_data, dict) and response_data.get('questionId'):
+            question_data = Question(**formatted_data, id=response_data['questionId'])
+            if self.app.apply_question_changes(question_data.parent, changes=[question_data], deleted=[local_id]) is None:
+                await self.app.refresh_lijst(self.app.question_endpoint(question_data.parent)) #Niet lokaal te verwerken, dan opnieuw ophalen
+            await asyncio.to_thread(self.app.duplicates.add, (question_data.parent, question_data.id), question_data)
+        else: # Geen id in de response, dan weten we niet welke vraag het is geworden
+            await self.app.rollback_question_changes(handle)
+            await self.app.refresh_lijst(self.app.question_endpoint(question_data.parent))
+        self.app.ui.post(messagebox.showinfo, "Success", "Vraag succesvol aangemaakt!")
+        return True
+
     async def update_feedback_status(self, feedback_id, new_status):
         """Update de status van een feedback item, wanneer je op opslaan drukt bij feedback"""
         try:
@@ -1040,13 +1824,147 @@ class DetailsFrame(tk.Frame):
             }
             
             await self.app.api_client.put('update_feedback', data)
-            messagebox.showinfo("Success", "Feedback status succesvol bijgewerkt!")
+            self.app.ui.post(messagebox.showinfo, "Success", "Feedback status succesvol bijgewerkt!")
             # Refresh de lijst
             await self.app.show_feedback()
             
         except Exception as e:
-            messagebox.showerror("Error", f"Fout bij bijwerken van feedback status: {str(e)}")
+            self.app.ui.post(messagebox.showerror, "Error", f"Fout bij bijwerken van feedback status: {str(e)}")
     
+    def show_bulk_ui(self, vragen, feedback, chapters):
+        """Bulk acties voor meerdere geselecteerde rijen: vragen verwijderen of verplaatsen, of de status van feedback items zetten.
+        vragen is een lijst van (hoofdstuk, vraag), chapters zijn de hoofdstukken waar de vragen naartoe kunnen"""
+        self.clear_content()
+        buttons = []
+
+        # Header met wat er is geselecteerd
+        header_frame = tk.Frame(self.content_frame, padx=20, pady=10)
+        header_frame.pack(fill='x')
+        selected = [f"{len(vragen)} vragen" if vragen else '', f"{len(feedback)} feedback items" if feedback else '']
+        tk.Label(header_frame, text=f"{' en '.join(filter(None, selected))} geselecteerd", font=('Arial', 16, 'bold')).pack(side='left')
+
+        if vragen:
+            # Verwijderen
+            delete_frame = tk.Frame(self.content_frame, padx=20, pady=10)
+            delete_frame.pack(fill='x')
+            buttons.append(ttk.Button(delete_frame, text=f"{len(vragen)} vragen verwijderen", style='Accent.TButton', width=25,
+                                      command=lambda: self.confirm_bulk_delete(vragen)))
+            buttons[-1].pack(side='left')
+
+            # Verplaatsen naar een ander hoofdstuk
+            move_frame = tk.Frame(self.content_frame, padx=20, pady=10)
+            move_frame.pack(fill='x')
+            tk.Label(move_frame, text="Verplaatsen naar:", font=('Arial', 12, 'bold')).pack(side='left', padx=(0, 10))
+            target_var = tk.StringVar()
+            ttk.Combobox(move_frame, textvariable=target_var, values=chapters, state='readonly', width=30).pack(side='left')
+            buttons.append(ttk.Button(move_frame, text="Verplaatsen", style='Accent.TButton', width=15,
+                                      command=lambda: target_var.get() and self.start_bulk(self.bulk_move_questions(vragen, target_var.get()))))
+            buttons[-1].pack(side='left', padx=(10, 0))
+
+        if feedback:
+            # Status van alle geselecteerde feedback items
+            status_frame = tk.Frame(self.content_frame, padx=20, pady=10)
+            status_frame.pack(fill='x')
+            tk.Label(status_frame, text="Status:", font=('Arial', 12, 'bold')).pack(side='left', padx=(0, 10))
+            status_var = tk.StringVar(value='completed')
+            ttk.Combobox(status_frame, textvariable=status_var, values=['pending', 'in_progress', 'completed'], state='readonly', width=20).pack(side='left')
+            buttons.append(ttk.Button(status_frame, text="Opslaan", style='Accent.TButton', width=15,
+                                      command=lambda: self.start_bulk(self.bulk_feedback_status(feedback, status_var.get()))))
+            buttons[-1].pack(side='left', padx=(10, 0))
+
+        # Voortgang, zichtbaar zodra een actie loopt
+        progress_frame = tk.Frame(self.content_frame, padx=20, pady=10)
+        progress_frame.pack(fill='x')
+        self.bulk_label = tk.Label(progress_frame, font=('Arial', 12))
+        self.bulk_label.pack(anchor='w')
+        self.bulk_progress = ttk.Progressbar(progress_frame, mode='determinate')
+        self.bulk_buttons = buttons
+
+    def confirm_bulk_delete(self, vragen):
+        """Vraag één keer om bevestiging voor het verwijderen van alle geselecteerde vragen"""
+        if messagebox.askyesno("Bevestiging", f"Weet je zeker dat je {len(vragen)} vragen wilt verwijderen?"):
+            self.start_bulk(self.bulk_delete_questions(vragen))
+
+    def start_bulk(self, coro):
+        """Start een bulk actie, de knoppen gaan uit tot de samenvatting er is"""
+        for button in self.bulk_buttons:
+            button.configure(state='disabled')
+        self.bulk_progress.pack(fill='x', pady=(5, 0))
+        self.app.handle_async_button(coro)
+
+    def show_bulk_progress(self, done, total):
+        """Voortgang van de bulk actie die nu loopt"""
+        try:
+            self.bulk_progress.configure(maximum=total, value=done)
+            self.bulk_label.configure(text=f"{done} van {total} klaar...")
+        except tk.TclError:
+            pass # Intussen iets anders geopend, de actie loopt gewoon door
+
+    def show_bulk_summary(self, description, succeeded, failures):
+        """Eén samenvatting na een bulk actie, in plaats van een melding per item. failures is een lijst van (omschrijving, fout)"""
+        summary = f"{succeeded} van {succeeded + len(failures)} {description}."
+        if failures:
+            summary += f"\n\nMislukt ({len(failures)}):\n" + "\n".join(f"- {name}: {error}" for name, error in failures[:10])
+            if len(failures) > 10:
+                summary += f"\n... en nog {len(failures) - 10}"
+            messagebox.showwarning("Bulk actie", summary)
+        else:
+            messagebox.showinfo("Bulk actie", summary)
+        if self.bulk_label.winfo_exists(): #Alleen als de bulk acties nog open staan, niet over wat de gebruiker intussen heeft geopend
+            self.show_message(summary)
+
+    async def run_bulk(self, description, endpoint_key, method, payloads, names):
+        """Voer een bulk actie uit via APIClient.bulk, met de voortgang in het details frame en één samenvatting aan het eind.
+        De lijst wordt door de aanroeper lokaal bijgewerkt (optimistic), geeft per payload terug of het is gelukt"""
+        def progress(done, total):
+            self.app.ui.post(self.show_bulk_progress, done, total, key='bulk')
+        results = await self.app.api_client.bulk(endpoint_key, method, payloads, on_progress=progress, optimistic=True)
+        failures = [(name, str(result)) for name, result in zip(names, results) if isinstance(result, Exception)]
+        self.app.ui.post(self.show_bulk_summary, description, len(payloads) - len(failures), failures)
+        return [not isinstance(result, Exception) for result in results]
+
+    async def bulk_delete_questions(self, vragen):
+        """Verwijder meerdere vragen, de verwijderde verdwijnen daarna in één keer uit de lijst"""
+        succeeded = await self.run_bulk("vragen verwijderd", 'delete_question', 'delete', [{'id': vraag.id} for _, vraag in vragen],
+                                        [f"{hoofdstuk} - {vraag.id}" for hoofdstuk, vraag in vragen])
+        deleted = {}
+        for (hoofdstuk, vraag), ok in zip(vragen, succeeded):
+            if ok:
+                deleted.setdefault(hoofdstuk, []).append(vraag.id)
+                self.app.duplicates.remove_question(vraag.id)
+        for hoofdstuk, question_ids in deleted.items():
+            if self.app.apply_question_changes(hoofdstuk, deleted=question_ids) is None: #De requests waren optimistic, dus zelf de cache verversen
+                await self.app.refresh_lijst(self.app.question_endpoint(hoofdstuk))
+
+    async def bulk_move_questions(self, vragen, target):
+        """Verplaats meerdere vragen naar een ander hoofdstuk (de hele vraag met een nieuwe parent en moveFrom, het hoofdstuk waar hij uit gaat).
+        Andere hoofdstukken waar dezelfde vraag in staat houden hem"""
+        vragen = [(hoofdstuk, vraag) for hoofdstuk, vraag in vragen if hoofdstuk != target]
+        moved = [{**to_raw(vraag), 'parent': target, 'moveFrom': hoofdstuk} for hoofdstuk, vraag in vragen]
+        succeeded = await self.run_bulk(f"vragen verplaatst naar {target}", 'update_question', 'put', moved,
+                                        [f"{hoofdstuk} - {vraag.id}" for hoofdstuk, vraag in vragen])
+        moved = [question for question, ok in zip(moved, succeeded) if ok]
+        if moved:
+            if self.app.apply_question_changes(target, changes=moved) is None: #De requests waren optimistic, dus zelf de cache verversen
+                await self.app.refresh_lijst(self.app.question_endpoint(target))
+            for endpoint_key in {self.app.question_endpoint(question['moveFrom']) for question in moved} - {self.app.question_endpoint(target)}:
+                await self.app.refresh_lijst(endpoint_key) #Van een onderwerp naar een examen (of andersom), die lijst staat in een andere cache
+            for question in moved:
+                self.app.duplicates.remove((question['moveFrom'], question['id'])) #De key bevat het oude hoofdstuk
+                await asyncio.to_thread(self.app.duplicates.add, (target, question['id']), Question(**question_fields(question)))
+
+    async def bulk_feedback_status(self, feedback, status):
+        """Zet de status van meerdere feedback items, de lijst wordt daarna lokaal bijgewerkt"""
+        succeeded = await self.run_bulk(f"feedback items op {status} gezet", 'update_feedback', 'put',
+                                        [{'feedbackId': item['id'], 'status': status} for item in feedback],
+                                        [item.get('subject', item['id']) for item in feedback])
+        changes = [{**to_raw(item), 'status': status} for item, ok in zip(feedback, succeeded) if ok]
+        if changes:
+            if self.app.api_client.apply_local('feedback', changes) is not None:
+                self.app.render_cached('feedback')
+            else: #De requests waren optimistic, dus zelf de cache verversen
+                await self.app.refresh_lijst('feedback')
+
     def show_feedback_rapport_ui(self, feedback_data):
         """Maak de feedback export view, voor show_feedback_rapport"""
         self.clear_content()
@@ -1142,6 +2060,62 @@ class DetailsFrame(tk.Frame):
         except Exception as e:
             messagebox.showerror("Error", f"Fout bij exporteren naar CSV: {str(e)}")
 
+    def show_message(self, text):
+        """Toon alleen een melding in het details frame, bijv. tijdens het laden van een rapport"""
+        self.clear_content()
+        tk.Label(self.content_frame, text=text, font=('Arial', 12), pady=20).pack()
+
+    def show_duplicates_ui(self, pairs):
+        """Het rapport met (bijna) dubbele vragen, pairs komt van DuplicateIndex.pairs. De drempel filtert de paren zonder opnieuw te zoeken"""
+        self.clear_content()
+
+        # Header met de titel
+        header_frame = tk.Frame(self.content_frame, padx=20, pady=10)
+        header_frame.pack(fill='x')
+        tk.Label(header_frame, text="Dubbele vragen", font=('Arial', 16, 'bold')).pack(side='left')
+
+        # Drempel, hoe gelijk de vragen minstens moeten zijn
+        controls_frame = tk.Frame(self.content_frame, padx=20, pady=5)
+        controls_frame.pack(fill='x')
+        tk.Label(controls_frame, text="Drempel:", font=('Arial', 12, 'bold')).pack(side='left', padx=(0, 10))
+        threshold_var = tk.DoubleVar(value=DUPLICATES_CONFIG['threshold'])
+        ttk.Scale(controls_frame, from_=DUPLICATES_CONFIG['min_threshold'], to=1.0, variable=threshold_var, length=200,
+                  command=lambda value: refresh()).pack(side='left')
+        threshold_label = tk.Label(controls_frame, font=('Arial', 12), width=5)
+        threshold_label.pack(side='left', padx=(10, 0))
+        count_label = tk.Label(controls_frame, font=('Arial', 12))
+        count_label.pack(side='right')
+
+        # De paren, dubbelklik opent de eerste vraag
+        table_frame = tk.Frame(self.content_frame, padx=20, pady=10)
+        table_frame.pack(fill='both', expand=True)
+        table = ttk.Treeview(table_frame, columns=('gelijk', 'vraag', 'dubbel'), show='headings')
+        for column, heading, width in [('gelijk', "Gelijk", 70), ('vraag', "Vraag", 300), ('dubbel', "Lijkt op", 300)]:
+            table.heading(column, text=heading)
+            table.column(column, width=width, stretch=column != 'gelijk')
+        scrollbar = ttk.Scrollbar(table_frame, orient='vertical', command=table.yview)
+        table.configure(yscrollcommand=scrollbar.set)
+        scrollbar.pack(side='right', fill='y')
+        table.pack(side='left', fill='both', expand=True)
+
+        def refresh():
+            threshold = threshold_var.get()
+            shown = [pair for pair in pairs if pair[0] >= threshold] #pairs is gesorteerd, maar zo klein dat filteren volstaat
+            table.delete(*table.get_children())
+            for i, (similarity, vraag, key, dubbel, dubbel_key) in enumerate(shown):
+                table.insert('', 'end', iid=str(i), values=(f"{similarity:.0%}", f"{key[0]}: {vraag.vraag_tekst}", f"{dubbel_key[0]}: {dubbel.vraag_tekst}"))
+            threshold_label.config(text=f"{threshold:.0%}")
+            count_label.config(text=f"{len(shown)} paren")
+
+        def open_question(event):
+            selection = table.selection()
+            if selection:
+                similarity, vraag, key = pairs[int(selection[0])][:3]
+                self.app.show_vraag_details(key[0], vraag)
+
+        table.bind('<Double-1>', open_question)
+        refresh()
+
 class QuestionTypeDialog(tk.Toplevel):
     """Popup menu voor het kiezen van het type van een vraag"""
 
@@ -1219,48 +2193,1422 @@ class QuestionTypeDialog(tk.Toplevel):
         self.result = type_id
         self.destroy() #Sluit de popup
 
+def timestamp_ms(timestamp):
+    """Firestore timestamp ({'_seconds', '_nanoseconds'}) naar milliseconden, 0 als er geen timestamp is"""
+    if isinstance(timestamp, dict) and '_seconds' in timestamp:
+        return timestamp['_seconds'] * 1000 + timestamp.get('_nanoseconds', 0) // 1_000_000
+    return 0
+
+def subjects_cursor(data):
+    """De watermark van een volledige getAllSubjects response: de laatste updatedAt van alle vragen"""
+    return max((timestamp_ms(question.get('updatedAt'))
+                for subject in data.get('subjects', [])
+                for question in subject.get('questions', [])), default=0)
+
+def merge_questions(groups, changes, deleted):
+    """Verwerk gewijzigde en verwijderde vragen in de vragen van een aantal hoofdstukken, groups is een lijst van (titel, vragen).
+    Een vraag kan in meerdere hoofdstukken staan. Met parents (delta sync) staat een gewijzigde vraag daarna precies in die hoofdstukken,
+    anders wordt hij overal bijgewerkt waar hij staat, met de gewijzigde velden over de oude vraag heen (zoals de server ze samenvoegt). Met moveFrom is de vraag verplaatst van dat hoofdstuk naar parent, een nieuwe vraag komt bij parent.
+    Geeft per hoofdstuk een nieuwe lijst vragen terug (de oude blijven ongewijzigd), of None als een vraag bij een onbekend hoofdstuk hoort"""
+    changed = {question['id']: question for question in changes}
+    removed = set(deleted)
+    merged = []
+    placed = {} # id -> hoofdstukken waar de gewijzigde vraag blijft staan
+    for title, questions in groups:
+        kept = []
+        for question in questions:
+            new = changed.get(question['id'])
+            if question['id'] in removed:
+                continue
+            if new is None:
+                kept.append(question)
+            elif (title in new['parents']) if 'parents' in new else (new.get('moveFrom') != title): # Gewijzigd, op dezelfde plek houden
+                kept.append({**to_raw(question), **to_raw(question_fields(new))})
+                placed.setdefault(question['id'], set()).add(title)
+        merged.append(kept)
+
+    # Nieuwe en verplaatste vragen achteraan bij hun hoofdstuk
+    by_title = {title: kept for (title, _), kept in zip(groups, merged)}
+    for question in changed.values():
+        if question['id'] in removed:
+            continue
+        titles = placed.get(question['id'], set())
+        if 'parents' in question:
+            missing = [title for title in question['parents'] if title not in titles]
+        elif question.get('parent') not in titles and (question.get('moveFrom') or not titles):
+            missing = [question.get('parent')]
+        else:
+            missing = []
+        for title in missing:
+            kept = by_title.get(title)
+            if kept is None:
+                return None
+            kept.append(to_raw(question_fields(question)))
+    return merged
+
+def question_fields(question):
+    """Een vraag zonder moveFrom en parents, die zeggen alleen waar de vraag staat en horen niet bij de vraag zelf"""
+    if 'moveFrom' not in question and 'parents' not in question:
+        return question
+    return {key: value for key, value in question.items() if key not in ('moveFrom', 'parents')}
+
+def merge_subject_changes(data, changes, deleted):
+    """Verwerk gewijzigde en verwijderde vragen in een getAllSubjects response.
+    Geeft een nieuwe response terug (de oude blijft ongewijzigd), of None als een vraag bij een onbekend onderwerp hoort"""
+    subjects = data.get('subjects', [])
+    merged = merge_questions([(subject['title'], subject.get('questions', [])) for subject in subjects], changes, deleted)
+    if merged is None:
+        return None
+    return {**data, 'subjects': [{**subject, 'questions': questions, 'questionIds': [question['id'] for question in questions]}
+                                 for subject, questions in zip(subjects, merged)]}
+
+def exam_chapter_title(exam_id, display_name):
+    """Titel van een onderdeel van een examen in de lijst (Examen 1 - Gevaarherkenning), dit is ook de parent van de vragen"""
+    return f"Examen {exam_id} - {display_name}"
+
+def merge_exam_changes(data, changes, deleted):
+    """Verwerk gewijzigde en verwijderde vragen in een getAllExams response, zoals merge_subject_changes.
+    De parent van een examenvraag is de titel van het onderdeel in de lijst (zie exam_chapter_title)"""
+    groups = [] # (titel, vragen) per onderdeel, met het examen en de categorie om de response weer op te bouwen
+    places = []
+    for index, exam in enumerate(data.get('exams', [])):
+        for category, display_name in EXAM_CATEGORIES.items():
+            if category in exam:
+                groups.append((exam_chapter_title(exam['id'], display_name), exam[category].get('questions', [])))
+                places.append((index, category))
+    merged = merge_questions(groups, changes, deleted)
+    if merged is None:
+        return None
+    exams = [dict(exam) for exam in data.get('exams', [])]
+    for (index, category), questions in zip(places, merged):
+        exams[index][category] = {**exams[index][category], 'questions': questions}
+    return {**data, 'exams': exams}
+
+def merge_feedback_changes(data, changes, deleted):
+    """Verwerk gewijzigde en verwijderde feedback items in een getAllFeedback response, de volgorde blijft hetzelfde"""
+    changed = {item['id']: item for item in changes}
+    removed = set(deleted)
+    return {**data, 'feedback': [changed.get(item['id'], item) for item in data.get('feedback', []) if item['id'] not in removed]}
+
+# Hoe een lokale wijziging (zie APIClient.apply_local) in de gecachte response van een lijst wordt verwerkt
+LOCAL_MERGES = {
+    'subjects': merge_subject_changes,
+    'exams': merge_exam_changes,
+    'feedback': merge_feedback_changes
+}
+
+class Record:
+    """Basis voor de getypeerde structs (__slots__ in plaats van een dict per object).
+    Ze zijn ook te lezen als een dict (record['id'], record.get('terms', {})), zodat code die dicts verwacht blijft werken"""
+    __slots__ = ()
+    DEFAULTS = {} # Waarde als een veld niet in de response stond
+    LOCAL_FIELDS = () # Velden die alleen in de app bestaan en niet naar de API/opslag gaan
+    INTERNED = () # Velden met maar een paar verschillende waarden (type, parent), die delen één string object
+
+    def __init__(self, **fields):
+        # Alleen de velden die in de response staan zetten, een leeg slot leest als de default (zie __getattr__)
+        for name, value in fields.items():
+            if name in self.__slots__:
+                if name in self.INTERNED and type(value) is str:
+                    value = sys.intern(value)
+                setattr(self, name, value)
+
+    def __getattr__(self, name):
+        # Wordt alleen aangeroepen als een slot niet gezet is
+        if name in type(self).__slots__:
+            value = self.DEFAULTS.get(name)
+            return value.copy() if isinstance(value, (list, dict)) else value # Geen gedeelde lijst/dict teruggeven
+        raise AttributeError(name)
+
+    def _value(self, name):
+        """Waarde van een veld, of None als het niet gezet is (zonder default)"""
+        try:
+            return object.__getattribute__(self, name)
+        except AttributeError:
+            return None
+
+    def __getitem__(self, key):
+        value = self._value(key)
+        if value is None:
+            if key not in self.DEFAULTS:
+                raise KeyError(key)
+            return self.DEFAULTS[key]
+        return value
+
+    def get(self, key, default=None):
+        value = self._value(key)
+        if value is None:
+            return default if default is not None else self.DEFAULTS.get(key)
+        return value
+
+    def __contains__(self, key):
+        return self._value(key) is not None
+
+    def keys(self):
+        """De velden die in de response stonden (voor {**record} en to_raw)"""
+        return [name for name in self.__slots__ if name not in self.LOCAL_FIELDS and self._value(name) is not None]
+
+    def to_raw(self):
+        """Terug naar de JSON structuur van de API"""
+        return {name: to_raw(self._value(name)) for name in self.keys()}
+
+    def __eq__(self, other):
+        # Velden die alleen in de app bestaan tellen niet mee, de data van de API bepaalt of een record is veranderd
+        return type(self) is type(other) and all(self._value(name) == other._value(name) for name in self.__slots__ if name not in self.LOCAL_FIELDS)
+
+    def __repr__(self):
+        return f"{type(self).__name__}({', '.join(f'{name}={self._value(name)!r}' for name in self.keys())})"
+
+def to_raw(value):
+    """Zet structs (ook in lijsten en dicts) terug naar gewone JSON waarden, bijv. voor de lokale opslag"""
+    if isinstance(value, Record):
+        return value.to_raw()
+    if isinstance(value, list):
+        return [to_raw(item) for item in value]
+    if isinstance(value, dict):
+        return {key: to_raw(item) for key, item in value.items()}
+    return value
+
+class Question(Record):
+    """Een vraag, met de velden van de API en de namen die de lijst en het details frame gebruiken (vraag_tekst, opties, ...)"""
+    __slots__ = ('id', 'type', 'question', 'answers', 'correctAnswer', 'explanation', 'image', 'context',
+                 'imageOptions', 'terms', 'correctPositions', 'parent', 'createdAt', 'updatedAt', 'titel')
+    LOCAL_FIELDS = ('titel',)
+    INTERNED = ('type', 'parent')
+    DEFAULTS = {'question': '', 'answers': [], 'correctAnswer': 0, 'explanation': '', 'image': '', 'context': '',
+                'imageOptions': [], 'terms': {}, 'correctPositions': [], 'parent': '', 'titel': ''}
+
+    # De namen die de lijst en het details frame gebruiken, afgeleid van de API velden in plaats van een kopie per vraag
+    @property
+    def vraag_tekst(self):
+        return self.question or ''
+
+    @property
+    def opties(self):
+        return (self.answers or []) if self.type == 'multiple_choice' else []
+
+    @property
+    def antwoord(self):
+        answer = self._value('correctAnswer')
+        return '' if answer is None else answer
+
+    @property
+    def uitleg(self):
+        return self.explanation or ''
+
+    @property
+    def afbeelding(self):
+        return self.image or ''
+
+class JSONCodec:
+    """Verwisselbare JSON codec: orjson of msgspec als die geïnstalleerd zijn, anders de standaard json module"""
+    PREFERENCE = ('orjson', 'msgspec', 'json')
+
+    def __init__(self, name=None):
+        names = [name] if name else self.PREFERENCE
+        for candidate in names:
+            try:
+                self._setup(candidate)
+                self.name = candidate
+                return
+            except ImportError:
+                continue
+        raise ImportError(f"JSON codec {name} is niet geïnstalleerd")
+
+    def _setup(self, name):
+        if name == 'orjson':
+            import orjson
+            self.loads = orjson.loads
+            self._dumps = lambda value: orjson.dumps(value, default=to_raw).decode('utf-8')
+        elif name == 'msgspec':
+            import msgspec
+            encoder = msgspec.json.Encoder(enc_hook=to_raw)
+            self.loads = msgspec.json.decode
+            self._dumps = lambda value: encoder.encode(value).decode('utf-8')
+        elif name == 'json':
+            self.loads = json.loads
+            self._dumps = lambda value: json.dumps(value, default=to_raw, separators=(',', ':'), ensure_ascii=False)
+        else:
+            raise ValueError(f"Onbekende JSON codec: {name}")
+
+    def dumps(self, value):
+        """JSON tekst van een waarde, structs worden automatisch terug gezet naar JSON"""
+        return self._dumps(value)
+
+class JSONArrayStream:
+    """Incrementele JSON parser die de elementen van één array in een object (bijv. 'subjects') één voor één teruggeeft.
+    Alleen het element dat nu binnenkomt staat in het geheugen, niet de hele response"""
+    # Een hele string in één keer (of het begin ervan als de chunk halverwege de string ophoudt), of een structuur teken
+    _TOKEN = re.compile(r'"(?P<body>[^"\\]*(?:\\.[^"\\]*)*)(?P<end>"|\\?\Z)|[{}\[\],]', re.S)
+    _STRING_END = re.compile(r'["\\]') # Einde van een string, of een escape (voor een string die in de vorige chunk begon)
+    # Binnen een element hoeven we alleen haakjes te tellen: sla in één keer alles over wat geen haakje is, inclusief complete strings
+    _SKIP = re.compile(r'(?:[^"{}\[\]]+|"[^"\\]*(?:\\.[^"\\]*)*")*', re.S)
+
+    def __init__(self, key, loads=json.loads):
+        self.key = key
+        self.loads = loads
+        self._decoder = codecs.getincrementaldecoder('utf-8')() # Een UTF-8 teken kan over twee chunks verdeeld zijn
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._key_parts = [] # De string die nu op diepte 1 wordt gelezen (een key van het object)
+        self._last_key = None
+        self._in_array = False
+        self.done = False # True als de array helemaal is gelezen
+        self._parts = [] # De tekst van het element dat nu binnenkomt
+
+    def feed(self, data):
+        """Verwerk een chunk bytes, en geef de elementen terug die in deze chunk compleet zijn geworden"""
+        text = self._decoder.decode(data)
+        items = []
+        pos = 0
+        segment_start = 0 # Vanaf waar in deze chunk de tekst bij het huidige element hoort
+        while pos < len(text):
+            if self._in_string:
+                if self._escape: # Het teken na een backslash overslaan
+                    self._escape = False
+                    pos += 1
+                    continue
+                match = self._STRING_END.search(text, pos)
+                end = match.start() if match else len(text)
+                if self._depth == 1:
+                    self._key_parts.append(text[pos:end])
+                if match is None:
+                    break
+                pos = match.end()
+                if match.group() == '\\':
+                    self._escape = True
+                else:
+                    self._in_string = False
+                    if self._depth == 1:
+                        self._last_key = ''.join(self._key_parts)
+                continue
+
+            if self._in_array and self._depth >= 3: # Binnen een element
+                pos = self._SKIP.match(text, pos).end()
+                if pos >= len(text):
+                    break
+                char = text[pos]
+                pos += 1
+                if char == '"': # Een string die in de volgende chunk doorloopt
+                    self._in_string = True
+                elif char in '{[':
+                    self._depth += 1
+                else:
+                    self._depth -= 1
+                continue
+
+            match = self._TOKEN.search(text, pos)
+            if match is None:
+                break
+            char = match.group()[0]
+            pos = match.end()
+            if char == '"':
+                if match.group('end') == '"':
+                    if self._depth == 1:
+                        self._last_key = match.group('body')
+                else: # De string loopt door in de volgende chunk
+                    self._in_string = True
+                    self._escape = match.group('end') == '\\'
+                    if self._depth == 1:
+                        self._key_parts = [match.group('body')]
+            elif char in '{[':
+                self._depth += 1
+                if char == '[' and self._depth == 2 and not self._in_array and not self.done and self._last_key == self.key:
+                    self._in_array = True # De array die we zoeken begint hier
+                    segment_start = pos
+            elif char in '}]':
+                self._depth -= 1
+                if self._in_array and self._depth == 1: # Einde van de array
+                    self._parts.append(text[segment_start:match.start()])
+                    self._emit(items)
+                    self._in_array = False
+                    self.done = True
+            elif char == ',' and self._in_array and self._depth == 2: # Einde van een element
+                self._parts.append(text[segment_start:match.start()])
+                self._emit(items)
+                segment_start = pos
+
+        if self._in_array:
+            self._parts.append(text[segment_start:])
+        return items
+
+    def _emit(self, items):
+        """Parse het element dat nu compleet is"""
+        element = ''.join(self._parts).strip()
+        self._parts = []
+        if element:
+            items.append(self.loads(element))
+
+class ResponseCache:
+    """Cache voor GET responses per endpoint, met een eigen TTL per endpoint (stale-while-revalidate)"""
+    def __init__(self, ttls):
+        self.ttls = ttls
+        self._entries = {} # endpoint_key -> (data, tijdstip van ophalen)
+
+    def get(self, key):
+        """Geef de gecachte data terug (ook als die verlopen is), of None"""
+        entry = self._entries.get(key)
+        return entry[0] if entry else None
+
+    def is_fresh(self, key):
+        """Check of de gecachte data nog binnen de TTL valt"""
+        entry = self._entries.get(key)
+        return entry is not None and time.monotonic() - entry[1] < self.ttls.get(key, 0)
+
+    def set(self, key, data, stale=False):
+        """Sla data op in de cache, alleen voor endpoints met een TTL. Met stale=True geldt de data direct als verlopen (bijv. uit de lokale opslag)"""
+        if key in self.ttls:
+            self._entries[key] = (data, float('-inf') if stale else time.monotonic())
+
+    def replace(self, key, data):
+        """Vervang de gecachte data, het tijdstip van ophalen (en dus de TTL) blijft hetzelfde"""
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries[key] = (data, entry[1])
+
+    def invalidate(self, *keys):
+        """Verwijder de gecachte data voor de gegeven endpoints"""
+        for key in keys:
+            self._entries.pop(key, None)
+
+class SnapshotStore:
+    """Lokale SQLite opslag van de laatste succesvolle GET responses (gecomprimeerd), met een index van de vragen op id en parent"""
+    SCHEMA_VERSION = 2 # Ophogen als de tabellen veranderen, de opslag is een cache en wordt dan gewoon opnieuw opgebouwd
+
+    def __init__(self, path, compression_level=6):
+        self.path = path
+        self.compression_level = compression_level
+        self._lock = threading.Lock() # Opslaan gebeurt vanuit een worker thread, laden vanuit de Tk thread
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._migrate()
+
+    def _migrate(self):
+        """Maak de tabellen aan, en gooi alles weg als de opslag een andere schema versie heeft"""
+        with self._lock, self._conn:
+            version = self._conn.execute('PRAGMA user_version').fetchone()[0]
+            if version != self.SCHEMA_VERSION:
+                self._conn.execute('DROP TABLE IF EXISTS snapshots')
+                self._conn.execute('DROP TABLE IF EXISTS questions')
+                self._conn.execute(f'PRAGMA user_version = {self.SCHEMA_VERSION}')
+            self._conn.execute('CREATE TABLE IF NOT EXISTS snapshots (endpoint TEXT PRIMARY KEY, saved_at REAL, payload BLOB, sync_cursor INTEGER)')
+            self._conn.execute('CREATE TABLE IF NOT EXISTS questions (endpoint TEXT, id TEXT, parent TEXT, position INTEGER, PRIMARY KEY (endpoint, id))')
+            self._conn.execute('CREATE INDEX IF NOT EXISTS questions_parent ON questions (endpoint, parent, position)')
+
+    def save(self, endpoint_key, data, cursor=None):
+        """Sla een response op (met de delta sync watermark als die er is), en werk de index van de vragen bij"""
+        payload = zlib.compress(json.dumps(data, default=to_raw, separators=(',', ':')).encode('utf-8'), self.compression_level)
+        rows = [(endpoint_key, item_id, parent, position) for position, (item_id, parent) in enumerate(self.index_rows(endpoint_key, data))]
+        with self._lock, self._conn:
+            self._conn.execute('INSERT OR REPLACE INTO snapshots VALUES (?, ?, ?, ?)', (endpoint_key, time.time(), payload, cursor))
+            self._conn.execute('DELETE FROM questions WHERE endpoint = ?', (endpoint_key,))
+            self._conn.executemany('INSERT OR REPLACE INTO questions VALUES (?, ?, ?, ?)', rows)
+
+    def load(self, endpoint_key):
+        """Laad een opgeslagen response, geeft (data, saved_at, cursor) terug of None als er niks is opgeslagen"""
+        with self._lock:
+            row = self._conn.execute('SELECT payload, saved_at, sync_cursor FROM snapshots WHERE endpoint = ?', (endpoint_key,)).fetchone()
+        if row is None:
+            return None
+        try:
+            return json.loads(zlib.decompress(row[0])), row[1], row[2]
+        except (zlib.error, ValueError) as e:
+            print(f"Opgeslagen data voor {endpoint_key} is beschadigd: {e}")
+            return None
+
+    def find_question(self, question_id):
+        """Zoek in welke lijsten (endpoint) en onder welke parent een vraag staat"""
+        with self._lock:
+            return self._conn.execute('SELECT endpoint, parent FROM questions WHERE id = ?', (question_id,)).fetchall()
+
+    def question_ids(self, endpoint_key, parent):
+        """De ids van de vragen onder een parent, in de volgorde van de lijst"""
+        with self._lock:
+            rows = self._conn.execute('SELECT id FROM questions WHERE endpoint = ? AND parent = ? ORDER BY position', (endpoint_key, parent)).fetchall()
+        return [row[0] for row in rows]
+
+    def close(self):
+        """Sluit de database connectie"""
+        with self._lock:
+            self._conn.close()
+
+    @staticmethod
+    def index_rows(endpoint_key, data):
+        """Geef (id, parent) terug voor elke vraag in een response, de parent is dezelfde titel als in de lijst (feedback: de vraag id)"""
+        if endpoint_key == 'subjects':
+            for subject in data.get('subjects', []):
+                for question in subject.get('questions', []):
+                    yield question['id'], subject['title']
+        elif endpoint_key == 'exams':
+            for exam in data.get('exams', []):
+                for category, display_name in EXAM_CATEGORIES.items():
+                    for question in exam.get(category, {}).get('questions', []):
+                        yield question['id'], f"Examen {exam['id']} - {display_name}"
+        elif endpoint_key == 'feedback':
+            for feedback in data.get('feedback', []):
+                yield feedback['id'], feedback.get('questionId') or ''
+
+class ImageCache:
+    """Cache voor verkleinde afbeeldingen per (url, formaat), in twee lagen: een LRU in het geheugen met een budget in bytes,
+    en verkleinde PNGs op schijf die met ETag/Last-Modified worden gecontroleerd. Een afbeelding wordt zo maar één keer gedownload en verkleind"""
+
+    def __init__(self, api_client, path=None, memory_bytes=None, disk_bytes=None, revalidate_after=None):
+        self.api_client = api_client
+        self.path = path # None = alleen in het geheugen
+        self.memory_bytes = memory_bytes if memory_bytes is not None else IMAGE_CACHE_CONFIG['memory_bytes']
+        self.disk_bytes = disk_bytes if disk_bytes is not None else IMAGE_CACHE_CONFIG['disk_bytes']
+        self.revalidate_after = revalidate_after if revalidate_after is not None else IMAGE_CACHE_CONFIG['revalidate_after']
+        self._memory = OrderedDict() # (url, formaat) -> PIL image, de laatst gebruikte achteraan
+        self.memory_used = 0 # Bytes van de afbeeldingen in het geheugen
+        self._disk_used = None # Pas uitgerekend bij de eerste keer wegschrijven
+        self._inflight = {} # Afbeeldingen die nu worden geladen, zodat dezelfde afbeelding niet twee keer tegelijk wordt opgehaald
+        self._foreground = 0 # Aantal get() aanroepen voor afbeeldingen die de gebruiker nu ziet
+        self._idle_event = None
+        self._workers = ThreadPoolExecutor(max_workers=IMAGE_CACHE_CONFIG['decode_workers'], thread_name_prefix='image-decode')
+        self.stats = {'memory_hits': 0, 'disk_hits': 0, 'not_modified': 0, 'downloads': 0, 'evictions': 0, 'drafted': 0}
+        if path:
+            os.makedirs(path, exist_ok=True)
+
+    @staticmethod
+    def image_bytes(image):
+        """Geheugen van een (gedecodeerde) afbeelding"""
+        return image.width * image.height * len(image.getbands())
+
+    def contains(self, url, size):
+        """Check of een afbeelding al klaar in het geheugen staat"""
+        return (url, tuple(size)) in self._memory
+
+    def download(self, url, size):
+        """De lopende download van een afbeelding, None als die er niet is"""
+        return self._inflight.get((url, tuple(size)))
+
+    async def get(self, url, size, background=False):
+        """De verkleinde afbeelding (PIL) van url, uit het geheugen, van schijf of gedownload. None als hij niet te laden is.
+        background=True voor vooruit laden, die tellen niet mee voor wait_idle"""
+        key = (url, tuple(size))
+        image = self._memory.get(key)
+        if image is not None:
+            self._memory.move_to_end(key)
+            self.stats['memory_hits'] += 1
+            return image
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._load(url, key[1]))
+            self._inflight[key] = task
+            task.add_done_callback(lambda t: self._inflight.pop(key, None))
+        if background:
+            return await asyncio.shield(task)
+        self._foreground += 1
+        self._idle().clear()
+        try:
+            return await asyncio.shield(task)
+        finally:
+            self._foreground -= 1
+            if not self._foreground:
+                self._idle().set()
+
+    def _idle(self):
+        """Event dat gezet is als er geen afbeeldingen voor de gebruiker worden geladen (in de event loop aangemaakt)"""
+        if self._idle_event is None:
+            self._idle_event = asyncio.Event()
+            self._idle_event.set()
+        return self._idle_event
+
+    async def wait_idle(self):
+        """Wacht tot de afbeeldingen die de gebruiker nu ziet zijn geladen"""
+        await self._idle().wait()
+
+    async def _load(self, url, size):
+        """Laad een afbeelding van schijf (gecontroleerd als hij oud genoeg is) of download en verklein hem"""
+        loop = asyncio.get_running_loop()
+        entry = await loop.run_in_executor(self._workers, self._read_disk, url, size) if self.path else None
+        if entry and time.time() - entry['checked_at'] < self.revalidate_after:
+            self.stats['disk_hits'] += 1
+            image = entry['image']
+        else:
+            try:
+                status, body, etag, last_modified = await self.api_client.fetch_url(
+                    url, etag=entry and entry['etag'], last_modified=entry and entry['last_modified'])
+            except Exception as e:
+                print(f"Fout bij het downloaden van de afbeelding {url}: {e}")
+                status = body = None
+            if status == 304 and entry:
+                self.stats['not_modified'] += 1
+                image = entry['image']
+                await loop.run_in_executor(self._workers, os.utime, entry['file']) # Weer gecontroleerd
+            elif status == 200 and body:
+                self.stats['downloads'] += 1
+                image = await loop.run_in_executor(self._workers, self.decode, body, size)
+                if self.path:
+                    await loop.run_in_executor(self._workers, self._write_disk, url, size, image, etag, last_modified)
+            elif entry: # Offline of een fout, de versie op schijf is beter dan niks
+                image = entry['image']
+            else:
+                return None
+        self._remember((url, size), image)
+        return image
+
+    def decode(self, body, size):
+        """Decodeer en verklein een gedownloade afbeelding (in een worker thread).
+        Een JPEG die veel groter is dan nodig decodeert de JPEG decoder direct op 1/2, 1/4 of 1/8 van het formaat (draft), LANCZOS doet de rest"""
+        image = Image.open(io.BytesIO(body))
+        if image.format == 'JPEG' and image.width >= size[0] * 2 and image.height >= size[1] * 2:
+            if image.draft(None, size): # Nooit kleiner dan size, dus geen kwaliteitsverlies na het verkleinen
+                self.stats['drafted'] += 1
+        return image.resize(size, Image.Resampling.LANCZOS)
+
+    def close(self):
+        """Stop de worker threads (bij het afsluiten)"""
+        self._workers.shutdown(wait=False, cancel_futures=True)
+
+    def _remember(self, key, image):
+        """Zet een afbeelding in de LRU, en haal de minst recent gebruikte eruit tot we binnen het budget zitten"""
+        size = self.image_bytes(image)
+        if size > self.memory_bytes:
+            return
+        if key in self._memory:
+            self.memory_used -= self.image_bytes(self._memory.pop(key))
+        self._memory[key] = image
+        self.memory_used += size
+        while self.memory_used > self.memory_bytes:
+            _, evicted = self._memory.popitem(last=False)
+            self.memory_used -= self.image_bytes(evicted)
+            self.stats['evictions'] += 1
+
+    def _file(self, url, size):
+        return os.path.join(self.path, f"{hashlib.sha1(url.encode('utf-8')).hexdigest()}-{size[0]}x{size[1]}.png")
+
+    def _read_disk(self, url, size):
+        """Lees een verkleinde afbeelding van schijf (in een worker thread), met de ETag/Last-Modified uit de PNG tekst velden"""
+        file = self._file(url, size)
+        if not os.path.exists(file):
+            return None
+        try:
+            image = Image.open(file)
+            image.load()
+            return {'file': file, 'image': image, 'checked_at': os.path.getmtime(file),
+                    'etag': image.text.get('etag'), 'last_modified': image.text.get('last_modified')}
+        except (OSError, ValueError) as e:
+            print(f"Afbeelding in de cache is beschadigd, we downloaden hem opnieuw: {e}")
+            os.remove(file)
+            return None
+
+    def _write_disk(self, url, size, image, etag, last_modified):
+        """Schrijf een verkleinde afbeelding naar schijf (in een worker thread), en ruim de oudste op als het budget op is"""
+        info = PngInfo()
+        if etag:
+            info.add_text('etag', etag)
+        if last_modified:
+            info.add_text('last_modified', last_modified)
+        if image.mode not in ('1', 'L', 'LA', 'P', 'RGB', 'RGBA'): # Bijv. CMYK JPEGs
+            image = image.convert('RGBA')
+        file = self._file(url, size)
+        image.save(file + '.tmp', format='PNG', pnginfo=info)
+        os.replace(file + '.tmp', file) # Nooit een half geschreven bestand in de cache
+        if self._disk_used is None:
+            self._disk_used = sum(entry.stat().st_size for entry in os.scandir(self.path) if entry.is_file())
+        else:
+            self._disk_used += os.path.getsize(file)
+        if self._disk_used > self.disk_bytes:
+            self._prune_disk()
+
+    def _prune_disk(self):
+        """Verwijder de oudste afbeeldingen tot de cache op schijf weer onder 90% van het budget zit"""
+        entries = sorted((entry for entry in os.scandir(self.path) if entry.is_file()), key=lambda entry: entry.stat().st_mtime)
+        self._disk_used = sum(entry.stat().st_size for entry in entries)
+        for entry in entries:
+            if self._disk_used <= self.disk_bytes * 0.9:
+                break
+            self._disk_used -= entry.stat().st_size
+            os.remove(entry.path)
+
+class ImagePrefetcher:
+    """Warmt de image cache op voor de vragen rond de geselecteerde vraag, zodat doorklikken in een hoofdstuk niet op downloads wacht.
+    Met lage prioriteit: maximaal PREFETCH_CONFIG['concurrency'] tegelijk, en pas als de afbeeldingen van de geopende vraag binnen zijn"""
+
+    def __init__(self, image_cache, concurrency=None):
+        self.image_cache = image_cache
+        self.concurrency = concurrency or PREFETCH_CONFIG['concurrency']
+        self.chapter = None # Het hoofdstuk waarvoor we nu vooruit laden
+        self._tasks = set()
+        self._semaphore = None # Pas in de event loop aangemaakt
+        self.stats = {'prefetched': 0, 'cancelled': 0}
+
+    @staticmethod
+    def image_jobs(vraag):
+        """De (url, formaat) paren die het details frame voor een vraag laadt"""
+        jobs = []
+        if vraag.afbeelding:
+            jobs.append((vraag.afbeelding, IMAGE_CACHE_CONFIG['question_size']))
+        if vraag.type == 'image_selection':
+            jobs += [(url, IMAGE_CACHE_CONFIG['option_size']) for url in vraag.imageOptions if url]
+        return jobs
+
+    async def prefetch(self, chapter, vragen):
+        """Start het vooruit laden voor deze vragen, een ander hoofdstuk stopt eerst het vooruit laden van het vorige"""
+        if chapter != self.chapter:
+            self.stop()
+            self.chapter = chapter
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+        for vraag in vragen:
+            for url, size in self.image_jobs(vraag):
+                if not self.image_cache.contains(url, size):
+                    task = asyncio.ensure_future(self._fetch(url, size))
+                    self._tasks.add(task)
+                    task.add_done_callback(self._tasks.discard)
+
+    async def _fetch(self, url, size):
+        async with self._semaphore:
+            await self.image_cache.wait_idle() # Afbeeldingen die de gebruiker nu ziet gaan voor
+            if not self.image_cache.contains(url, size):
+                await self.image_cache.get(url, size, background=True)
+                self.stats['prefetched'] += 1
+
+    def stop(self):
+        """Stop het vooruit laden (de gebruiker heeft het hoofdstuk verlaten), moet in de event loop worden aangeroepen"""
+        for task in list(self._tasks):
+            if not task.done():
+                task.cancel()
+                self.stats['cancelled'] += 1
+        self._tasks.clear()
+        self.chapter = None
+
+class ImageLoader:
+    """Laadt de afbeeldingen van een view (bijv. de grid van een image selection vraag) tegelijk, met een limiet per server.
+    De afbeeldingen van de view die nu open is gaan voor op die van views die de gebruiker al heeft verlaten.
+    Draait in de event loop, de callbacks krijgen de afbeelding (PIL) of None als hij niet te laden was of de view te lang duurde"""
+
+    def __init__(self, image_cache, workers=None, per_host=None, view_timeout=None):
+        self.image_cache = image_cache
+        self.workers = workers or IMAGE_LOADER_CONFIG['workers']
+        self.per_host = per_host or IMAGE_LOADER_CONFIG['per_host']
+        self.view_timeout = view_timeout or IMAGE_LOADER_CONFIG['view_timeout']
+        self.current_view = None
+        self._pending = [] # (view, volgnummer, url, size, callback)
+        self._running = {} # task -> entry
+        self._detached = set() # Downloads van verlopen views die nog doorlopen in de image cache
+        self._hosts = {} # host -> aantal lopende downloads
+        self._timers = {} # view -> timer voor de timeout
+        self._sequence = itertools.count()
+        self.stats = {'loaded': 0, 'failed': 0, 'timeouts': 0}
+
+    @staticmethod
+    def host(url):
+        return urlsplit(url).netloc
+
+    async def load_view(self, view, jobs):
+        """Laad de afbeeldingen van een view, jobs is een lijst van (url, formaat, callback). Deze view wordt de huidige"""
+        self.current_view = view
+        for url, size, callback in jobs:
+            if self.image_cache.contains(url, size): # Al in het geheugen, niet in de wachtrij
+                callback(await self.image_cache.get(url, size))
+            else:
+                self._pending.append((view, next(self._sequence), url, size, callback))
+        if any(entry[0] == view for entry in self._pending):
+            self._timers[view] = asyncio.get_running_loop().call_later(self.view_timeout, self._expire, view)
+        self._schedule()
+
+    def _priority(self, entry):
+        return (entry[0] != self.current_view, entry[1]) # Eerst de huidige view, daarna op volgorde van aanvragen
+
+    def _schedule(self):
+        """Start de belangrijkste wachtende afbeeldingen zolang er workers vrij zijn en de server onder de limiet zit"""
+        while len(self._running) + len(self._detached) < self.workers:
+            candidates = [entry for entry in self._pending if self._hosts.get(self.host(entry[2]), 0) < self.per_host]
+            if not candidates:
+                return
+            entry = min(candidates, key=self._priority)
+            self._pending.remove(entry)
+            host = self.host(entry[2])
+            self._hosts[host] = self._hosts.get(host, 0) + 1
+            task = asyncio.ensure_future(self._load(entry))
+            self._running[task] = entry
+            task.add_done_callback(self._finished)
+
+    async def _load(self, entry):
+        view, _, url, size, callback = entry
+        try:
+            image = await self.image_cache.get(url, size)
+        except asyncio.CancelledError:
+            raise # Timeout van de view, _expire heeft de callback al aangeroepen
+        except Exception as e:
+            print(f"Fout bij laden afbeelding {url}: {e}")
+            image = None
+        self.stats['loaded' if image is not None else 'failed'] += 1
+        callback(image)
+
+    def _finished(self, task):
+        entry = self._running.pop(task)
+        url, size = entry[2], entry[3]
+        download = self.image_cache.download(url, size)
+        if task.cancelled() and download is not None:
+            # Alleen het wachten is gestopt, de server is pas vrij als de download in de image cache klaar is
+            self._detached.add(download)
+            download.add_done_callback(lambda d: self._release(url, d))
+            return
+        self._release(url)
+
+    def _release(self, url, download=None):
+        self._detached.discard(download)
+        host = self.host(url)
+        self._hosts[host] -= 1
+        if not self._hosts[host]:
+            del self._hosts[host]
+        self._schedule()
+
+    def _expire(self, view):
+        """De view duurt te lang: geef de overgebleven afbeeldingen op, zodat de tegels niet blijven laden"""
+        self._timers.pop(view, None)
+        expired = [entry for entry in self._pending if entry[0] == view]
+        self._pending = [entry for entry in self._pending if entry[0] != view]
+        for task, entry in list(self._running.items()):
+            if entry[0] == view:
+                task.cancel() # De download zelf loopt door in de image cache (shield), alleen het wachten stopt
+                expired.append(entry)
+        for entry in expired:
+            self.stats['timeouts'] += 1
+            entry[4](None)
+
+    def close(self):
+        for timer in self._timers.values():
+            timer.cancel()
+        for task in self._running:
+            task.cancel()
+        self._pending.clear()
+
+class APIError(Exception):
+    """Fout van de API client, met de status code (als die er is), of het zin heeft om het opnieuw te proberen en na hoeveel pogingen"""
+    def __init__(self, message, status=None, retryable=False):
+        super().__init__(message)
+        self.status = status
+        self.retryable = retryable
+        self.attempts = 1
+
 class APIClient:
-    """API client class"""
-    def __init__(self, base_url, api_key):
+    """API client class, met één gedeelde sessie (connection pool) voor alle requests en afbeeldingen"""
+    def __init__(self, base_url, api_key, pool_config=None, retry_config=None, hedge_config=None, store=None, codec=None):
         self.base_url = base_url
         self.headers = {
             'x-api-key': api_key,
             'Content-Type': 'application/json'
         }
+        self.pool_config = {**API_CONFIG['POOL'], **(pool_config or {})}
+        self._session = None # Wordt pas aangemaakt in de event loop van de app, zie get_session
+        self._inflight = {} # Lopende GET requests per endpoint, zodat dubbele requests op elkaar kunnen wachten
+        self._waiters = {} # Lopende request -> aantal wachtenden, als de laatste wordt gecanceld stoppen we de request
+        self.retry_config = {**API_CONFIG['RETRY'], **(retry_config or {})}
+        self.hedge_config = {**API_CONFIG['HEDGE'], **(hedge_config or {})}
+        self._latencies = {} # Laatste latency metingen per endpoint, voor het hedge percentiel
+        self.cache = ResponseCache(CACHE_TTL)
+        self._background = set() # Lopende achtergrond revalidaties
+        self.store = store # Optionele SnapshotStore, waar succesvolle GETs in worden bewaard
+        self.codec = codec or JSONCodec(JSON_CONFIG['codec'])
+        self.loads = self.codec.loads # Hoe responses worden gedecodeerd
+        self.delta_supported = True # Wordt False als de server geen delta endpoint heeft, dan halen we altijd alles op
+        self._sync_state = {} # endpoint_key -> (laatst gesynchroniseerde data, watermark), de basis voor delta sync
+        self.stats = {'requests': 0, 'coalesced': 0, 'retries': 0, 'hedged': 0, 'delta_syncs': 0} # Tellers, coalesced = aantal GETs die een lopende request hebben hergebruikt
+
+    def get_session(self):
+        """Geef de gedeelde sessie terug, en maak deze aan als die er nog niet is (moet in de event loop worden aangeroepen)"""
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.pool_config['limit'],
+                limit_per_host=self.pool_config['limit_per_host'],
+                keepalive_timeout=self.pool_config['keepalive_timeout'],
+                ttl_dns_cache=self.pool_config['ttl_dns_cache'],
+                use_dns_cache=True
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=self.pool_config['timeout'])
+            )
+        return self._session
+
+    async def close(self):
+        """Sluit de gedeelde sessie en alle open connecties, aangeroepen vanuit App.cleanup"""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
     
     async def get(self, endpoint_key):
-        """GET request"""
-        return await self._request(endpoint_key, 'get')
+        """GET request, identieke GETs die tegelijk lopen delen één request (single-flight)"""
+        return await self._single_flight(endpoint_key, lambda: self._fetch_and_cache(endpoint_key))
+
+    async def refresh(self, endpoint_key):
+        """Haal actuele data op, via delta sync als het endpoint dat ondersteunt en we al een basis hebben, anders een volledige GET"""
+        if self.can_sync(endpoint_key):
+            return await self._single_flight(endpoint_key, lambda: self._sync_delta(endpoint_key))
+        return await self.get(endpoint_key)
+
+    def can_sync(self, endpoint_key):
+        """Check of dit endpoint via delta sync kan worden ververst (ondersteund, en we hebben al een basis)"""
+        return endpoint_key in DELTA_ENDPOINTS and self.delta_supported and endpoint_key in self._sync_state
+
+    async def _single_flight(self, key, start):
+        """Voer start() maar één keer tegelijk uit per key, andere aanroepen wachten op hetzelfde resultaat"""
+        task = self._inflight.get(key)
+        if task is not None:
+            self.stats['coalesced'] += 1
+        else:
+            task = self._track(key, asyncio.ensure_future(start()))
+        # shield: als één wachtende wordt gecanceld, blijft de request voor de andere wachtenden doorlopen
+        self._waiters[task] = self._waiters.get(task, 0) + 1
+        try:
+            return await asyncio.shield(task)
+        except asyncio.CancelledError:
+            if self._waiters[task] == 1 and not task.done(): # Niemand wacht er meer op, dus de request (en de bandbreedte) stoppen
+                task.cancel()
+            raise
+        finally:
+            self._waiters[task] -= 1
+            if not self._waiters[task]:
+                del self._waiters[task]
+    
+    def _track(self, key, task):
+        """Zet een lopende request in _inflight tot hij klaar is, zodat andere aanroepen erop kunnen wachten"""
+        self._inflight[key] = task
+
+        def klaar(t):
+            if self._inflight.get(key) is t:
+                del self._inflight[key]
+        task.add_done_callback(klaar)
+        return task
+
+    async def _fetch_and_cache(self, endpoint_key):
+        """Haal de data op en sla het resultaat op in de cache"""
+        data = await self._request(endpoint_key, 'get')
+        cursor = subjects_cursor(data) if endpoint_key == 'subjects' else None
+        await self._remember(endpoint_key, data, cursor)
+        return data
+
+    async def _sync_delta(self, endpoint_key):
+        """Haal alleen de wijzigingen sinds de watermark op en verwerk ze in de laatst gesynchroniseerde data"""
+        base, cursor = self._sync_state[endpoint_key]
+        try:
+            delta = await self._request(DELTA_ENDPOINTS[endpoint_key], 'get', params={'since': cursor})
+        except APIError as e:
+            if e.status not in (404, 405, 501):
+                raise
+            delta = None
+        if not isinstance(delta, dict) or 'changes' not in delta:
+            print(f"Server ondersteunt geen delta sync voor {endpoint_key}, we halen voortaan alles op")
+            self.delta_supported = False
+            return await self._fetch_and_cache(endpoint_key)
+
+        data = merge_subject_changes(base, delta['changes'], delta.get('deleted', []))
+        if data is None: # Bijv. een nieuw onderwerp, dat kunnen we niet mergen
+            return await self._fetch_and_cache(endpoint_key)
+        self.stats['delta_syncs'] += 1
+        await self._remember(endpoint_key, data, delta.get('cursor', cursor))
+        return data
+
+    async def _remember(self, endpoint_key, data, cursor=None):
+        """Sla een response op in de cache, als basis voor delta sync en in de lokale opslag"""
+        self.cache.set(endpoint_key, data)
+        if endpoint_key in DELTA_ENDPOINTS:
+            self._sync_state[endpoint_key] = (data, cursor)
+        if self.store is not None and endpoint_key in SNAPSHOT_CONFIG['endpoints']:
+            try:
+                # Comprimeren en wegschrijven in een worker thread, zodat de event loop niet blokkeert
+                await asyncio.get_running_loop().run_in_executor(None, self.store.save, endpoint_key, data, cursor)
+            except Exception as e:
+                print(f"Fout bij het lokaal opslaan van {endpoint_key}: {e}")
+
+    def restore(self, endpoint_key, data, cursor=None):
+        """Zet data uit de lokale opslag terug als verlopen cache, zodat het direct getoond kan worden en daarna (delta) wordt ververst"""
+        self.cache.set(endpoint_key, data, stale=True)
+        if endpoint_key in DELTA_ENDPOINTS and cursor is not None:
+            self._sync_state[endpoint_key] = (data, cursor)
+
+    async def get_cached(self, endpoint_key, on_change=None):
+        """GET via de cache: geef gecachte data direct terug, en haal bij verlopen data op de achtergrond nieuwe data op.
+        on_change wordt alleen aangeroepen als de nieuwe data anders is dan de gecachte data"""
+        cached = self.cache.get(endpoint_key)
+        if cached is None:
+            return await self.refresh(endpoint_key)
+        if not self.cache.is_fresh(endpoint_key):
+            task = asyncio.ensure_future(self._revalidate(endpoint_key, cached, on_change))
+            self._background.add(task) # Referentie bewaren, anders kan de task halverwege worden opgeruimd
+            task.add_done_callback(self._background.discard)
+        return cached
+
+    async def _revalidate(self, endpoint_key, cached, on_change):
+        """Haal nieuwe data op de achtergrond op, voor get_cached"""
+        try:
+            data = await self.refresh(endpoint_key)
+        except Exception as e:
+            print(f"Verversen van {endpoint_key} op de achtergrond gefaald, we houden de gecachte data: {e}")
+            return
+        if data != cached and on_change:
+            on_change(data)
     
-    async def post(self, endpoint_key, data):
+    async def stream_items(self, endpoint_key, array_key, chunk_size=64 * 1024):
+        """GET die de elementen van een array in de response één voor één teruggeeft terwijl de response binnenkomt (async generator).
+        Als de hele array binnen is, wordt de response net als bij get in de cache en lokale opslag gezet.
+        Er zijn geen retries, want de elementen die al zijn teruggegeven kunnen we niet terugnemen.
+        Loopt er al een request voor dit endpoint (bijv. een dubbele klik), dan wachten we daarop en komen de elementen pas als die klaar is"""
+        if endpoint_key in self._inflight:
+            data = await self._single_flight(endpoint_key, None)
+            for item in data[array_key]:
+                yield item
+            return
+
+        # De stream staat als lopende request in _inflight, get, refresh en andere streams wachten op het resultaat
+        result = self._track(endpoint_key, asyncio.get_running_loop().create_future())
+        self.stats['requests'] += 1
+        try:
+            session = self.get_session()
+            endpoint = f"{self.base_url}{API_CONFIG['ENDPOINTS'][endpoint_key]}"
+            items = []
+            async with session.get(endpoint, headers=self.headers) as response:
+                if response.status not in [200, 201]:
+                    error_text = await response.text()
+                    raise APIError(f"Request gefaald: API Fout: {response.status}, {error_text}", status=response.status, retryable=response.status in RETRYABLE_STATUS)
+                parser = JSONArrayStream(array_key, loads=self.loads)
+                async for chunk in response.content.iter_chunked(chunk_size):
+                    for item in parser.feed(chunk):
+                        items.append(item)
+                        yield item
+                if not parser.done:
+                    raise APIError(f"Request gefaald: '{array_key}' niet (volledig) gevonden in de response van {endpoint_key}")
+
+            data = {array_key: items}
+            await self._remember(endpoint_key, data, subjects_cursor(data) if endpoint_key == 'subjects' else None)
+        except BaseException as e:
+            if not result.done():
+                if isinstance(e, Exception) and self._waiters.get(result): # Alleen doorgeven als iemand erop wacht, anders blijft de fout ongelezen
+                    result.set_exception(e)
+                else:
+                    result.cancel()
+            raise
+        if not result.done():
+            result.set_result(data)
+
+    async def post(self, endpoint_key, data, optimistic=False):
         """POST request"""
-        return await self._request(endpoint_key, 'post', data)
+        return await self._mutate(endpoint_key, 'post', data, optimistic)
     
-    async def put(self, endpoint_key, data):
+    async def put(self, endpoint_key, data, optimistic=False):
         """PUT request"""
-        return await self._request(endpoint_key, 'put', data)
+        return await self._mutate(endpoint_key, 'put', data, optimistic)
     
-    async def delete(self, endpoint_key, data=None):
+    async def delete(self, endpoint_key, data=None, optimistic=False):
         """DELETE request"""
-        return await self._request(endpoint_key, 'delete', data)
+        return await self._mutate(endpoint_key, 'delete', data, optimistic)
+
+    async def _mutate(self, endpoint_key, method, data=None, optimistic=False):
+        """Wijzigende request, maakt daarna de gecachte GETs ongeldig waar de wijziging invloed op heeft.
+        Met optimistic=True is de wijziging al in de cache verwerkt (apply_local), die blijft dan staan en bij een fout draait de aanroeper hem terug (rollback_local)"""
+        try:
+            result = await self._request(endpoint_key, method, data)
+        except BaseException:
+            if not optimistic: # Ook bij een fout, want de wijziging kan server side toch (deels) zijn doorgevoerd
+                self.cache.invalidate(*CACHE_INVALIDATES.get(endpoint_key, []))
+            raise
+        if not optimistic:
+            self.cache.invalidate(*CACHE_INVALIDATES.get(endpoint_key, []))
+        return result
+
+    async def bulk(self, endpoint_key, method, payloads, concurrency=None, on_progress=None, optimistic=False):
+        """Dezelfde wijzigende request voor een lijst payloads (bijv. meerdere vragen verwijderen), met maximaal concurrency tegelijk.
+        Geeft per payload het resultaat of de fout terug (zelfde volgorde), een fout stopt de andere requests niet.
+        on_progress(klaar, totaal) wordt na elke request aangeroepen. De gecachte GETs worden één keer aan het eind ongeldig gemaakt"""
+        semaphore = asyncio.Semaphore(concurrency or API_CONFIG['BULK']['concurrency'])
+        done = 0
+
+        async def send(payload):
+            nonlocal done
+            async with semaphore:
+                try:
+                    return await self._request(endpoint_key, method, payload)
+                except Exception as e:
+                    return e
+                finally:
+                    done += 1
+                    if on_progress is not None:
+                        on_progress(done, len(payloads))
+        try:
+            return await asyncio.gather(*(send(payload) for payload in payloads))
+        finally:
+            if not optimistic:
+                self.cache.invalidate(*CACHE_INVALIDATES.get(endpoint_key, []))
+
+    def apply_local(self, endpoint_key, changes=(), deleted=()):
+        """Verwerk gewijzigde, nieuwe en verwijderde vragen (of feedback items) direct in de gecachte response van een lijst, zonder GET (optimistic update).
+        Geeft (vorige, nieuwe) data terug voor rollback_local, of None als er niets in de cache staat of de wijziging niet past"""
+        cached = self.cache.get(endpoint_key)
+        if cached is None or endpoint_key not in LOCAL_MERGES:
+            return None
+        data = LOCAL_MERGES[endpoint_key](cached, list(changes), list(deleted))
+        if data is None:
+            return None
+        self.cache.replace(endpoint_key, data)
+        return cached, data
+
+    def rollback_local(self, endpoint_key, previous, applied):
+        """Draai apply_local terug na een mislukte request. Is de cache intussen opnieuw gewijzigd, dan kan dat niet zonder
+        de latere wijzigingen kwijt te raken en wordt de cache ongeldig. Geeft True terug als de vorige data terug staat"""
+        if self.cache.get(endpoint_key) is applied:
+            self.cache.set(endpoint_key, previous, stale=True) # Als verlopen, de server kan de wijziging toch (deels) hebben doorgevoerd
+            return True
+        self.cache.invalidate(endpoint_key)
+        return False
+
+    async def fetch_url(self, url, etag=None, last_modified=None):
+        """Haal een url op (bijv. een afbeelding) via dezelfde connection pool, zonder de API headers.
+        Met etag/last_modified is het een conditional GET. Geeft (status, bytes, etag, last_modified) terug, bytes is None als de status geen 200 is"""
+        headers = {}
+        if etag:
+            headers['If-None-Match'] = etag
+        if last_modified:
+            headers['If-Modified-Since'] = last_modified
+        session = self.get_session()
+        async with session.get(url, headers=headers) as response:
+            body = await response.read() if response.status == 200 else None
+            return response.status, body, response.headers.get('ETag'), response.headers.get('Last-Modified')
     
-    async def _request(self, endpoint_key, method, data=None):
-        """Request handler"""
-        async with aiohttp.ClientSession() as session:
+    async def _request(self, endpoint_key, method, data=None, deadline=None, params=None):
+        """Request handler, probeert idempotente requests opnieuw met exponentiële backoff en jitter, binnen een totale deadline"""
+        loop = asyncio.get_running_loop()
+        deadline = deadline or self.retry_config['deadline']
+        deadline_at = loop.time() + deadline
+        max_attempts = self.retry_config['max_attempts'] if method in self.retry_config['idempotent_methods'] else 1
+        attempt = 0
+        while True:
+            attempt += 1
             try:
-                endpoint = f"{self.base_url}{API_CONFIG['ENDPOINTS'][endpoint_key]}" #Endpoint opbouwen
-                async with getattr(session, method)(
-                    endpoint,
-                    headers=self.headers,
-                    json=data
-                ) as response:
-                    # Zowel 200 als 201 worden als succes status codes geaccepteerd, dit is namelijk niet consistent in de API
-                    if response.status in [200, 201]:
-                        return await response.json()
-                    error_text = await response.text()
-                    raise Exception(f"API Fout: {response.status}, {error_text}")
+                remaining = deadline_at - loop.time()
+                if remaining <= 0:
+                    raise asyncio.TimeoutError()
+                if method == 'get' and self.hedge_config['enabled']:
+                    return await asyncio.wait_for(self._hedged_send(endpoint_key, params), remaining)
+                return await asyncio.wait_for(self._send(endpoint_key, method, data, params), remaining)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                error = self._to_api_error(e, deadline)
+                error.attempts = attempt
+                delay = self._backoff_delay(attempt)
+                if not error.retryable or attempt >= max_attempts or loop.time() + delay >= deadline_at:
+                    raise error
+                self.stats['retries'] += 1
+                print(f"Request naar {endpoint_key} gefaald (poging {attempt}), opnieuw over {delay:.2f}s: {error}")
+                await asyncio.sleep(delay)
+
+    async def _send(self, endpoint_key, method, data=None, params=None):
+        """Eén enkele HTTP request, zonder retries"""
+        self.stats['requests'] += 1
+        session = self.get_session()
+        endpoint = f"{self.base_url}{API_CONFIG['ENDPOINTS'][endpoint_key]}" #Endpoint opbouwen
+        started = time.monotonic()
+        async with getattr(session, method)(
+            endpoint,
+            headers=self.headers,
+            data=None if data is None else self.codec.dumps(data),
+            params=params
+        ) as response:
+            # Zowel 200 als 201 worden als succes status codes geaccepteerd, dit is namelijk niet consistent in de API
+            if response.status in [200, 201]:
+                result = self.loads(await response.read())
+                if method == 'get':
+                    self._record_latency(endpoint_key, time.monotonic() - started)
+                return result
+            error_text = await response.text()
+            raise APIError(f"Request gefaald: API Fout: {response.status}, {error_text}", status=response.status, retryable=response.status in RETRYABLE_STATUS)
+
+    async def _hedged_send(self, endpoint_key, params=None):
+        """GET die een tweede request start als de eerste langer duurt dan het ingestelde percentiel, de snelste wint"""
+        hedge_delay = self._hedge_delay(endpoint_key)
+        tasks = [asyncio.ensure_future(self._send(endpoint_key, 'get', params=params))]
+        try:
+            if hedge_delay is not None:
+                done, _ = await asyncio.wait(tasks, timeout=hedge_delay)
+                if not done:
+                    self.stats['hedged'] += 1
+                    tasks.append(asyncio.ensure_future(self._send(endpoint_key, 'get', params=params)))
+
+            pending = set(tasks)
+            error = None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        return task.result()
+                    error = task.exception()
+            raise error
+        finally:
+            for task in tasks: # De langzamere request is niet meer nodig
+                task.cancel()
+
+    def _record_latency(self, endpoint_key, seconds):
+        """Sla een latency meting op voor het hedge percentiel"""
+        samples = self._latencies.setdefault(endpoint_key, deque(maxlen=self.hedge_config['window']))
+        samples.append(seconds)
+
+    def _hedge_delay(self, endpoint_key):
+        """Het percentiel van de gemeten latency, of None als er nog te weinig metingen zijn"""
+        samples = sorted(self._latencies.get(endpoint_key, ()))
+        if len(samples) < self.hedge_config['min_samples']:
+            return None
+        index = round(self.hedge_config['percentile'] / 100 * (len(samples) - 1))
+        return samples[index]
+
+    def _backoff_delay(self, attempt):
+        """Exponentiële backoff met 'full jitter', zodat niet alle clients tegelijk opnieuw proberen"""
+        cap = min(self.retry_config['max_delay'], self.retry_config['base_delay'] * 2 ** (attempt - 1))
+        return random.uniform(0, cap)
+
+    def _to_api_error(self, error, deadline):
+        """Zet een willekeurige fout om naar een APIError, en bepaal of het zin heeft om het opnieuw te proberen"""
+        if isinstance(error, APIError): # Al omgezet, bijv. door _send
+            return error
+        if isinstance(error, asyncio.TimeoutError):
+            return APIError(f"Request gefaald: geen antwoord binnen {deadline}s", retryable=True)
+        if isinstance(error, aiohttp.ClientError):
+            return APIError(f"Request gefaald: {str(error)}", retryable=True)
+        return APIError(f"Request gefaald: {str(error)}")
+
+class SaveQueue:
+    """Write-behind wachtrij voor het opslaan van bestaande vragen. Elke wijziging komt eerst in een append-only journal op schijf
+    en wordt daarna op de achtergrond verstuurd, met maximaal concurrency PUTs tegelijk. Wijzigingen aan een vraag die nog niet
+    verstuurd zijn worden samengevoegd (elke keer opslaan stuurt de hele vraag, dus de laatste versie wint).
+    Lukt versturen niet omdat de server onbereikbaar is, dan blijft de wijziging staan en wordt het later opnieuw geprobeerd.
+    Wat na een crash of offline afsluiten nog in het journal staat wordt bij start() opnieuw in de wachtrij gezet"""
+
+    def __init__(self, api_client, path=None, concurrency=None, delay=None, retry_delay=None, max_retry_delay=None, on_change=None):
+        self.api_client = api_client
+        self.path = path # None = geen journal, alleen in het geheugen
+        self.concurrency = concurrency or SAVE_QUEUE_CONFIG['concurrency']
+        self.delay = SAVE_QUEUE_CONFIG['delay'] if delay is None else delay
+        self.retry_delay = retry_delay or SAVE_QUEUE_CONFIG['retry_delay']
+        self.max_retry_delay = max_retry_delay or SAVE_QUEUE_CONFIG['max_retry_delay']
+        self.on_change = on_change # on_change(question_id, status, detail), in de event loop (queued, saving, saved, retry of failed)
+        self.pending = {} # question id -> (payload, volgnummers van de journal records) die nog verstuurd moet worden
+        self._inflight = set() # Vragen waarvan nu een PUT loopt, per vraag maar één tegelijk zodat de volgorde klopt
+        self._timers = {} # question id -> geplande flush
+        self._tasks = set()
+        self._failures = {} # question id -> mislukte pogingen op rij, voor de backoff
+        self._semaphore = None # Pas in de event loop aanmaken
+        self._started = None
+        self._seq = 0
+        # Eén thread voor het journal: schrijven, afspelen en leegmaken gebeuren zo in de volgorde waarin ze zijn aangevraagd
+        self._journal = ThreadPoolExecutor(max_workers=1, thread_name_prefix='journal')
+        if path and os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.stats = {'queued': 0, 'coalesced': 0, 'sent': 0, 'retries': 0, 'failed': 0, 'replayed': 0}
+
+    def is_pending(self, question_id):
+        """Of er van een vraag nog een wijziging onderweg is"""
+        return question_id in self.pending or question_id in self._inflight
+
+    async def start(self):
+        """Speel het journal (één keer) af, wijzigingen die nog niet verstuurd waren gaan opnieuw de wachtrij in"""
+        if self._started is None:
+            self._started = asyncio.ensure_future(self._replay())
+        await self._started
+
+    async def _replay(self):
+        edits, last_seq = await asyncio.get_running_loop().run_in_executor(self._journal, self._read_journal)
+        self._seq = max(self._seq, last_seq)
+        for seq, question_id, data in edits:
+            seqs = self.pending[question_id][1] if question_id in self.pending else []
+            self.pending[question_id] = (data, seqs + [seq])
+            self.stats['replayed'] += 1
+        for question_id in list(self.pending):
+            self._schedule(question_id, 0)
+
+    async def enqueue(self, question_id, data):
+        """Zet een wijziging in de wachtrij, hij wordt pas verstuurd als hij in het journal staat"""
+        await self.start()
+        data = {**to_raw(data), 'id': question_id}
+        self._seq += 1
+        seq = self._seq
+        seqs = []
+        if question_id in self.pending:
+            seqs = self.pending[question_id][1]
+            self.stats['coalesced'] += 1
+        # Eerst in pending en dan pas naar het journal, zodat _finish het journal nooit leegmaakt terwijl dit record nog wordt geschreven
+        self.pending[question_id] = (data, seqs + [seq])
+        self.stats['queued'] += 1
+        await asyncio.get_running_loop().run_in_executor(self._journal, self._append, {'op': 'edit', 'seq': seq, 'id': question_id, 'data': data})
+        self._notify(question_id, 'queued')
+        self._schedule(question_id, self.delay)
+
+    def _schedule(self, question_id, delay):
+        """Plan het versturen van een vraag, als dat nog niet gepland is (latere wijzigingen gaan dan mee)"""
+        if question_id not in self._timers:
+            self._timers[question_id] = asyncio.get_running_loop().call_later(delay, self._start_flush, question_id)
+
+    def _start_flush(self, question_id):
+        self._timers.pop(question_id, None)
+        task = asyncio.ensure_future(self._flush(question_id))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _flush(self, question_id):
+        """Verstuur de samengevoegde wijziging van een vraag"""
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+        async with self._semaphore:
+            if question_id in self._inflight or question_id not in self.pending:
+                return # Loopt al (wordt na afloop opnieuw gepland) of is al verstuurd
+            data, seqs = self.pending.pop(question_id)
+            self._inflight.add(question_id)
+            self._notify(question_id, 'saving')
+            try:
+                await self.api_client.put('update_question', data, optimistic=True) # De lijst is al bijgewerkt, zie App.on_save_status
+            except asyncio.CancelledError:
+                self._restore(question_id, data, seqs)
+                raise
+            except APIError as e:
+                if e.retryable: # Server (tijdelijk) niet bereikbaar, het journal houdt de wijziging vast
+                    self._restore(question_id, data, seqs)
+                    failures = self._failures[question_id] = self._failures.get(question_id, 0) + 1
+                    self.stats['retries'] += 1
+                    self._notify(question_id, 'retry', e)
+                    self._schedule(question_id, min(self.max_retry_delay, self.retry_delay * 2 ** (failures - 1)))
+                    return
+                # De server weigert de wijziging, opnieuw proberen helpt niet en na een herstart ook niet
+                self._failures.pop(question_id, None)
+                self.stats['failed'] += 1
+                self._notify(question_id, 'failed', e)
+            else:
+                self._failures.pop(question_id, None)
+                self.stats['sent'] += 1
+                self._notify(question_id, 'saved', data)
+            finally:
+                self._inflight.discard(question_id)
+            await self._finish(seqs)
+        if question_id in self.pending: # Tijdens het versturen opnieuw opgeslagen
+            self._schedule(question_id, self.delay)
+
+    def _restore(self, question_id, data, seqs):
+        """Zet een wijziging die niet is verstuurd terug, een nieuwere wijziging van dezelfde vraag gaat voor"""
+        if question_id in self.pending:
+            newer, newer_seqs = self.pending[question_id]
+            self.pending[question_id] = (newer, seqs + newer_seqs)
+        else:
+            self.pending[question_id] = (data, seqs)
+
+    async def _finish(self, seqs):
+        """Markeer records in het journal als afgehandeld, en maak het journal leeg als er niets meer openstaat"""
+        compact = not self.pending and not self._inflight
+        await asyncio.get_running_loop().run_in_executor(self._journal, self._complete, seqs, compact)
+
+    def _notify(self, question_id, status, detail=None):
+        if self.on_change is not None:
+            self.on_change(question_id, status, detail)
+
+    def _append(self, record):
+        """Schrijf een record naar het journal en wacht tot het echt op schijf staat"""
+        if not self.path:
+            return
+        with open(self.path, 'a', encoding='utf-8') as file:
+            file.write(json.dumps(record, separators=(',', ':')) + '\n')
+            file.flush()
+            os.fsync(file.fileno())
+
+    def _complete(self, seqs, compact):
+        if not self.path:
+            return
+        if compact:
+            with open(self.path, 'w', encoding='utf-8') as file:
+                file.flush()
+                os.fsync(file.fileno())
+        else:
+            self._append({'op': 'done', 'seqs': seqs})
+
+    def _read_journal(self):
+        """De wijzigingen in het journal die nog niet zijn afgehandeld, als [(seq, question id, payload)] op volgorde, en het hoogste volgnummer"""
+        edits = {}
+        last_seq = 0
+        if not self.path or not os.path.exists(self.path):
+            return [], last_seq
+        with open(self.path, encoding='utf-8') as file:
+            for line in file:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue # Half geschreven regel van een crash, die wijziging is nooit verstuurd
+                if record.get('op') == 'edit':
+                    edits[record['seq']] = (record['id'], record['data'])
+                    last_seq = max(last_seq, record['seq'])
+                elif record.get('op') == 'done':
+                    for seq in record['seqs']:
+                        edits.pop(seq, None)
+        return [(seq, *edits[seq]) for seq in sorted(edits)], last_seq
+
+    def close(self):
+        """Stop de geplande flushes en wacht tot het journal is weggeschreven, wat niet is verstuurd wordt bij de volgende start afgespeeld"""
+        for timer in self._timers.values():
+            timer.cancel()
+        self._timers.clear()
+        self._journal.shutdown(wait=True)
+
+class UIDispatcher:
+    """Wachtrij voor UI updates vanuit de async loop thread. Tkinter is niet thread-safe, dus coroutines roepen Tk niet direct aan
+    maar posten een callback, die één keer per frame op de Tk thread wordt uitgevoerd.
+    Callbacks met dezelfde key (bijv. 'lijst') worden samengevoegd, alleen de laatste wordt uitgevoerd"""
+
+    def __init__(self, root, interval_ms=16):
+        self.root = root
+        self.interval_ms = interval_ms # Ongeveer één frame bij 60 fps
+        self._lock = threading.Lock()
+        self._queue = {} # key -> (callback, args), een dict houdt de volgorde bij, callbacks zonder key krijgen een unieke key
+        self._counter = 0
+        self._after = None
+        # Diagnostiek: hoeveel er gepost, samengevoegd en uitgevoerd is, en hoe lang het uitvoeren per frame duurt
+        self.stats = {'posted': 0, 'merged': 0, 'drained': 0, 'errors': 0, 'max_depth': 0, 'last_drain_ms': 0.0, 'max_drain_ms': 0.0}
+        self._after = self.root.after(self.interval_ms, self.drain)
+
+    @property
+    def depth(self):
+        """Aantal callbacks dat op de volgende frame wacht"""
+        with self._lock:
+            return len(self._queue)
+
+    def post(self, callback, *args, key=None):
+        """Voer callback(*args) uit op de Tk thread, kan vanuit elke thread worden aangeroepen"""
+        with self._lock:
+            if key is None:
+                self._counter += 1
+                key = ('_', self._counter)
+            elif key in self._queue:
+                del self._queue[key] # De oudere update voor hetzelfde doel vervalt, de nieuwe komt achteraan
+                self.stats['merged'] += 1
+            self._queue[key] = (callback, args)
+            self.stats['posted'] += 1
+            self.stats['max_depth'] = max(self.stats['max_depth'], len(self._queue))
+
+    def drain(self):
+        """Voer alle wachtende callbacks uit, wordt elke frame door Tk aangeroepen"""
+        # Eerst de volgende frame inplannen, een messagebox in een callback houdt de andere updates dan niet tegen
+        self._after = self.root.after(self.interval_ms, self.drain)
+        with self._lock:
+            batch = list(self._queue.values())
+            self._queue.clear()
+        if not batch:
+            return
+        started = time.perf_counter()
+        for callback, args in batch:
+            try:
+                callback(*args)
             except Exception as e:
-                raise Exception(f"Request gefaald: {str(e)}")
+                self.stats['errors'] += 1
+                print(f"Fout in UI update {getattr(callback, '__name__', callback)}: {e}")
+        elapsed = (time.perf_counter() - started) * 1000
+        self.stats['drained'] += len(batch)
+        self.stats['last_drain_ms'] = elapsed
+        self.stats['max_drain_ms'] = max(self.stats['max_drain_ms'], elapsed)
+
+    def close(self):
+        """Stop met drainen (bij het afsluiten)"""
+        if self._after:
+            self.root.after_cancel(self._after)
+            self._after = None
 
 class App:
     """Main application class met alle globale functies"""
@@ -1271,15 +3619,24 @@ class App:
         self.setup_window()
         self.setup_async_loop()
         self.setup_frames()
+        self.restore_snapshots()
 
     def setup_api_config(self):
         """Haal de API key en url op uit de .env file"""
         load_dotenv()
+        self.current_lijst = None # Welke lijst er nu getoond wordt (subjects, exams, feedback of rapporten)
         self.api_url = os.getenv('API_URL')
         self.api_key = os.getenv('API_KEY')
-        self.api_client = APIClient(self.api_url, self.api_key)
-        if not self.api_key or not self.api_url:
+        if not self.api_key or not self.api_url: #Eerst checken, voordat er bestanden en mappen (~/.theorio) worden aangemaakt
             raise ValueError("API_KEY en/of API_URL niet gevonden in .env file, check het verslag voor de api_key en api_url")
+        self.store = SnapshotStore(os.getenv('THEORIO_SNAPSHOT_PATH', SNAPSHOT_CONFIG['path']), SNAPSHOT_CONFIG['compression_level'])
+        self.api_client = APIClient(self.api_url, self.api_key, store=self.store)
+        self.image_cache = ImageCache(self.api_client, os.getenv('THEORIO_IMAGE_CACHE_PATH', IMAGE_CACHE_CONFIG['path']))
+        self.prefetcher = ImagePrefetcher(self.image_cache)
+        self.duplicates = DuplicateIndex() # Bijgewerkt bij het openen van het rapport en bij het opslaan van vragen
+        self.image_loader = ImageLoader(self.image_cache)
+        self.optimistic = {} # question id -> handle van apply_question_changes, voor wijzigingen die nog in de save queue staan
+        self.save_queue = SaveQueue(self.api_client, os.getenv('THEORIO_JOURNAL_PATH', SAVE_QUEUE_CONFIG['path']), on_change=self.on_save_status)
 
     def setup_window(self):
         """Venster instellingen"""
@@ -1287,6 +3644,7 @@ class App:
         self.root.title("Theorio Cursusbeheer")
         self.root.geometry("1200x800")
         self.root.configure(bg='#3374FF') #blauw
+        self.ui = UIDispatcher(self.root) #UI updates vanuit de async loop gaan via deze wachtrij naar de Tk thread
 
     def setup_frames(self):
         """Frames opzetten"""
@@ -1296,6 +3654,80 @@ class App:
         self.lijst_frame = LijstFrame(self.frame, self)
         self.details_frame = DetailsFrame(self.frame, self)
 
+    def restore_snapshots(self):
+        """Laad de laatst opgeslagen data uit de lokale opslag in de cache, als verlopen data, zodat de lijst direct gevuld is.
+        show_onderdelen toont deze data meteen en haalt op de achtergrond de actuele data op"""
+        for endpoint_key in SNAPSHOT_CONFIG['endpoints']:
+            snapshot = self.store.load(endpoint_key)
+            if snapshot:
+                data, saved_at, cursor = snapshot
+                self.api_client.restore(endpoint_key, data, cursor)
+                print(f"{endpoint_key} geladen uit lokale opslag (van {datetime.fromtimestamp(saved_at).strftime('%d-%m-%Y %H:%M')})")
+        if self.api_client.cache.get('subjects') is not None:
+            self.handle_async_button(self.show_onderdelen(), slot='nav')
+        self.handle_async_button(self.save_queue.start()) #Wijzigingen die bij het afsluiten (of een crash) nog niet waren verstuurd
+
+    def on_save_status(self, question_id, status, detail=None):
+        """Voortgang van de save queue (draait in de event loop): toon hem bij de vraag, en werk na het opslaan de dubbele vragen index bij.
+        De lijst is bij het opslaan al bijgewerkt (zie DetailsFrame.update_question), een geweigerde wijziging wordt teruggedraaid"""
+        self.ui.post(self.details_frame.show_save_status, question_id, status, detail)
+        if status == 'saved':
+            question_data = Question(**detail)
+            handle = self.optimistic.pop(question_id, None)
+            # Opnieuw verwerken als de wijziging nog niet in de lijst stond (bijv. afgespeeld uit het journal), of als een revalidatie
+            # op de achtergrond de lokale wijziging intussen heeft overschreven. Een nieuwere wijziging in de wachtrij gaat voor
+            stale = handle is None or self.api_client.cache.get(handle[0]) is not handle[2]
+            if stale and question_id not in self.save_queue.pending:
+                if self.apply_question_changes(question_data.parent, changes=[question_data]) is None:
+                    self.handle_async_button(self.refresh_lijst(self.question_endpoint(question_data.parent))) #Niet lokaal te verwerken, dan opnieuw ophalen
+            self.loop.run_in_executor(None, self.duplicates.add, (question_data.parent, question_data.id), question_data)
+        elif status == 'failed':
+            self.handle_async_button(self.rollback_question_changes(self.optimistic.pop(question_id, None)))
+
+    #! Lokale wijzigingen, de lijst wordt na een wijziging direct bijgewerkt in plaats van opnieuw opgehaald
+    def question_endpoint(self, parent):
+        """Bij welke lijst (gecachte GET) een hoofdstuk hoort, elk examen onderdeel begint met 'Examen' (zie exam_chapter_title)"""
+        return 'exams' if parent.startswith('Examen') else 'subjects'
+
+    def apply_question_changes(self, parent, changes=(), deleted=()):
+        """Verwerk gewijzigde, nieuwe en verwijderde vragen van een hoofdstuk direct in de gecachte lijst en de Treeview (in de event loop).
+        Geeft een handle terug voor rollback_question_changes, of None als de lijst niet in de cache staat"""
+        endpoint_key = self.question_endpoint(parent)
+        applied = self.api_client.apply_local(endpoint_key, changes, deleted)
+        if applied is None:
+            return None
+        self.render_cached(endpoint_key)
+        return (endpoint_key, *applied)
+
+    async def rollback_question_changes(self, handle):
+        """Draai apply_question_changes terug na een mislukte wijziging, kan dat niet meer dan wordt de lijst opnieuw opgehaald"""
+        if handle is None:
+            return
+        endpoint_key, previous, applied = handle
+        if self.api_client.rollback_local(endpoint_key, previous, applied):
+            self.render_cached(endpoint_key)
+        else:
+            await self.refresh_lijst(endpoint_key)
+
+    async def refresh_lijst(self, endpoint_key):
+        """Haal een lijst opnieuw op als de gecachte data niet meer klopt (bijv. een wijziging die niet lokaal te verwerken was).
+        De cache wordt altijd ongeldig, opnieuw tekenen alleen als die lijst nog wordt getoond"""
+        self.api_client.cache.invalidate(endpoint_key)
+        if self.current_lijst == endpoint_key:
+            await {'subjects': self.show_onderdelen, 'exams': self.show_exams, 'feedback': self.show_feedback}[endpoint_key]()
+
+    def render_cached(self, endpoint_key):
+        """Toon de gecachte data van een lijst opnieuw, als die lijst nog wordt getoond. De Treeview wordt bijgewerkt, niet opnieuw opgebouwd"""
+        data = self.api_client.cache.get(endpoint_key)
+        if data is None or self.current_lijst != endpoint_key:
+            return
+        items = {'subjects': self.format_subjects, 'exams': self.format_exams, 'feedback': self.format_feedback}[endpoint_key](data)
+
+        def if_current(items):
+            if self.current_lijst == endpoint_key: # Gecontroleerd op de Tk thread, de gebruiker kan intussen naar een andere lijst zijn gegaan
+                self.lijst_frame.update_lijst(items, False)
+        self.ui.post(if_current, items, key='lijst')
+
     # Async loop setup, Maak een aparte loop, in een aparte thread, voor async functies, zodat de GUI niet vastloopt 
     def setup_async_loop(self):
         """Maak de async event loop aan"""
@@ -1303,77 +3735,127 @@ class App:
         asyncio.set_event_loop(self.loop)
         self.loop_thread = threading.Thread(target=self._run_event_loop, daemon=True)
         self.loop_thread.start()
+        self.slot_futures = {} # Slot -> future van de laatst gestarte coroutine in dat slot, zie handle_async_button
+        self.slot_generations = {} # Slot -> generatie, verhoogd bij elke nieuwe coroutine in het slot
 
     def _run_event_loop(self):
         """Run de async event loop"""
         asyncio.set_event_loop(self.loop)
         self.loop.run_forever()
 
-    def handle_async_button(self, coro):
-        """Async knop, voert de coroutine (async functie) in een aparte thread uit zodat de GUI niet vastloopt"""
-        asyncio.run_coroutine_threadsafe(coro, self.loop)
+    def handle_async_button(self, coro, slot=None):
+        """Async knop, voert de coroutine (async functie) in een aparte thread uit zodat de GUI niet vastloopt, en geeft de future terug.
+        Met een slot (bijv. 'nav') wint de laatste: de vorige coroutine in hetzelfde slot wordt gecanceld (ophalen, parsen en tekenen)
+        en zijn UI updates die nog in de wachtrij staan worden niet meer uitgevoerd (zie post_nav)"""
+        if slot is None:
+            return asyncio.run_coroutine_threadsafe(coro, self.loop)
+        generation = self.claim_slot(slot)
+        future = asyncio.run_coroutine_threadsafe(self.run_in_slot(coro, slot, generation), self.loop)
+        self.slot_futures[slot] = future
+        return future
+
+    def claim_slot(self, slot):
+        """Start een nieuwe generatie in het slot en cancel de coroutine die er nog in loopt"""
+        previous = self.slot_futures.pop(slot, None)
+        self.slot_generations[slot] = self.slot_generations.get(slot, 0) + 1
+        if previous is not None and not previous.done():
+            previous.cancel() # Wordt doorgegeven aan de task in de event loop
+        if slot == 'nav': # Een andere lijst, dus ook een ander hoofdstuk: stop het vooruit laden van afbeeldingen
+            self.loop.call_soon_threadsafe(self.prefetcher.stop)
+        return self.slot_generations[slot]
+
+    async def run_in_slot(self, coro, slot, generation):
+        """Voer de coroutine uit met de navigatie in de context, ook taken die de coroutine start (bijv. verversen op de achtergrond) erven deze"""
+        CURRENT_NAV.set((slot, generation))
+        return await coro
+
+    def post_nav(self, callback, *args, key=None):
+        """Post een UI update vanuit een navigatie, die bij het uitvoeren wordt overgeslagen als er inmiddels een nieuwere navigatie is gestart"""
+        nav = CURRENT_NAV.get()
+        if nav is None: # Niet vanuit een slot gestart (bijv. verversen na opslaan)
+            self.ui.post(callback, *args, key=key)
+            return
+        slot, generation = nav
+
+        def if_current(*args):
+            if self.slot_generations.get(slot) == generation: # Gecontroleerd op de Tk thread, vlak voor het tekenen
+                callback(*args)
+        self.ui.post(if_current, *args, key=key)
 
     #! Navigatie knoppen - Aangeroepen vanuit NavigatieBalk class
     async def show_onderdelen(self):
         """Onderdelen ophalen van de API en tonen in de lijst"""
-        self.lijst_frame.update_lijst([], loading=True) #Loading indicator aanzetten
-        try:
-            data = await self.api_client.get('subjects')
-            items = [self.format_subject_data(subject) for subject in data['subjects']] # Pas de data aan naar de verwachte structuur van de lijst
-            self.lijst_frame.update_lijst(items, loading=False) #Loading indicator uitzetten en lijst tonen
-        except Exception as e:
-            self.show_error(f"Fout b fetching subjects: {str(e)}")
-            self.lijst_frame.update_lijst([], loading=False) #Loading indicator uitzetten bij fout en lege lijst tonen
+        await self.show_lijst('subjects', self.format_subjects, "Fout b fetching subjects")
 
     async def show_exams(self):
         """Examens ophalen van de API en tonen in de lijst"""
-        self.lijst_frame.update_lijst([], loading=True) #Loading indicator aanzetten
-        try:
-            data = await self.api_client.get('exams')
-
-            # De data vanuit de server is eigenlijk 3 arrays voor elk onderdeel in het examen (gevaarherkenning, inzicht, kennis)
-            # Maar we maken hier 3 aparte items in de lijst voor elk onderdeel dus je krijgt Examen 1 - Gevaarherkenning, Examen 1 - Inzicht, Examen 1 - Kennis etc.
-            # Idealiter zou dit al gedaan moeten zijn op de server side, maar dit werkt ook
-            exams = []
-            for exam in data['exams']:
-                exam_categories = []
-                
-                categories = {
-                    'gevaarherkenning': 'Gevaarherkenning',
-                    'inzicht': 'Inzicht',
-                    'kennis': 'Kennis'
-                }
-                
-                for category, display_name in categories.items():
-                    if category in exam and exam[category].get('questions'):
-                        category_questions = exam[category]['questions']
-                        exam_categories.append({
-                            'titel': f"Examen {exam['id']} - {display_name}", #Examen 1 - Gevaarherkenning, etc.
-                            'vragen': [self.format_question_data(i, question) # Pas de data aan naar de verwachte structuur van de lijst, en details frame
-                                     for i, question in enumerate(category_questions)]
-                        })
-                
-                exams.extend(exam_categories)
-            
-            self.lijst_frame.update_lijst(exams, loading=False) #Loading indicator uitzetten en lijst updaten
-        except Exception as e:
-            self.show_error(f"Error fetching exams: {str(e)}")
-            self.lijst_frame.update_lijst([], loading=False)
+        await self.show_lijst('exams', self.format_exams, "Error fetching exams")
 
     def show_rapporten(self):
         """Rapporten ophalen van de API en tonen in de lijst"""
-        items = ["Export feedback"] #Alleen export feedback is beschikbaar, helaas had ik geen tijd meer om de andere rapporten te implementeren
-        self.lijst_frame.update_lijst(items, loading=False) #Lijst tonen
+        self.current_lijst = 'rapporten'
+        self.claim_slot('nav') #Een lijst die nog wordt opgehaald is niet meer nodig
+        items = ["Export feedback", "Dubbele vragen"]
+        self.ui.post(self.lijst_frame.update_lijst, items, False, key='lijst') #Lijst tonen, via de wachtrij zodat een oudere update van een andere lijst vervalt
+
+    async def show_duplicates_report(self):
+        """Zoek (bijna) dubbele vragen in de onderdelen en examens en toon ze in het details frame.
+        De index wordt bijgewerkt in plaats van opnieuw opgebouwd, alleen de eerste keer kost het echt tijd (in een worker thread)"""
+        self.post_nav(self.details_frame.show_message, "🔄 Dubbele vragen zoeken...", key='details')
+        try:
+            #Via de cache: gecachte data direct (en op de achtergrond verversen), anders ophalen met delta sync waar dat kan
+            subjects, exams = await asyncio.gather(self.api_client.get_cached('subjects'), self.api_client.get_cached('exams'))
+            await asyncio.to_thread(self.duplicates.sync, self.format_subjects(subjects) + self.format_exams(exams))
+            pairs = await asyncio.to_thread(self.duplicates.pairs, DUPLICATES_CONFIG['min_threshold'])
+            self.post_nav(self.details_frame.show_duplicates_ui, pairs, key='details')
+        except Exception as e:
+            self.show_error(f"Fout bij het zoeken naar dubbele vragen: {str(e)}")
 
     async def show_feedback(self):
         """Feedback ophalen van de API en tonen in de lijst"""
-        self.lijst_frame.update_lijst([], loading=True) #Loading indicator aanzetten
+        await self.show_lijst('feedback', self.format_feedback, "Error fetching feedback")
+
+    async def show_lijst(self, endpoint_key, format_items, error_message):
+        """Haal de data op via de cache en toon deze in de lijst. Gecachte data wordt direct getoond (zonder loading indicator),
+        als de data op de achtergrond is ververst en veranderd, wordt de lijst opnieuw getoond"""
+        self.current_lijst = endpoint_key
+
+        def render(data): #Draait op de loop thread, het formatteren gebeurt hier en alleen het tekenen op de Tk thread
+            if self.current_lijst == endpoint_key: #Niet tekenen als de gebruiker inmiddels naar een andere lijst is gegaan
+                self.post_nav(self.lijst_frame.update_lijst, format_items(data), False, key='lijst')
+
+        if self.api_client.cache.get(endpoint_key) is None and endpoint_key in STREAM_ARRAYS and not self.api_client.can_sync(endpoint_key):
+            await self.stream_lijst(endpoint_key, format_items, error_message)
+            return
+
+        if self.api_client.cache.get(endpoint_key) is None:
+            self.post_nav(self.lijst_frame.update_lijst, [], True, key='lijst') #Loading indicator alleen als er niks in de cache staat
         try:
-            data = await self.api_client.get('feedback')
-            self.lijst_frame.update_lijst([data.get('feedback', [])], loading=False) #Loading indicator uitzetten en lijst tonen
+            data = await self.api_client.get_cached(endpoint_key, on_change=render)
+            render(data) # Pas de data aan naar de verwachte structuur van de lijst en toon de lijst
         except Exception as e:
-            self.show_error(f"Error fetching feedback: {str(e)}")
-            self.lijst_frame.update_lijst([], loading=False)
+            self.show_error(f"{error_message}: {str(e)}")
+            self.post_nav(self.lijst_frame.update_lijst, [], False, key='lijst') #Loading indicator uitzetten bij fout en lege lijst tonen
+
+    async def stream_lijst(self, endpoint_key, format_items, error_message):
+        """Vul de lijst terwijl de data binnenkomt, elk onderdeel/examen/feedback item wordt getoond zodra het geparsed is"""
+        array_key = STREAM_ARRAYS[endpoint_key]
+        self.post_nav(self.lijst_frame.update_lijst, [], True, key='lijst') #Loading indicator tot het eerste item binnen is
+        items = []
+        try:
+            async for raw_item in self.api_client.stream_items(endpoint_key, array_key):
+                if self.current_lijst != endpoint_key: #De gebruiker is naar een andere lijst gegaan
+                    continue
+                items.extend(format_items({array_key: [raw_item]}))
+                # Steeds dezelfde groeiende lijst: de updates binnen één frame worden samengevoegd, update_lijst kopieert hem één keer per frame
+                # en reconcile voegt alleen de nieuwe rijen toe
+                self.post_nav(self.lijst_frame.update_lijst, items, False, key='lijst')
+            if not items and self.current_lijst == endpoint_key: #Lege array
+                self.post_nav(self.lijst_frame.update_lijst, [], False, key='lijst')
+        except Exception as e:
+            self.show_error(f"{error_message}: {str(e)}")
+            if not items:
+                self.post_nav(self.lijst_frame.update_lijst, [], False, key='lijst')
 
     #! Update detail frames - Aangeroepen wanneer je een item selecteert in de lijst
     def show_vraag_details(self, hoofdstuk, vraag_data):
@@ -1384,51 +3866,74 @@ class App:
         """Toon de feedback details in het details frame"""
         self.details_frame.show_feedback_ui(feedback_data)
 
+    def show_bulk_details(self, vragen, feedback):
+        """Toon de bulk acties voor meerdere geselecteerde vragen of feedback items in het details frame"""
+        chapters = [item['titel'] for item in self.lijst_frame.items if isinstance(item, dict)] #Verplaatsen kan binnen de lijst die nu wordt getoond
+        self.details_frame.show_bulk_ui(vragen, feedback, chapters)
+
     async def show_rapport_feedback_details(self):
         """Toon info van de csv bestand over de feedback in het details frame"""
-        self.lijst_frame.update_lijst([], loading=True) #Loading indicator aanzetten, maar eigenlijk zou de details frame moeten laden
+        self.post_nav(self.lijst_frame.update_lijst, [], True, key='lijst') #Loading indicator aanzetten, maar eigenlijk zou de details frame moeten laden
         try:
             data = await self.api_client.get('feedback')
             if data:
-                self.lijst_frame.update_lijst([], loading=False) #Loading indicator uitzetten, maar de lijst is leeg, maar eigenlijk zou de details frame moeten laden
-                self.details_frame.show_feedback_rapport_ui(data.get('feedback', []))
+                self.post_nav(self.lijst_frame.update_lijst, [], False, key='lijst') #Loading indicator uitzetten, maar de lijst is leeg, maar eigenlijk zou de details frame moeten laden
+                self.post_nav(self.details_frame.show_feedback_rapport_ui, data.get('feedback', []), key='details')
         except Exception as e:
             self.show_error(f"Error exporting feedback: {str(e)}")
 
     #! Data Formatting Methods
     # Idealiter zou dit niet nodig zijn, maar de data die de API terug geeft is niet helemaal in de verwachte structuur en ik heb geen tijd meer om deze aan te passen
+    def format_subjects(self, data):
+        """Format de response van getAllSubjects voor de lijst"""
+        return [self.format_subject_data(subject) for subject in data['subjects']]
+
+    def format_feedback(self, data):
+        """Format de response van getAllFeedback voor de lijst, alle feedback items zijn samen één item"""
+        return [data.get('feedback', [])]
+
+    def format_exams(self, data):
+        """Format de response van getAllExams voor de lijst"""
+        # De data vanuit de server is eigenlijk 3 arrays voor elk onderdeel in het examen (gevaarherkenning, inzicht, kennis)
+        # Maar we maken hier 3 aparte items in de lijst voor elk onderdeel dus je krijgt Examen 1 - Gevaarherkenning, Examen 1 - Inzicht, Examen 1 - Kennis etc.
+        # Idealiter zou dit al gedaan moeten zijn op de server side, maar dit werkt ook
+        exams = []
+        for exam in data['exams']:
+            exam_categories = []
+            
+            for category, display_name in EXAM_CATEGORIES.items():
+                if category in exam and exam[category].get('questions'):
+                    category_questions = exam[category]['questions']
+                    exam_categories.append({
+                        'titel': exam_chapter_title(exam['id'], display_name), #Examen 1 - Gevaarherkenning, etc.
+                        'vragen': [self.format_question_data(question) # Pas de data aan naar de verwachte structuur van de lijst, en details frame
+                                 for question in category_questions]
+                    })
+            
+            exams.extend(exam_categories)
+        return exams
+
     def format_subject_data(self, subject):
         """Format subject data voor de lijst"""
         return {
             'titel': subject['title'],
-            'vragen': [self.format_question_data(i, question) 
-                      for i, question in enumerate(subject.get('questions', []))]
+            'vragen': [self.format_question_data(question) for question in subject.get('questions', [])]
         }
     
     # Gebruikt in show_onderdelen en show_exams
-    def format_question_data(self, index, question):
-        """Format question data voor de lijst"""
-        return {
-            'titel': f'Vraag {index+1}',
-            'vraag_tekst': question['question'],
-            'type': question['type'],
-            'opties': question.get('answers', []) if question.get('type') == 'multiple_choice' else [],
-            'antwoord': question.get('correctAnswer', ''),
-            'uitleg': question.get('explanation', ''),
-            'afbeelding': question.get('image', ''),
-            'context': question.get('context', ''),
-            'imageOptions': question.get('imageOptions', []),
-            'terms': question.get('terms', {}),
-            'correctPositions': question.get('correctPositions', []),
-            'correctAnswer': question.get('correctAnswer', 0),
-            'id': question['id']
-        }
+    def format_question_data(self, question):
+        """Format question data voor de lijst, als een Question struct (de lijst en het details frame lezen de velden als attributen).
+        De struct uit de cache wordt niet aangepast, anders is hij niet meer gelijk aan dezelfde vraag in een nieuwe response (zie APIClient._revalidate).
+        Het hoofdstuk van een vraag is de titel van het item in de lijst, niet vraag.parent"""
+        if not isinstance(question, Question): # Uit de response, een eigen wijziging is al een struct
+            question = Question(**question)
+        return question
     
     #! Error handling
     def show_error(self, message):
-        """Foutmelding tonen in een popup"""
+        """Foutmelding tonen in een popup, kan vanuit de async loop worden aangeroepen (gaat via de UI wachtrij)"""
         print(f"Error: {message}")
-        tk.messagebox.showerror("FOUT:", message)
+        self.ui.post(tk.messagebox.showerror, "FOUT:", message)
 
     #! Applicatie start en cleanup
     def run(self):
@@ -1441,9 +3946,19 @@ class App:
     def cleanup(self):
         """Cleanup, dit is nodig om de async loop te stoppen en de thread te joinen zodat de app niet crasht bij het sluiten"""
         # Used in: run method
+        # Sluit eerst de gedeelde sessie in de event loop, anders blijven er connecties open staan
+        try:
+            asyncio.run_coroutine_threadsafe(self.api_client.close(), self.loop).result(timeout=5)
+        except Exception as e:
+            print(f"Fout bij het sluiten van de API sessie: {e}")
+        self.loop.call_soon_threadsafe(self.image_loader.close)
         self.loop.call_soon_threadsafe(self.loop.stop)
         self.loop_thread.join()
+        self.save_queue.close() #Wat nog niet is verstuurd staat in het journal
         self.loop.close()
+        self.store.close()
+        self.image_cache.close()
+        self.ui.close()
 
 if __name__ == "__main__":
     app = App()
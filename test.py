@@ -12,12 +12,18 @@ Gebruik:
 """
 
 import pytest
-from unittest.mock import patch, MagicMock
+import asyncio
+import json
+import io
+import threading
+from unittest.mock import patch, MagicMock, AsyncMock
 import tkinter as tk
 from datetime import datetime
-from main import APIClient, App, QuestionTypeDialog, QUESTION_TYPES
+from main import APIClient, APIError, SnapshotStore, ImageCache, ImageLoader, ImagePrefetcher, JSONArrayStream, JSONCodec, Question, SaveQueue, merge_exam_changes, SearchIndex, DuplicateIndex, to_raw, App, DetailsFrame, LijstFrame, LiveImages, UIDispatcher, QuestionTypeDialog, QUESTION_TYPES, LIJST_CONFIG, IMAGE_CACHE_CONFIG
 import os
 from dotenv import load_dotenv
+from aiohttp.test_utils import TestServer
+from backend.stand_in import StandInBackend, create_stand_in_app, API_KEY as STAND_IN_KEY
 
 # Laad environment variables
 load_dotenv()
@@ -48,14 +54,11 @@ class TestAPIClient:
         """Test basis GET aanvraag"""
         client = APIClient(API_CONFIG['URL'], API_CONFIG['KEY'])
         
-        async def mock_json():
-            return {"data": "test"}
-            
-        mock_response.json = mock_json
+        mock_response.read = AsyncMock(return_value=b'{"data": "test"}')
         mock_response.__aenter__.return_value = mock_response
         
         with patch('aiohttp.ClientSession') as mock_session:
-            mock_session.return_value.__aenter__.return_value.get = MagicMock(return_value=mock_response)
+            mock_session.return_value.get = MagicMock(return_value=mock_response)
             result = await client.get('subjects')
             assert result == {"data": "test"}
 
@@ -64,17 +67,811 @@ class TestAPIClient:
         """Test helloWorld endpoint"""
         client = APIClient(API_CONFIG['URL'], API_CONFIG['KEY'])
         
-        async def mock_json():
-            return {"message": "Hello, World!"}
-            
-        mock_response.json = mock_json
+        mock_response.read = AsyncMock(return_value=b'{"message": "Hello, World!"}')
         mock_response.__aenter__.return_value = mock_response
         
         with patch('aiohttp.ClientSession') as mock_session:
-            mock_session.return_value.__aenter__.return_value.get = MagicMock(return_value=mock_response)
+            mock_session.return_value.get = MagicMock(return_value=mock_response)
             result = await client.get('helloWorld')
             assert result == {"message": "Hello, World!"}
 
+    @pytest.mark.asyncio
+    async def test_session_hergebruik(self, mock_response):
+        """Test dat meerdere requests dezelfde sessie (connection pool) gebruiken"""
+        client = APIClient(API_CONFIG['URL'], API_CONFIG['KEY'], pool_config={'limit_per_host': 2})
+
+        mock_response.read = AsyncMock(return_value=b'{"data": "test"}')
+
+        with patch('aiohttp.ClientSession') as mock_session:
+            mock_session.return_value.closed = False
+            mock_session.return_value.get = MagicMock(return_value=mock_response)
+            mock_session.return_value.close = AsyncMock()
+            await client.get('subjects')
+            await client.get('helloWorld')
+            assert mock_session.call_count == 1
+            connector = mock_session.call_args.kwargs['connector']
+            assert connector.limit_per_host == 2
+
+            await client.close()
+            mock_session.return_value.close.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_coalescing(self):
+        """Test dat gelijktijdige identieke GETs één request delen"""
+        client = APIClient(API_CONFIG['URL'], API_CONFIG['KEY'])
+        calls = []
+
+        async def trage_request(endpoint_key, method, data=None):
+            calls.append(endpoint_key)
+            await asyncio.sleep(0.01)
+            return {"subjects": []}
+
+        with patch.object(client, '_request', side_effect=trage_request):
+            results = await asyncio.gather(*(client.get('subjects') for _ in range(3)), client.get('exams'))
+
+        assert results[:3] == [{"subjects": []}] * 3
+        assert calls == ['subjects', 'exams']
+        assert client.stats['coalesced'] == 2
+        assert client._inflight == {}
+
+    @pytest.mark.asyncio
+    async def test_cancel_laatste_wachtende(self):
+        """Test dat een gedeelde GET pas stopt als alle wachtenden zijn gecanceld"""
+        client = APIClient("http://api.test", "key")
+        started = asyncio.Event()
+        cancelled = asyncio.Event()
+
+        async def slow_send(endpoint_key, method, data=None, params=None):
+            started.set()
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        with patch.object(client, '_send', side_effect=slow_send):
+            first = asyncio.ensure_future(client.get('feedback'))
+            second = asyncio.ensure_future(client.get('feedback'))
+            await started.wait()
+            first.cancel()
+            await asyncio.sleep(0)
+            assert not cancelled.is_set() #De tweede wacht er nog op
+            second.cancel()
+            await asyncio.wait_for(cancelled.wait(), 1)
+        await client.close()
+
+    @pytest.mark.asyncio
+    async def test_retry_bij_cold_start(self):
+        """Test dat een GET na een 503 opnieuw wordt geprobeerd"""
+        client = APIClient(API_CONFIG['URL'], API_CONFIG['KEY'], retry_config={'base_delay': 0})
+        responses = [APIError("API Fout: 503, cold start", status=503, retryable=True), {"subjects": []}]
+
+        async def send(endpoint_key, method, data=None, params=None):
+            result = responses.pop(0)
+            if isinstance(result, Exception):
+                raise result
+            return result
+
+        with patch.object(client, '_send', side_effect=send):
+            assert await client.get('subjects') == {"subjects": []}
+        assert client.stats['retries'] == 1
+
+    @pytest.mark.asyncio
+    async def test_geen_retry_bij_post(self):
+        """Test dat create_question (POST) nooit opnieuw wordt verstuurd"""
+        client = APIClient(API_CONFIG['URL'], API_CONFIG['KEY'], retry_config={'base_delay': 0})
+        send = AsyncMock(side_effect=APIError("API Fout: 503, cold start", status=503, retryable=True))
+
+        with patch.object(client, '_send', send):
+            with pytest.raises(APIError) as error:
+                await client.post('create_question', {'question': 'Test'})
+        assert send.await_count == 1
+        assert error.value.status == 503
+        assert str(error.value) == "API Fout: 503, cold start" #Niet nog een keer ingepakt
+
+    @pytest.mark.asyncio
+    async def test_retry_delete_al_verwijderd(self):
+        """Test dat een 404 bij een herhaalde DELETE een fout blijft in de client, en dat het verwijderen van een vraag uit de lijst hem als gelukt telt"""
+        client = APIClient(API_CONFIG['URL'], API_CONFIG['KEY'], retry_config={'base_delay': 0})
+        send = AsyncMock(side_effect=[asyncio.TimeoutError(), APIError("API Fout: 404, Question not found", status=404)])
+        with patch.object(client, '_send', send):
+            with pytest.raises(APIError) as error:
+                await client.delete('delete_question', {'id': 'q1'})
+        assert error.value.status == 404 and error.value.attempts == 2
+
+        app = MagicMock()
+        app.api_client = client
+        app.apply_question_changes.return_value = None
+        app.refresh_lijst = AsyncMock()
+        app.rollback_question_changes = AsyncMock()
+        details = DetailsFrame.__new__(DetailsFrame)
+        details.app = app
+        send = AsyncMock(side_effect=[asyncio.TimeoutError(), APIError("API Fout: 404, Question not found", status=404)])
+        with patch.object(client, '_send', send):
+            await details.delete_question_request('q1', 'Voorrang')
+        app.duplicates.remove_question.assert_called_once_with('q1')
+        app.ui.post.assert_not_called() #Geen foutmelding
+
+        with patch.object(client, '_send', AsyncMock(side_effect=APIError("API Fout: 404, Question not found", status=404))):
+            await details.delete_question_request('q1', 'Voorrang') #Bij de eerste poging is een 404 wel een fout
+        app.rollback_question_changes.assert_awaited_once()
+        assert app.ui.post.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_deadline(self):
+        """Test dat een aanroep stopt na de totale deadline, ook als er nog pogingen over zijn"""
+        client = APIClient(API_CONFIG['URL'], API_CONFIG['KEY'], retry_config={'deadline': 0.05, 'base_delay': 0})
+
+        async def hangt(endpoint_key, method, data=None, params=None):
+            await asyncio.sleep(1)
+
+        with patch.object(client, '_send', side_effect=hangt):
+            with pytest.raises(APIError) as error:
+                await client.get('subjects')
+        assert error.value.retryable
+
+    @pytest.mark.asyncio
+    async def test_hedged_get(self):
+        """Test dat een trage GET een tweede request start, en dat de snelste wint"""
+        client = APIClient(API_CONFIG['URL'], API_CONFIG['KEY'], hedge_config={'enabled': True, 'min_samples': 1})
+        client._record_latency('subjects', 0.01)
+        delays = [1, 0]
+
+        async def send(endpoint_key, method, data=None, params=None):
+            delay = delays.pop(0)
+            await asyncio.sleep(delay)
+            return {"delay": delay}
+
+        with patch.object(client, '_send', side_effect=send):
+            assert await client.get('subjects') == {"delay": 0}
+        assert client.stats['hedged'] == 1
+
+    @pytest.mark.asyncio
+    async def test_stale_while_revalidate(self):
+        """Test dat verlopen cache data direct wordt teruggegeven en op de achtergrond wordt ververst"""
+        client = APIClient(API_CONFIG['URL'], API_CONFIG['KEY'])
+        client.cache.ttls = {'feedback': 0} # Alles is direct verlopen
+        client.cache.set('feedback', {"feedback": ["oud"]})
+        veranderd = []
+
+        with patch.object(client, '_request', AsyncMock(return_value={"feedback": ["nieuw"]})):
+            result = await client.get_cached('feedback', on_change=veranderd.append)
+            assert result == {"feedback": ["oud"]}
+            await asyncio.gather(*client._background) # Wacht op de achtergrond revalidatie
+
+        assert veranderd == [{"feedback": ["nieuw"]}]
+        assert client.cache.get('feedback') == {"feedback": ["nieuw"]}
+
+    @pytest.mark.asyncio
+    async def test_revalidatie_zonder_wijziging(self):
+        """Test dat een revalidatie met dezelfde data de lijst niet opnieuw laat tekenen, ook nadat de gecachte data is geformatteerd"""
+        client = APIClient(API_CONFIG['URL'], API_CONFIG['KEY'])
+        codec = JSONCodec('json')
+        body = json.dumps({"subjects": [{"id": "s1", "title": "Voorrang", "questions": [
+            {"id": "q1", "question": "Wie heeft voorrang?", "type": "open", "correctAnswer": "Rechts"}]}]}).encode('utf-8')
+        client.cache.ttls = {'subjects': 0}
+        client.cache.set('subjects', codec.loads(body))
+        App.__new__(App).format_subjects(client.cache.get('subjects')) # Zoals show_lijst doet voor het tekenen
+        veranderd = []
+
+        with patch.object(client, '_request', AsyncMock(side_effect=lambda *args, **kwargs: codec.loads(body))):
+            await client.get_cached('subjects', on_change=veranderd.append)
+            await asyncio.gather(*client._background)
+
+        assert veranderd == []
+
+    @pytest.mark.asyncio
+    async def test_cache_invalidatie(self):
+        """Test dat een wijziging de bijbehorende gecachte GETs ongeldig maakt"""
+        client = APIClient(API_CONFIG['URL'], API_CONFIG['KEY'])
+        client.cache.set('subjects', {"subjects": []})
+        client.cache.set('feedback', {"feedback": []})
+
+        with patch.object(client, '_request', AsyncMock(return_value={"status": "success"})):
+            await client.put('update_question', {'id': 'q1'})
+
+        assert client.cache.get('subjects') is None
+        assert client.cache.get('feedback') == {"feedback": []}
+
+    @pytest.mark.asyncio
+    async def test_bulk(self):
+        """Test dat een bulk actie maximaal concurrency requests tegelijk doet, per item het resultaat of de fout teruggeeft en de voortgang meldt"""
+        client = APIClient(API_CONFIG['URL'], API_CONFIG['KEY'])
+        client.cache.set('subjects', {"subjects": []})
+        lopend = []
+        piek = 0
+        voortgang = []
+
+        async def request(endpoint_key, method, data=None):
+            nonlocal piek
+            lopend.append(data['id'])
+            piek = max(piek, len(lopend))
+            await asyncio.sleep(0.01)
+            lopend.remove(data['id'])
+            if data['id'] == 'q3':
+                raise APIError("Question not found", status=404)
+            return {"status": "success"}
+
+        with patch.object(client, '_request', request):
+            results = await client.bulk('delete_question', 'delete', [{'id': f'q{i}'} for i in range(6)], concurrency=2,
+                                        on_progress=lambda done, total: voortgang.append((done, total)))
+
+        assert piek == 2
+        assert [isinstance(result, APIError) for result in results] == [False, False, False, True, False, False]
+        assert voortgang[-1] == (6, 6) and len(voortgang) == 6
+        assert client.cache.get('subjects') is None # Eén keer ongeldig gemaakt aan het eind
+
+class TestImageCache:
+    """Test de cache voor de afbeeldingen van vragen en opties"""
+
+    @staticmethod
+    def png(width=400, height=300):
+        from PIL import Image
+        buffer = io.BytesIO()
+        Image.new('RGB', (width, height), 'red').save(buffer, format='PNG')
+        return buffer.getvalue()
+
+    @pytest.mark.asyncio
+    async def test_geheugen_en_schijf(self, tmp_path):
+        """Test dat een afbeelding één keer wordt gedownload, daarna uit het geheugen komt, en na een herstart via een conditional GET van schijf"""
+        client = MagicMock()
+        client.fetch_url = AsyncMock(return_value=(200, self.png(), '"v1"', None))
+        cache = ImageCache(client, str(tmp_path))
+        first = await cache.get('https://example.com/bord.png', (100, 100))
+        again = await cache.get('https://example.com/bord.png', (100, 100))
+        assert first.size == (100, 100) and again is first
+        assert client.fetch_url.await_count == 1 and cache.stats['memory_hits'] == 1
+
+        client.fetch_url = AsyncMock(return_value=(304, None, None, None))
+        restarted = ImageCache(client, str(tmp_path), revalidate_after=0) #Nieuwe sessie, afbeelding op schijf moet gecontroleerd worden
+        image = await restarted.get('https://example.com/bord.png', (100, 100))
+        assert image.size == (100, 100)
+        assert client.fetch_url.await_args.kwargs['etag'] == '"v1"'
+        assert restarted.stats['not_modified'] == 1 and restarted.stats['downloads'] == 0
+
+    @pytest.mark.asyncio
+    async def test_decode_in_worker_thread(self):
+        """Test dat een grote JPEG met draft in een worker thread wordt gedecodeerd, niet op de event loop"""
+        from PIL import Image
+        buffer = io.BytesIO()
+        Image.new('RGB', (2400, 1800), 'blue').save(buffer, format='JPEG')
+        client = MagicMock()
+        client.fetch_url = AsyncMock(return_value=(200, buffer.getvalue(), None, None))
+        cache = ImageCache(client, None)
+        threads = []
+        decode = cache.decode
+        cache.decode = lambda body, size: (threads.append(threading.current_thread()), decode(body, size))[1]
+
+        image = await cache.get('https://example.com/foto.jpg', (200, 200))
+        assert image.size == (200, 200)
+        assert cache.stats['drafted'] == 1
+        assert threads and threads[0] is not threading.current_thread()
+        cache.close()
+
+    @pytest.mark.asyncio
+    async def test_geheugen_budget(self):
+        """Test dat de minst recent gebruikte afbeeldingen uit het geheugen gaan als het budget op is"""
+        client = MagicMock()
+        client.fetch_url = AsyncMock(return_value=(200, self.png(), None, None))
+        cache = ImageCache(client, None, memory_bytes=100 * 100 * 3 * 2) #Ruimte voor twee afbeeldingen
+        for name in ['a', 'b', 'c']:
+            await cache.get(f'https://example.com/{name}.png', (100, 100))
+        assert cache.memory_used <= cache.memory_bytes
+        assert cache.stats['evictions'] == 1
+        await cache.get('https://example.com/a.png', (100, 100))
+        assert client.fetch_url.await_count == 4 #a was eruit gegaan
+
+    @pytest.mark.asyncio
+    async def test_vooruit_laden(self):
+        """Test dat de afbeeldingen van de buren met maximaal 'concurrency' tegelijk worden geladen en stoppen bij een ander hoofdstuk"""
+        busy = 0
+        peak = 0
+        async def fetch_url(url, etag=None, last_modified=None):
+            nonlocal busy, peak
+            busy += 1
+            peak = max(peak, busy)
+            await asyncio.sleep(0.01)
+            busy -= 1
+            return 200, self.png(), None, None
+        client = MagicMock()
+        client.fetch_url = fetch_url
+        cache = ImageCache(client, None)
+        prefetcher = ImagePrefetcher(cache, concurrency=2)
+        vragen = [Question(id=f'q{q}', type='drag_and_drop', image=f'https://example.com/{q}.png') for q in range(6)]
+
+        await prefetcher.prefetch('chapter-Voorrang', vragen)
+        while prefetcher._tasks:
+            await asyncio.sleep(0.01)
+        assert prefetcher.stats['prefetched'] == 6 and peak == 2
+        assert cache.contains('https://example.com/0.png', IMAGE_CACHE_CONFIG['question_size'])
+
+        andere = [Question(id=f'b{q}', type='drag_and_drop', image=f'https://example.com/b{q}.png') for q in range(6)]
+        await prefetcher.prefetch('chapter-Borden', andere)
+        await prefetcher.prefetch('chapter-Voorrang', vragen[:1]) #Ander hoofdstuk, Borden wordt gestopt
+        assert prefetcher.stats['cancelled'] == 6
+        cache.close()
+
+    @pytest.mark.asyncio
+    async def test_loader_prioriteit_en_timeout(self):
+        """Test de limiet per server, dat de huidige view voorgaat op een verlaten view, en dat een trage view opgeeft"""
+        busy = {}
+        peak = {}
+        order = []
+        async def fetch_url(url, etag=None, last_modified=None):
+            host = url.split('/')[2]
+            busy[host] = busy.get(host, 0) + 1
+            peak[host] = max(peak.get(host, 0), busy[host])
+            order.append(url)
+            await asyncio.sleep(10 if 'traag' in url else 0.01)
+            busy[host] -= 1
+            return 200, self.png(), None, None
+        client = MagicMock()
+        client.fetch_url = fetch_url
+        cache = ImageCache(client, None)
+        loader = ImageLoader(cache, workers=2, per_host=1, view_timeout=0.5)
+        loaded = {}
+        def jobs(view, urls):
+            return [(url, (100, 100), lambda image, url=url: loaded.__setitem__(url, image)) for url in urls]
+
+        oud = [f'https://a.example/oud{i}.png' for i in range(4)]
+        nieuw = [f'https://a.example/nieuw{i}.png' for i in range(4)]
+        await loader.load_view('oud', jobs('oud', oud))
+        await loader.load_view('nieuw', jobs('nieuw', nieuw)) #De gebruiker opent een andere vraag
+        while len(loaded) < 8:
+            await asyncio.sleep(0.01)
+        assert peak == {'a.example': 1}
+        assert order[:5] == oud[:1] + nieuw #Alleen de al gestarte afbeelding van de oude view ging voor
+        assert all(image is not None for image in loaded.values())
+
+        await loader.load_view('traag', jobs('traag', ['https://b.example/traag.png']))
+        await asyncio.sleep(0.6)
+        assert loaded['https://b.example/traag.png'] is None and loader.stats['timeouts'] == 1
+        await loader.load_view('daarna', jobs('daarna', ['https://b.example/daarna.png']))
+        await asyncio.sleep(0.1)
+        assert 'https://b.example/daarna.png' not in order #De verlopen download loopt nog, de server blijft bezet
+        loader.close()
+        cache.close()
+
+class TestDeltaSync:
+    """Test delta sync tegen de lokale stand-in van de cloud functies"""
+
+    @pytest.mark.asyncio
+    async def test_alleen_wijzigingen_ophalen(self):
+        """Test dat na een volledige GET alleen de gewijzigde en verwijderde vragen worden opgehaald en gemerged"""
+        backend = StandInBackend()
+        async with TestServer(create_stand_in_app(backend)) as server:
+            client = APIClient(str(server.make_url('')).rstrip('/'), STAND_IN_KEY)
+            await client.refresh('subjects') # Eerste keer: volledige GET
+
+            await client.put('update_question', {'id': 'q2', 'question': 'Aangepast'})
+            await client.post('create_question', {'question': 'Nieuw', 'type': 'open', 'parent': 'Voorrang'})
+            await client.delete('delete_question', {'id': 'q1'})
+
+            data = await client.refresh('subjects')
+            await client.close()
+
+        def vragen(response):
+            return [[(q['id'], q['question']) for q in subject['questions']] for subject in response['subjects']]
+
+        assert client.stats['delta_syncs'] == 1
+        assert vragen(data) == vragen(backend.all_subjects())
+        verkeersborden = data['subjects'][0]
+        assert [q['question'] for q in verkeersborden['questions']] == ['Aangepast']
+        assert [q['question'] for q in data['subjects'][1]['questions']][-1] == 'Nieuw'
+
+    @pytest.mark.asyncio
+    async def test_vraag_in_twee_onderwerpen(self):
+        """Test dat opslaan een vraag die in twee onderwerpen staat in beide laat staan, en dat verplaatsen (moveFrom) alleen dat onderwerp verlaat"""
+        q3 = {'id': 'q3', 'question': 'Wie heeft voorrang?', 'type': 'open', 'correctAnswer': 'Rechts'}
+        backend = StandInBackend([{'id': 'borden', 'title': 'Borden', 'questions': [q3]}, {'id': 'voorrang', 'title': 'Voorrang', 'questions': [q3]},
+                                  {'id': 'kruispunten', 'title': 'Kruispunten', 'questions': []}])
+        async with TestServer(create_stand_in_app(backend)) as server:
+            client = APIClient(str(server.make_url('')).rstrip('/'), STAND_IN_KEY)
+            await client.refresh('subjects')
+
+            saved = {**q3, 'question': 'Aangepast', 'parent': 'Voorrang'} # Zoals save_question, altijd met de parent
+            previous, applied = client.apply_local('subjects', changes=[saved])
+            await client.put('update_question', saved, optimistic=True)
+            assert [[q['question'] for q in subject['questions']] for subject in applied['subjects']] == [['Aangepast'], ['Aangepast'], []]
+            assert [subject['questionIds'] for subject in backend.all_subjects()['subjects']] == [['q3'], ['q3'], []]
+
+            moved = {**saved, 'parent': 'Kruispunten', 'moveFrom': 'Voorrang'} # Zoals bulk_move_questions
+            previous, applied = client.apply_local('subjects', changes=[moved])
+            await client.put('update_question', moved, optimistic=True)
+            await client.close()
+
+        assert [subject['questionIds'] for subject in applied['subjects']] == [['q3'], [], ['q3']]
+        assert [subject['questionIds'] for subject in backend.all_subjects()['subjects']] == [['q3'], [], ['q3']]
+        assert 'moveFrom' not in applied['subjects'][2]['questions'][0] and 'moveFrom' not in backend.questions['q3']
+
+    @pytest.mark.asyncio
+    async def test_delta_met_meerdere_onderwerpen(self):
+        """Test dat delta sync alle onderwerpen van een vraag doorgeeft, en een vraag die in geen onderwerp meer staat weghaalt"""
+        q3 = {'id': 'q3', 'question': 'Wie heeft voorrang?', 'type': 'open', 'correctAnswer': 'Rechts'}
+        q4 = {'id': 'q4', 'question': 'Wat is een voorrangsweg?', 'type': 'open', 'correctAnswer': 'Een weg met voorrang'}
+        backend = StandInBackend([{'id': 'borden', 'title': 'Borden', 'questions': [q3, q4]}, {'id': 'voorrang', 'title': 'Voorrang', 'questions': [q3]},
+                                  {'id': 'kruispunten', 'title': 'Kruispunten', 'questions': []}])
+        async with TestServer(create_stand_in_app(backend)) as server:
+            client = APIClient(str(server.make_url('')).rstrip('/'), STAND_IN_KEY)
+            await client.refresh('subjects')
+
+            await client.put('update_question', {**q3, 'parent': 'Kruispunten', 'moveFrom': 'Voorrang'})
+            backend.subjects[0]['questionIds'].remove('q4') # Naar een examen verplaatst, staat in geen onderwerp meer
+            backend._store(None, backend.questions['q4'])
+            data = await client.refresh('subjects')
+            await client.close()
+
+        assert client.stats['delta_syncs'] == 1
+        assert [subject['questionIds'] for subject in data['subjects']] == [['q3'], [], ['q3']]
+        assert 'parents' not in data['subjects'][0]['questions'][0]
+
+    @pytest.mark.asyncio
+    async def test_fallback_zonder_delta_endpoint(self):
+        """Test dat de client terugvalt op een volledige GET als de server geen delta endpoint heeft"""
+        backend = StandInBackend(delta=False)
+        async with TestServer(create_stand_in_app(backend)) as server:
+            client = APIClient(str(server.make_url('')).rstrip('/'), STAND_IN_KEY)
+            await client.refresh('subjects')
+            await client.put('update_question', {'id': 'q3', 'question': 'Aangepast'})
+            data = await client.refresh('subjects')
+            await client.close()
+
+        assert not client.delta_supported
+        assert client.stats['delta_syncs'] == 0
+        assert to_raw(data) == backend.all_subjects()
+
+    @pytest.mark.asyncio
+    async def test_lokale_wijziging_en_rollback(self):
+        """Test dat een optimistische wijziging in de cache blijft staan zonder nieuwe GET, en na een mislukte request wordt teruggedraaid"""
+        backend = StandInBackend()
+        async with TestServer(create_stand_in_app(backend)) as server:
+            client = APIClient(str(server.make_url('')).rstrip('/'), STAND_IN_KEY)
+            await client.refresh('subjects')
+            requests = client.stats['requests']
+
+            previous, applied = client.apply_local('subjects', deleted=['q1'])
+            await client.delete('delete_question', {'id': 'q1'}, optimistic=True)
+            assert client.cache.get('subjects') is applied and client.cache.is_fresh('subjects')
+            assert client.stats['requests'] == requests + 1 # Alleen de DELETE
+
+            backend.delete('q3') # Intussen door iemand anders verwijderd, de PUT faalt
+            previous, applied = client.apply_local('subjects', changes=[{'id': 'q3', 'question': 'Lokaal', 'parent': 'Voorrang'}])
+            assert applied['subjects'][1]['questions'][0]['question'] == 'Lokaal'
+            with pytest.raises(APIError):
+                await client.put('update_question', {'id': 'q3', 'question': 'Lokaal'}, optimistic=True)
+            assert client.rollback_local('subjects', previous, applied)
+            await client.close()
+
+        assert client.cache.get('subjects') is previous and not client.cache.is_fresh('subjects')
+        exams = {'exams': [{'id': 1, 'inzicht': {'questions': [{'id': 'e1', 'question': 'Oud'}]}}]}
+        merged = merge_exam_changes(exams, [{'id': 'e2', 'question': 'Nieuw', 'parent': 'Examen 1 - Inzicht'}], ['e1'])
+        assert merged['exams'][0]['inzicht']['questions'] == [{'id': 'e2', 'question': 'Nieuw', 'parent': 'Examen 1 - Inzicht'}]
+        assert exams['exams'][0]['inzicht']['questions'][0]['id'] == 'e1' # Origineel ongewijzigd
+
+    def test_lokale_wijziging_over_de_oude_vraag(self):
+        """Test dat opslaan van een open vraag (het formulier stuurt geen correctAnswer) het antwoord en de timestamps in de cache laat staan"""
+        client = APIClient(API_CONFIG['URL'], API_CONFIG['KEY'])
+        client.cache.set('subjects', StandInBackend().all_subjects())
+        saved = Question(id='q2', type='open', question='Wat doe je bij een stopbord?', explanation='', parent='Verkeersborden') # Zoals save_question
+
+        previous, applied = client.apply_local('subjects', changes=[saved])
+        question = applied['subjects'][0]['questions'][1]
+        assert question['question'] == 'Wat doe je bij een stopbord?'
+        assert question['correctAnswer'] == 'Volledig stoppen' and 'updatedAt' in question
+        assert App.__new__(App).format_question_data(question).antwoord == 'Volledig stoppen' # Opnieuw openen toont het antwoord
+        assert previous['subjects'][0]['questions'][1]['question'] == 'Wat moet je doen bij een stopbord?' # Origineel ongewijzigd
+
+class TestJSONArrayStream:
+    """Test het incrementeel parsen van een array uit een JSON response"""
+
+    def test_chunks_van_een_byte(self):
+        """Test dat elementen correct worden geparsed, ook als elke chunk maar één byte is"""
+        data = {
+            "pagination": {"hasMore": False, "subjects": "geen array"},
+            "subjects": [
+                {"title": "Borden [rond]", "questions": [{"id": "q1", "question": "Wat zegt \"dit\" bord? {}"}]},
+                {"title": "Voorrang – één", "questions": []},
+                "tekst, met komma",
+                3
+            ],
+            "exams": [1, 2]
+        }
+        raw = json.dumps(data, ensure_ascii=False).encode('utf-8')
+        parser = JSONArrayStream('subjects')
+        items = []
+        for i in range(len(raw)):
+            items.extend(parser.feed(raw[i:i + 1]))
+        assert items == data['subjects']
+        assert parser.done
+
+    @pytest.mark.asyncio
+    async def test_stream_items(self):
+        """Test dat stream_items de onderwerpen een voor een teruggeeft en daarna in de cache zet"""
+        backend = StandInBackend()
+        async with TestServer(create_stand_in_app(backend)) as server:
+            client = APIClient(str(server.make_url('')).rstrip('/'), STAND_IN_KEY)
+            titles = [subject['title'] async for subject in client.stream_items('subjects', 'subjects', chunk_size=16)]
+            await client.close()
+
+        assert titles == ['Verkeersborden', 'Voorrang']
+        assert to_raw(client.cache.get('subjects')) == backend.all_subjects()
+        assert client.can_sync('subjects')
+
+    @pytest.mark.asyncio
+    async def test_stream_items_single_flight(self):
+        """Test dat een tweede stream van hetzelfde endpoint (dubbele klik) op de eerste wacht in plaats van alles opnieuw te downloaden"""
+        backend = StandInBackend()
+        async with TestServer(create_stand_in_app(backend)) as server:
+            client = APIClient(str(server.make_url('')).rstrip('/'), STAND_IN_KEY)
+            async def titles():
+                return [subject['title'] async for subject in client.stream_items('subjects', 'subjects', chunk_size=16)]
+            first, second = await asyncio.gather(titles(), titles())
+            await client.close()
+
+        assert first == second == ['Verkeersborden', 'Voorrang']
+        assert client.stats['requests'] == 1 and client.stats['coalesced'] == 1
+
+class TestJSONCodec:
+    """Test de verwisselbare JSON codecs"""
+
+    RESPONSE = json.dumps({
+        "subjects": [{"id": "s1", "title": "Borden", "questionIds": ["q1"], "questions": [
+            {"id": "q1", "question": "Wat betekent dit bord?", "type": "multiple_choice", "answers": ["A", "B"], "correctAnswer": "A"}
+        ]}],
+        "feedback": [{"id": "f1", "feedback": "Typfout", "status": "pending", "date": {"_seconds": 0, "_nanoseconds": 0}}]
+    }).encode('utf-8')
+
+    @pytest.mark.parametrize('name', ['json', 'orjson', 'msgspec'])
+    def test_codecs_geven_hetzelfde_resultaat(self, name):
+        """Test dat elke geïnstalleerde codec hetzelfde decodeert, en structs terug zet naar JSON"""
+        try:
+            codec = JSONCodec(name)
+        except ImportError:
+            pytest.skip(f"{name} is niet geïnstalleerd")
+
+        data = codec.loads(self.RESPONSE)
+        assert data == json.loads(self.RESPONSE)
+        question = Question(**data['subjects'][0]['questions'][0])
+        assert question.vraag_tekst == "Wat betekent dit bord?"
+        assert question['opties'] == ["A", "B"]
+        assert question.get('terms', {}) == {}
+        data['subjects'][0]['questions'][0] = question
+        assert json.loads(codec.dumps(data)) == json.loads(self.RESPONSE)
+
+class TestSearchIndex:
+    """Test de zoekindex over de vragen"""
+
+    def test_prefix_en_accenten(self):
+        """Test zoeken op prefix, zonder hoofdletters en accenten, over vraag, uitleg, opties en begrippen"""
+        index = SearchIndex()
+        index.add(('Voorrang', 'q1'), Question(id='q1', type='multiple_choice', question='Wie heeft voorrang op één kruispunt?',
+                                               answers=['Verkeer van rechts', 'Tram'], terms={'Kruispunt': 'Waar wegen samenkomen'}))
+        index.add(('Borden', 'q2'), Question(id='q2', type='open', question='Wat betekent dit bord?', explanation='Een voorrangsweg'))
+        assert index.search('VOORR') == {('Voorrang', 'q1'), ('Borden', 'q2')}
+        assert index.search('een kruis') == {('Voorrang', 'q1')}
+        assert index.search('tram') == {('Voorrang', 'q1')}
+        assert index.search('samenk') == {('Voorrang', 'q1')}
+        assert index.search('fiets') == set()
+
+    def test_incrementeel_bijwerken(self):
+        """Test dat sync alleen gewijzigde vragen opnieuw indexeert en verwijderde vragen (en hun tokens) weghaalt"""
+        index = SearchIndex()
+        vragen = [Question(id=f'q{q}', type='open', question=f'Vraag {q} over borden') for q in range(3)]
+        index.sync([{'titel': 'Borden', 'vragen': vragen}, {'titel': 'Feedback', 'vragen': []}, 'Export feedback'])
+        assert len(index) == 3 and index.stats['indexed'] == 3
+
+        nieuw = [vragen[0], Question(id='q1', type='open', question='Vraag 1 over borden'), Question(id='q2', type='open', question='Over fietsers')]
+        index.sync([{'titel': 'Borden', 'vragen': nieuw}])
+        assert index.stats['indexed'] == 4 and index.stats['unchanged'] == 1 #Alleen q2 is echt veranderd
+        assert index.search('fiets') == {('Borden', 'q2')}
+        assert index.search('vraag') == {('Borden', 'q0'), ('Borden', 'q1')}
+
+        index.sync([{'titel': 'Borden', 'vragen': nieuw[:1]}])
+        index.remove_question('q0')
+        assert len(index) == 0 and index.postings == {} and index.tokens == []
+
+class TestDuplicateIndex:
+    """Test het vinden van (bijna) dubbele vragen met MinHash/LSH"""
+
+    def test_dubbele_vragen(self):
+        """Test dat een gekopieerde en licht aangepaste vraag wordt gevonden, en dat het bijwerken van de vraag het paar weghaalt"""
+        import random
+        rng = random.Random(4)
+        words = [''.join(rng.choice('abdegiklmnoprstuvz') for _ in range(rng.randint(3, 9))) for _ in range(1000)]
+        vragen = [Question(id=f'q{q}', type='open', question=' '.join(rng.choice(words) for _ in range(12)) + '?') for q in range(300)]
+        kopie = Question(id='kopie', type='open', question=vragen[7].question.replace('?', ', nu?'))
+        index = DuplicateIndex()
+        index.sync([{'titel': 'Borden', 'vragen': vragen}, {'titel': 'Examen 1 - Kennis', 'vragen': [kopie, vragen[3]]}])
+
+        pairs = index.pairs(0.7)
+        assert [(pair[2], pair[4]) for pair in pairs] == [(('Borden', 'q7'), ('Examen 1 - Kennis', 'kopie'))] #q3 in twee hoofdstukken telt niet
+        assert pairs[0][0] > 0.8
+        assert index.stats['candidates'] < 300 * 301 // 20 #Alleen kandidaten uit dezelfde buckets, niet alle paren
+
+        index.add(('Examen 1 - Kennis', 'kopie'), Question(id='kopie', type='open', question='Een heel andere vraag over fietsers'))
+        assert index.pairs(0.7) == []
+        index.remove_question('q7')
+        assert ('Borden', 'q7') not in index.documents
+
+@pytest.fixture
+def root():
+    """Tk root voor de UI tests, overgeslagen als er geen display is"""
+    try:
+        root = tk.Tk()
+    except tk.TclError:
+        pytest.skip("Geen display beschikbaar")
+    yield root
+    root.destroy()
+
+class TestLijstFrame:
+    """Test het vullen van de lijst (Treeview)"""
+
+    def test_lazy_hoofdstukken(self, root):
+        """Test dat alleen de hoofdstukken worden ingevoegd en de vragen pas bij openklappen, en weer verdwijnen bij eviction"""
+        lijst = LijstFrame(root, MagicMock())
+        items = [{'titel': f'Onderwerp {s}', 'vragen': [Question(id=f'q{s}-{q}', question=f'Vraag {q}', type='open', titel=f'Vraag {q+1}')
+                                                       for q in range(100)]} for s in range(5)]
+        lijst.update_lijst(items, loading=False)
+        chapters = lijst.tree.get_children()
+        assert len(chapters) == 5
+        assert lijst.vraag_data == {}
+        assert len(lijst.tree.get_children(chapters[0])) == 1 #Alleen de placeholder
+
+        lijst.tree.focus(chapters[0])
+        lijst.tree.item(chapters[0], open=True)
+        lijst.on_open(None)
+        assert len(lijst.vraag_data) == 100
+        assert len(lijst.tree.get_children(chapters[0])) == 101 #Vragen + de knop om een vraag toe te voegen
+
+        lijst.tree.item(chapters[0], open=False)
+        lijst.evict_chapter(chapters[0])
+        assert lijst.vraag_data == {}
+        assert len(lijst.tree.get_children(chapters[0])) == 1
+
+    def test_reconcile(self, root):
+        """Test dat een refresh alleen de gewijzigde rijen aanpast en opengeklapte hoofdstukken en selectie behoudt"""
+        lijst = LijstFrame(root, MagicMock())
+        vragen = [Question(id=f'q{q}', question=f'Vraag {q}', type='open') for q in range(3)]
+        lijst.update_lijst([{'titel': 'Voorrang', 'vragen': vragen}], loading=False)
+        lijst.tree.item('chapter-Voorrang', open=True)
+        lijst.fill_chapter('chapter-Voorrang')
+        lijst.tree.selection_set('Voorrang-q2')
+
+        nieuw = [Question(id='q2', question='Aangepast', type='open'), Question(id='q3', question='Nieuw', type='open'), vragen[0]]
+        lijst.update_lijst([{'titel': 'Voorrang', 'vragen': nieuw}], loading=False)
+        assert lijst.tree.get_children('chapter-Voorrang') == ('chapter-Voorrang-add', 'Voorrang-q2', 'Voorrang-q3', 'Voorrang-q0')
+        assert lijst.tree.item('Voorrang-q2', 'text') == 'Aangepast'
+        assert lijst.tree.item('chapter-Voorrang', 'open')
+        assert lijst.tree.selection() == ('Voorrang-q2',)
+        assert set(lijst.vraag_data) == {'Voorrang-q2', 'Voorrang-q3', 'Voorrang-q0'}
+        assert lijst.vraag_data['Voorrang-q2'] is nieuw[0]
+
+    def test_render_in_delen(self, root, monkeypatch):
+        """Test dat een grote lijst in delen wordt ingevoegd en dat een nieuwere update de lopende render stopt"""
+        monkeypatch.setitem(LIJST_CONFIG, 'lazy', False)
+        monkeypatch.setitem(LIJST_CONFIG, 'frame_budget_ms', 1)
+        lijst = LijstFrame(root, MagicMock())
+        groot = [{'titel': f'Onderwerp {s}', 'vragen': [Question(id=f'q{q}', question=f'Vraag {q}', type='open') for q in range(2000)]} for s in range(10)]
+        lijst.update_lijst(groot, loading=False)
+        assert lijst.render_job is not None #Nog niet klaar na het eerste deel
+        assert lijst.progress_frame.winfo_manager()
+
+        lijst.update_lijst([{'titel': 'Voorrang', 'vragen': [Question(id='q1', question='Wie eerst?', type='open')]}], loading=False)
+        while lijst.render_job is not None:
+            root.update()
+        assert lijst.tree.get_children() == ('chapter-Voorrang',)
+        assert list(lijst.vraag_data) == ['Voorrang-q1']
+        assert not lijst.progress_frame.winfo_manager()
+
+class TestDetailsFrame:
+    """Test het vraag formulier in het details frame"""
+
+    def test_formulier_hergebruiken(self, root):
+        """Test dat een volgende vraag van hetzelfde type het formulier en de rijen hergebruikt, en dat opslaan de nieuwe waarden leest"""
+        details = DetailsFrame(root, MagicMock())
+        eerste = Question(id='q1', type='multiple_choice', question='Eerste', answers=['A', 'B', 'C'], correctAnswer='A', terms={'voorrang': 'Eerst gaan'})
+        tweede = Question(id='q2', type='multiple_choice', question='Tweede', answers=['X', 'Y'], correctAnswer='Y')
+        details.show_vraag_ui('Voorrang', eerste)
+        form = details.form
+        details.show_vraag_ui('Voorrang', tweede)
+        assert details.form is form
+        assert form.question_text.get('1.0', 'end-1c') == 'Tweede'
+        assert [row.var.get() for row in form.options] == ['X', 'Y']
+        assert len(form.terms) == 0
+
+        details.show_vraag_ui('Voorrang', eerste)
+        assert form.options.stats == {'built': 3, 'reused': 1}
+        assert form.terms.stats == {'built': 1, 'reused': 1}
+
+        details.update_question = MagicMock()
+        details.save_question('q1')
+        saved = details.update_question.call_args.args[0]
+        assert saved.answers == ['A', 'B', 'C'] and saved.terms == {'voorrang': 'Eerst gaan'} and saved.id == 'q1'
+
+class TestLiveImages:
+    """Test dat afbeeldingen alleen worden vastgehouden zolang de widget die ze toont bestaat"""
+
+    def test_loslaten_en_cap(self, root):
+        """Test dat een afbeelding wordt losgelaten als zijn widget verdwijnt, en dat er nooit meer dan cap worden vastgehouden"""
+        from PIL import Image, ImageTk
+        images = LiveImages(cap=2)
+        labels = []
+        for _ in range(3):
+            photo = ImageTk.PhotoImage(Image.new('RGB', (10, 10)), master=root)
+            label = tk.Label(root, image=photo)
+            images.add(label, photo)
+            labels.append(label)
+        assert len(images) == 2 and images.total_bytes == 2 * 10 * 10 * 4
+        assert labels[0].cget('image') == ''
+
+        labels[1].destroy()
+        assert len(images) == 1 and images.total_bytes == 10 * 10 * 4
+
+class TestUIDispatcher:
+    """Test de wachtrij voor UI updates van de async loop naar de Tk thread"""
+
+    class FakeRoot:
+        """Alleen after/after_cancel, de frames worden in de test met de hand gedraaid"""
+        def after(self, ms, callback):
+            return 'after#1'
+        def after_cancel(self, after_id):
+            pass
+
+    def test_samenvoegen_per_frame(self):
+        """Test dat updates vanuit een andere thread pas bij drain worden uitgevoerd, en dat updates met dezelfde key samengevoegd worden"""
+        ui = UIDispatcher(self.FakeRoot())
+        calls = []
+
+        def post_vanuit_loop():
+            for i in range(100):
+                ui.post(calls.append, ('lijst', i), key='lijst')
+            ui.post(calls.append, 'melding')
+            ui.post(calls.append, 'melding')
+
+        thread = threading.Thread(target=post_vanuit_loop)
+        thread.start()
+        thread.join()
+        assert calls == [] and ui.depth == 3
+
+        ui.drain()
+        assert calls == [('lijst', 99), 'melding', 'melding']
+        assert ui.depth == 0
+        assert ui.stats['merged'] == 99 and ui.stats['drained'] == 3
+
+class TestNavigatie:
+    """Test dat bij snel wisselen van lijst alleen de laatste navigatie wordt afgemaakt en getoond"""
+
+    def test_laatste_navigatie_wint(self):
+        """Test dat een nieuwe navigatie de vorige cancelt en dat zijn UI updates die al in de wachtrij stonden niet meer worden uitgevoerd"""
+        app = App.__new__(App)
+        app.setup_async_loop()
+        app.ui = UIDispatcher(TestUIDispatcher.FakeRoot())
+        app.prefetcher = MagicMock()
+        shown = []
+        posted = threading.Event()
+
+        async def onderdelen():
+            app.post_nav(shown.append, 'onderdelen', key='details')
+            posted.set()
+            await asyncio.sleep(10) #Nog bezig met ophalen
+
+        async def feedback():
+            app.post_nav(shown.append, 'feedback', key='lijst')
+
+        try:
+            first = app.handle_async_button(onderdelen(), slot='nav')
+            assert posted.wait(1)
+            second = app.handle_async_button(feedback(), slot='nav')
+            second.result(timeout=1)
+            assert first.cancelled()
+            app.ui.drain()
+            assert shown == ['feedback']
+            assert app.prefetcher.stop.call_count == 2 #Elke navigatie stopt het vooruit laden
+        finally:
+            app.loop.call_soon_threadsafe(app.loop.stop)
+            app.loop_thread.join()
+            app.loop.close()
+
 class TestApp:
     """Test de basis App functionaliteit"""
 
@@ -89,11 +886,90 @@ class TestApp:
             "correctAnswer": "A"
         }
         
-        formatted = app.format_question_data(0, test_question)
-        assert formatted["titel"] == "Vraag 1"
+        formatted = app.format_question_data(test_question)
         assert formatted["vraag_tekst"] == "Test vraag"
         assert formatted["type"] == "multiple_choice"
 
+    def test_question_struct(self):
+        """Test dat een vraag een compacte struct is met gedeelde type strings en defaults voor lege velden, die bij het formatteren niet wordt aangepast"""
+        app = App.__new__(App)
+        subject = {"title": "".join(["Verkeers", "borden"]), "questions": [
+            {"id": "q1", "question": "Wat betekent dit bord?", "type": "".join(["multiple", "_choice"]), "answers": ["A", "B"], "correctAnswer": "A"},
+            {"id": "q2", "question": "Wie heeft voorrang?", "type": "".join(["multiple", "_choice"])}
+        ]}
+        first, second = app.format_subject_data(subject)['vragen']
+        assert not hasattr(first, '__dict__')
+        assert first.type is second.type
+        assert first.to_raw() == subject['questions'][0] # Geen parent of titel toegevoegd
+        assert first.opties == ["A", "B"] and first.antwoord == "A"
+        assert second.terms == {} and second.antwoord == '' and 'terms' not in second
+        second.titel = "Vraag 2"
+        assert 'titel' not in second.to_raw() and second == Question(**subject['questions'][1]) # Lokale velden tellen niet mee
+
+class TestSnapshotStore:
+    """Test de lokale opslag van de laatste responses"""
+
+    def test_opslaan_en_laden(self, tmp_path):
+        """Test dat een response gecomprimeerd wordt opgeslagen en weer geladen, met een index op id en parent"""
+        store = SnapshotStore(str(tmp_path / 'snapshots.db'))
+        data = {"subjects": [{"id": "s1", "title": "Verkeersborden", "questions": [
+            {"id": "q1", "question": "Wat betekent dit bord? " * 50, "type": "open"},
+            {"id": "q2", "question": "Wie heeft voorrang?", "type": "open"}
+        ]}]}
+        store.save('subjects', data)
+
+        loaded, saved_at, cursor = store.load('subjects')
+        assert loaded == data
+        assert store.find_question('q2') == [('subjects', 'Verkeersborden')]
+        assert store.question_ids('subjects', 'Verkeersborden') == ['q1', 'q2']
+        assert store.load('exams') is None
+        store.close()
+
+    def test_schema_versie(self, tmp_path):
+        """Test dat opslag met een oude schema versie wordt weggegooid"""
+        path = str(tmp_path / 'snapshots.db')
+        store = SnapshotStore(path)
+        store.save('feedback', {"feedback": []})
+        store.close()
+
+        with patch.object(SnapshotStore, 'SCHEMA_VERSION', SnapshotStore.SCHEMA_VERSION + 1):
+            store = SnapshotStore(path)
+            assert store.load('feedback') is None
+            store.close()
+
+class TestSaveQueue:
+    """Test het opslaan van vragen op de achtergrond met het journal"""
+
+    @pytest.mark.asyncio
+    async def test_samenvoegen_en_afspelen(self, tmp_path):
+        """Test dat wijzigingen aan dezelfde vraag één PUT worden, dat ze offline in het journal blijven en na een herstart worden verstuurd"""
+        path = str(tmp_path / 'journal.jsonl')
+        offline = MagicMock()
+        offline.put = AsyncMock(side_effect=APIError("Geen verbinding", retryable=True))
+        queue = SaveQueue(offline, path, delay=0.01, retry_delay=60)
+        await queue.enqueue('q1', Question(id='q1', question='Eerste versie', type='open'))
+        await queue.enqueue('q1', Question(id='q1', question='Tweede versie', type='open'))
+        await queue.enqueue('q2', {'question': 'Andere vraag'})
+        await asyncio.sleep(0.05)
+        assert offline.put.await_count == 2 # Eén per vraag
+        assert queue.stats['coalesced'] == 1 and queue.is_pending('q1')
+        queue.close()
+        with open(path, 'a', encoding='utf-8') as file:
+            file.write('{"op": "edit", "seq": 9, "id"') # Crash halverwege het schrijven
+
+        online = MagicMock()
+        online.put = AsyncMock()
+        queue = SaveQueue(online, path, delay=0.01)
+        await queue.start()
+        await asyncio.sleep(0.05)
+        sent = {call.args[1]['id']: call.args[1] for call in online.put.await_args_list}
+        assert sent['q1']['question'] == 'Tweede versie'
+        assert sent['q2'] == {'id': 'q2', 'question': 'Andere vraag'}
+        assert queue.stats == {**queue.stats, 'replayed': 3, 'sent': 2}
+        assert not queue.is_pending('q1')
+        queue.close()
+        assert os.path.getsize(path) == 0 # Alles verstuurd, journal is leeggemaakt
+
 class TestQuestionTypeDialog:
     """Test de vraagtype modal"""
 